@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: import_time.py
+#
+# Description:
+#     Import-time benchmark for the model2450lib package.
+#
+#     Measures the cost of importing model2450lib.model2450
+#     in fresh interpreters and fails when it exceeds the
+#     configured budget, or when pyserial/pyusb get
+#     imported eagerly.
+#
+#     Usage:
+#         python bench/import_time.py [--budget-ms 30] [--runs 7]
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 14:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import argparse
+import os
+import subprocess
+import sys
+
+MODULE = "model2450lib.model2450"
+FORBIDDEN = ("serial", "usb")
+
+def measure(module, runs):
+    """
+    Measure cumulative import time of a module.
+
+    Uses the interpreter's -X importtime report,
+    which excludes interpreter startup, and keeps
+    the best of several runs.
+
+    Args:
+        module: Dotted module name.
+        runs: Number of fresh interpreters.
+
+    Returns:
+        tuple:
+            (best time in microseconds,
+             list of imported module names).
+
+    Raises:
+        RuntimeError:
+            If the import fails.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE="")
+    best = None
+    names = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                               f"import {module}"],
+                              capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        total = None
+        names = []
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            fields = line.split("|")
+            name = fields[2].strip()
+            if not fields[1].strip().isdigit():
+                continue
+            names.append(name)
+            if name == module:
+                total = int(fields[1])
+        if total is not None and (best is None or total < best):
+            best = total
+    return best, names
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import-time benchmark for model2450lib")
+    parser.add_argument("--budget-ms", type=float, default=30.0,
+                        help="maximum allowed import time (ms)")
+    parser.add_argument("--runs", type=int, default=7,
+                        help="number of fresh interpreters to measure")
+    args = parser.parse_args()
+
+    best, names = measure(MODULE, args.runs)
+    eager = [name for name in names if name.split(".")[0] in FORBIDDEN]
+    best_ms = best / 1000.0
+    print(f"import {MODULE}: {best_ms:.2f} ms (budget {args.budget_ms:.2f} ms)")
+
+    failed = False
+    if best_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    if eager:
+        print(f"FAIL: optional modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
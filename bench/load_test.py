@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: load_test.py
+#
+# Description:
+#     Fleet-scale load test for the model2450lib package.
+#
+#     Spins up N emulated Model 2450 endpoints
+#     (model2450lib.emulator) for each requested N and
+#     drives them through discovery, concurrent commands
+#     and simultaneous streams. Reports throughput,
+#     latency percentiles, CPU, memory, threads and file
+#     descriptors per N for capacity planning.
+#
+#     Usage:
+#         python bench/load_test.py [--devices 1,4,16,32]
+#             [--commands 200] [--duration 5] [--rate 200]
+#             [--json]
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 14:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Own modules
+from model2450lib import searchmodel
+from model2450lib.emulator import EmulatorFarm
+from model2450lib.metrics import LatencyHistogram
+from model2450lib.model2450 import Model2450
+
+def resources():
+    """
+    Sample process resource usage.
+
+    Returns:
+        dict:
+            CPU time (s), resident and peak memory
+            (MiB), thread count and open file
+            descriptors (None where unavailable).
+    """
+    usage = {"cpu_s": time.process_time(),
+             "threads": threading.active_count(),
+             "rss_mib": None, "peak_rss_mib": None, "fds": None}
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        usage["peak_rss_mib"] = peak / (1 << 20 if sys.platform == "darwin"
+                                        else 1 << 10)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        usage["rss_mib"] = pages * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+        usage["fds"] = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    return usage
+
+def run_phase(target, devices):
+    """
+    Run target(dev) on every device concurrently.
+
+    Args:
+        target: Function taking one device.
+        devices: Model2450 instances.
+
+    Returns:
+        tuple:
+            (wall time in seconds, CPU time in
+             seconds).
+    """
+    threads = [threading.Thread(target=target, args=(dev,)) for dev in devices]
+    cpu = time.process_time()
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - t0, time.process_time() - cpu
+
+def merged_latency(devices, name):
+    """
+    Merge one command's latency histograms.
+
+    Args:
+        devices: Devices with metrics enabled.
+        name: Command key, e.g. "get_read".
+
+    Returns:
+        dict:
+            LatencyHistogram snapshot.
+    """
+    merged = LatencyHistogram()
+    for dev in devices:
+        hist = dev.metrics.commands.get(name)
+        if hist is None or not hist.count:
+            continue
+        for index, hits in enumerate(hist.buckets):
+            merged.buckets[index] += hits
+        merged.count += hist.count
+        merged.total_ns += hist.total_ns
+        merged.max_ns = max(merged.max_ns, hist.max_ns)
+        if merged.min_ns is None or hist.min_ns < merged.min_ns:
+            merged.min_ns = hist.min_ns
+    return merged.snapshot()
+
+def run_scale(count, args):
+    """
+    Run every phase for one fleet size.
+
+    Args:
+        count: Number of emulated devices.
+        args: Parsed command-line arguments.
+
+    Returns:
+        dict:
+            Measurements for this fleet size.
+    """
+    farm = EmulatorFarm(count, rate=args.rate)
+    farm.start()
+    result = {"devices": count, "baseline": resources()}
+    devices = []
+    try:
+        # Discovery
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):
+            found = searchmodel.search_models(ports=farm.ports,
+                                              timeout=args.timeout)
+        result["discovery"] = {"found": len(found["models"]),
+                               "wall_s": time.perf_counter() - t0}
+
+        for port in farm.ports:
+            dev = Model2450(port)
+            dev.connect()
+            dev.enable_metrics()
+            devices.append(dev)
+
+        # Concurrent commands
+        def commands(dev):
+            for _ in range(args.commands):
+                dev.get_read()
+        wall, cpu = run_phase(commands, devices)
+        total = count * args.commands
+        result["commands"] = {"count": total, "wall_s": wall,
+                              "per_s": total / wall,
+                              "cpu_pct": 100.0 * cpu / wall,
+                              "latency": merged_latency(devices, "get_read")}
+
+        # Simultaneous streams
+        received = [0] * count
+        def streamer(index):
+            def callback(text):
+                received[index] += 1
+            return callback
+        cpu = time.process_time()
+        t0 = time.perf_counter()
+        for index, dev in enumerate(devices):
+            dev.start_stream(callback=streamer(index))
+        time.sleep(args.duration)
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - cpu
+        load = resources()
+        farm.stop_streams()
+        for dev in devices:
+            dev.stop_stream()
+        for dev in devices:
+            dev.stream_thread.join()
+        emulated = farm.stats()
+        got = sum(received)
+        result["stream"] = {
+            "samples": got,
+            "per_s": got / wall,
+            "sent": emulated["sent"],
+            "dropped": emulated["dropped"],
+            "delivered_pct": 100.0 * got / emulated["sent"] if emulated["sent"] else None,
+            "cpu_pct": 100.0 * cpu / wall,
+            "overloads": sum(dev.metrics.overloads for dev in devices),
+            "backlog_peak": max(dev.metrics.backlog_peak for dev in devices),
+            "decode_errors": sum(dev.metrics.decode_errors for dev in devices),
+        }
+        result["load"] = load
+    finally:
+        for dev in devices:
+            dev.disconnect()
+        farm.close()
+    return result
+
+def report(result):
+    """
+    Print one fleet size as text.
+
+    Args:
+        result: run_scale() result.
+
+    Returns:
+        None
+    """
+    disc = result["discovery"]
+    cmd = result["commands"]
+    lat = cmd["latency"]
+    stream = result["stream"]
+    load = result["load"]
+    base = result["baseline"]
+    print(f"N={result['devices']}")
+    print(f"  discovery: {disc['found']} found in {disc['wall_s']:.2f}s")
+    print(f"  commands:  {cmd['per_s']:.0f}/s cpu={cmd['cpu_pct']:.0f}% "
+          f"p50={lat.get('p50_ms', 0):.2f}ms p99={lat.get('p99_ms', 0):.2f}ms "
+          f"max={lat.get('max_ms', 0):.2f}ms")
+    print(f"  stream:    {stream['per_s']:.0f} samples/s cpu={stream['cpu_pct']:.0f}% "
+          f"delivered={stream['delivered_pct'] or 0:.1f}% "
+          f"dropped={stream['dropped']} overloads={stream['overloads']} "
+          f"backlog_peak={stream['backlog_peak']}B")
+    rss = load["rss_mib"]
+    print(f"  resources: threads={load['threads']} (base {base['threads']}) "
+          f"fds={load['fds']} (base {base['fds']}) "
+          + (f"rss={rss:.1f}MiB" if rss is not None else ""))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fleet-scale load test with emulated Model 2450 devices")
+    parser.add_argument("--devices", default="1,4,16,32",
+                        help="comma-separated fleet sizes")
+    parser.add_argument("--commands", type=int, default=200,
+                        help="commands per device")
+    parser.add_argument("--duration", type=float, default=5.0,
+                        help="stream phase length (seconds)")
+    parser.add_argument("--rate", type=float, default=200.0,
+                        help="stream rate per device (Hz)")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="discovery deadline (seconds)")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per fleet size")
+    args = parser.parse_args()
+
+    for count in [int(n) for n in args.devices.split(",") if n]:
+        result = run_scale(count, args)
+        if args.json:
+            print(json.dumps(result), flush=True)
+        else:
+            report(result)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: autolevel.py
+#
+# Description:
+#     Automatic blank-frame level tuning for MCCI Model
+#     2450 BACK (Brightness And Color Kit).
+#
+#     Samples the light stream for a short window while
+#     the display shows content with blank frames,
+#     builds a light histogram incrementally, picks the
+#     threshold separating the blank and content
+#     populations (Otsu or bimodal valley, on at most
+#     MAX_BINS log-spaced bins) and pushes it
+#     with set_level(), reporting how cleanly the two
+#     populations separate.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 16:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 19:30:00  Vinay N
+#         Confirm the applied level by reading it back
+#     v2.2.0  Thu Oct 22 2026 16:30:00  Vinay N
+#         Thresholds picked on a bounded set of log-spaced bins
+#
+##############################################################################
+# Built-in imports
+import math
+import time
+
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+
+# Most bins the threshold pickers work on
+MAX_BINS = 256
+
+class LightHistogram:
+    """
+    Incremental histogram of light values.
+
+    Bins are created on demand, so no value range
+    has to be known in advance; each add() is a
+    single dictionary update.
+
+    Attributes:
+        bin_width: Width of one bin in sensor
+            units.
+        bins: Mapping of bin index to count.
+        count: Number of values added.
+    """
+    def __init__(self, bin_width=1.0):
+        """
+        Initialize LightHistogram instance.
+
+        Args:
+            bin_width: Bin width in sensor units.
+
+        Returns:
+            None
+        """
+        self.bin_width = bin_width
+        self.bins = {}
+        self.count = 0
+
+    def add(self, value):
+        """
+        Add one light value.
+
+        Args:
+            value: Light reading.
+
+        Returns:
+            None
+        """
+        index = math.floor(value / self.bin_width)
+        self.bins[index] = self.bins.get(index, 0) + 1
+        self.count += 1
+
+    def on_sample(self, text):
+        """
+        Stream callback for get_stream3().
+
+        Args:
+            text: ASCII sample payload; the first
+                value is the light reading.
+
+        Returns:
+            None
+        """
+        values = parse_stream_sample(text)
+        if values:
+            self.add(values[0])
+
+    def sorted_bins(self):
+        """
+        Get populated bins in ascending order.
+
+        Returns:
+            tuple:
+                (bin centers, counts) lists.
+        """
+        keys = sorted(self.bins)
+        width = self.bin_width
+        return ([(k + 0.5) * width for k in keys],
+                [self.bins[k] for k in keys])
+
+def log_bins(hist, max_bins=MAX_BINS):
+    """
+    Regroup a histogram onto log-spaced bins.
+
+    Bins are evenly spaced in
+    log(1 + value / bin_width), so a narrow dark
+    cluster keeps bins of its own next to content
+    spread over a wide range, and the pickers'
+    cost is bounded by max_bins however wide the
+    range is. There are never more bins than the
+    histogram spans.
+
+    Args:
+        hist: LightHistogram.
+        max_bins: Bin count limit.
+
+    Returns:
+        tuple:
+            (positions, counts) lists: bin
+            centers on the log scale (see
+            log_value()) and counts, including
+            empty bins; both empty if hist is.
+    """
+    if not hist.bins:
+        return [], []
+    width = hist.bin_width
+    low = min(hist.bins)
+    high = max(hist.bins)
+    start = _log_position((low + 0.5) * width, width)
+    stop = _log_position((high + 0.5) * width, width)
+    n = max(1, min(max_bins, high - low + 1))
+    step = (stop - start) / n
+    counts = [0] * n
+    for index, hits in hist.bins.items():
+        pos = _log_position((index + 0.5) * width, width)
+        i = int((pos - start) / step) if step else 0
+        counts[min(max(i, 0), n - 1)] += hits
+    return [start + (i + 0.5) * step for i in range(n)], counts
+
+def log_value(position, bin_width=1.0):
+    """
+    Convert a log_bins() position back to sensor units.
+
+    Args:
+        position: Position on the log scale.
+        bin_width: Histogram bin width.
+
+    Returns:
+        float:
+            Light value.
+    """
+    return math.expm1(position) * bin_width
+
+def _log_position(value, width):
+    return math.log1p(max(value, 0.0) / width)
+
+def otsu_threshold(hist, max_bins=MAX_BINS):
+    """
+    Pick the threshold maximizing between-class variance.
+
+    Works on log_bins(), so a narrow blank
+    cluster is not outweighed by content
+    spread over a wide range.
+
+    Args:
+        hist: LightHistogram.
+        max_bins: Bin count limit.
+
+    Returns:
+        float | None:
+            Threshold halfway (on the log scale)
+            between the last blank bin and the
+            first content bin, or None if fewer
+            than two bins are populated.
+    """
+    positions, counts = log_bins(hist, max_bins)
+    populated = [(pos, n) for pos, n in zip(positions, counts) if n]
+    if len(populated) < 2:
+        return None
+    centers = [pos for pos, _ in populated]
+    counts = [n for _, n in populated]
+    total = float(sum(counts))
+    total_sum = sum(c * n for c, n in zip(centers, counts))
+    w0 = 0.0
+    sum0 = 0.0
+    best = -1.0
+    split = 0
+    for i in range(len(centers) - 1):
+        w0 += counts[i]
+        sum0 += centers[i] * counts[i]
+        w1 = total - w0
+        mean0 = sum0 / w0
+        mean1 = (total_sum - sum0) / w1
+        between = w0 * w1 * (mean0 - mean1) ** 2
+        if between > best:
+            best = between
+            split = i
+    return log_value((centers[split] + centers[split + 1]) / 2.0,
+                     hist.bin_width)
+
+def valley_threshold(hist, max_passes=64, max_bins=MAX_BINS):
+    """
+    Pick the deepest valley between the two main peaks.
+
+    Works on log_bins(), smoothed with a 3-bin
+    average until at most two peaks remain or
+    max_passes is reached; the minimum between
+    the two highest peaks is the threshold.
+
+    Args:
+        hist: LightHistogram.
+        max_passes: Smoothing pass limit.
+        max_bins: Bin count limit.
+
+    Returns:
+        float | None:
+            Threshold, or None if fewer than two
+            peaks are found.
+    """
+    positions, counts = log_bins(hist, max_bins)
+    if sum(1 for n in counts if n) < 2:
+        return None
+    # Empty end bins let the outermost bins count as peaks
+    dense = [0.0] + [float(n) for n in counts] + [0.0]
+    for _ in range(max_passes):
+        peaks = [i for i in range(1, len(dense) - 1)
+                 if dense[i] > dense[i - 1] and dense[i] >= dense[i + 1]]
+        if len(peaks) <= 2:
+            break
+        dense = [dense[0]] + [(dense[i - 1] + dense[i] + dense[i + 1]) / 3.0
+                              for i in range(1, len(dense) - 1)] + [dense[-1]]
+    else:
+        peaks = [i for i in range(1, len(dense) - 1)
+                 if dense[i] > dense[i - 1] and dense[i] >= dense[i + 1]]
+    if len(peaks) < 2:
+        return None
+    first, second = sorted(sorted(peaks, key=lambda i: dense[i])[-2:])
+    valley = min(range(first, second + 1), key=lambda i: dense[i])
+    return log_value(positions[valley - 1], hist.bin_width)
+
+def separation(hist, threshold):
+    """
+    Describe how well a threshold splits the histogram.
+
+    Args:
+        hist: LightHistogram.
+        threshold: Candidate level.
+
+    Returns:
+        dict:
+            blank/content counts, means and
+            standard deviations, "margin" (half
+            the gap between the blank 99th and
+            content 1st percentiles, negative
+            when they overlap) and "separation"
+            ((content mean - blank mean) /
+            (blank std + content std)).
+    """
+    centers, counts = hist.sorted_bins()
+    dark = [(c, n) for c, n in zip(centers, counts) if c < threshold]
+    bright = [(c, n) for c, n in zip(centers, counts) if c >= threshold]
+
+    def moments(group):
+        total = sum(n for _, n in group)
+        if not total:
+            return 0, None, None
+        mean = sum(c * n for c, n in group) / total
+        var = sum(n * (c - mean) ** 2 for c, n in group) / total
+        return total, mean, math.sqrt(var)
+
+    def percentile(group, pct):
+        total = sum(n for _, n in group)
+        target = total * pct / 100.0
+        seen = 0
+        for c, n in group:
+            seen += n
+            if seen >= target:
+                return c
+        return group[-1][0]
+
+    n0, mean0, std0 = moments(dark)
+    n1, mean1, std1 = moments(bright)
+    result = {"blank_count": n0, "content_count": n1,
+              "blank_mean": mean0, "content_mean": mean1,
+              "blank_std": std0, "content_std": std1,
+              "margin": None, "separation": None}
+    if n0 and n1:
+        result["margin"] = (percentile(bright, 1) - percentile(dark, 99)) / 2.0
+        spread = std0 + std1
+        result["separation"] = ((mean1 - mean0) / spread if spread
+                                else float("inf"))
+    return result
+
+def auto_level(dev, duration=2.0, method="otsu", bin_width=1.0, apply=True):
+    """
+    Tune the blank-frame level of a device.
+
+    Streams the light channel for duration
+    seconds while the display shows content with
+    blank frames, then picks and (optionally)
+    pushes the threshold. The level is only
+    applied when both populations are present;
+    a margin of zero or less means they overlap
+    and is reported with a warning. The stream
+    is stopped on the device and its leftover
+    input drained before set_level(), and the
+    level is confirmed with get_level().
+
+    Args:
+        dev: Connected Model2450 instance, not
+            already streaming.
+        duration: Sampling window (seconds).
+        method: "otsu" or "valley".
+        bin_width: Histogram bin width.
+        apply: Push the level with set_level().
+
+    Returns:
+        dict:
+            {"samples", "threshold", "level",
+             "applied", "ack", "readback",
+             ...separation() fields}; threshold
+             and level are None when no split was
+             found, applied is True only when the
+             readback matches level.
+
+    Raises:
+        ValueError:
+            If method is unknown.
+    """
+    pickers = {"otsu": otsu_threshold, "valley": valley_threshold}
+    if method not in pickers:
+        raise ValueError(f"unknown method {method!r}")
+
+    hist = LightHistogram(bin_width)
+    dev.start_stream(callback=hist.on_sample)
+    time.sleep(duration)
+    # Stops device output and drains it, so set_level reads its own ack
+    dev.stop_stream(wait=True)
+
+    threshold = pickers[method](hist)
+    result = {"samples": hist.count, "threshold": threshold, "level": None,
+              "applied": False, "ack": None, "readback": None}
+    if threshold is None:
+        print(f"No blank/content split found in {hist.count} samples")
+        return result
+    result.update(separation(hist, threshold))
+    result["level"] = int(round(threshold))
+    if result["margin"] is None or result["margin"] <= 0:
+        print(f"Warning: blank and content light overlap "
+              f"(margin {result['margin']})")
+    if apply and result["blank_count"] and result["content_count"]:
+        result["ack"] = dev.set_level(result["level"])
+        values = parse_stream_sample(dev.get_level() or "")
+        if values:
+            result["readback"] = values[0]
+        result["applied"] = result["readback"] == result["level"]
+        if not result["applied"]:
+            print(f"Level {result['level']} not confirmed: device reports "
+                  f"{result['readback']} (ack {result['ack']!r})")
+    return result
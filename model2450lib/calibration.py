@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: calibration.py
+#
+# Description:
+#     Scripted calibration workflow for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     Runs a sequence of calibration steps (red, green,
+#     blue, blank frame level), calling a display-change
+#     hook before each step. Each step's command and its
+#     readback are pipelined in one write, verified, and
+#     recorded. A whole rack is calibrated in one pass:
+#     the display changes once per step and all devices
+#     run the step in parallel.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 10:00:00  Vinay N
+#         Module created
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Step commands taken from the command registry
+#     v2.2.0  Wed Oct 21 2026 18:00:00  Vinay N
+#         Malformed color readback fails the step
+#
+##############################################################################
+# Built-in imports
+import threading
+import time
+
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+from model2450lib import commands
+
+class CalibrationStep:
+    """
+    One calibration step.
+
+    Attributes:
+        name: Step name passed to the display
+            hook, e.g. "red".
+        command: Wire command that stores the
+            calibration.
+        readback: Wire command whose reply
+            verifies the step.
+        verify: Function (response, readback)
+            returning True if the step took.
+    """
+    def __init__(self, name, command, readback, verify=None):
+        """
+        Initialize CalibrationStep instance.
+
+        Args:
+            name: Step name.
+            command: Wire command string or bytes.
+            readback: Wire readback command string or bytes.
+            verify: Optional check function;
+                default requires a non-empty
+                readback.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.name = name
+        self.command = command
+        self.readback = readback
+        self.verify = verify or _has_reply
+
+def _has_reply(response, readback):
+    return bool(readback)
+
+def dominant_channel(index):
+    """
+    Build a check that a color channel dominates.
+
+    Used after calibrating against a solid
+    color: the readback's channel at index
+    (0 red, 1 green, 2 blue) must be the
+    largest.
+
+    Args:
+        index: Channel index.
+
+    Returns:
+        function:
+            verify(response, readback), raising
+            ValueError if the readback does not
+            hold three color values.
+    """
+    def verify(response, readback):
+        if not readback:
+            return False
+        values = parse_stream_sample(readback)
+        if len(values) < 3:
+            raise ValueError(f"Malformed color readback: {readback!r}")
+        rgb = values[:3]
+        return rgb[index] == max(rgb)
+    return verify
+
+def level_equals(value):
+    """
+    Build a check that the level readback matches.
+
+    Args:
+        value: Level that was set.
+
+    Returns:
+        function:
+            verify(response, readback).
+    """
+    def verify(response, readback):
+        values = parse_stream_sample(readback or "")
+        return bool(values) and values[0] == float(value)
+    return verify
+
+def default_steps(level=None):
+    """
+    Build the standard calibration sequence.
+
+    Args:
+        level: Optional blank frame detection
+            level to set as the last step.
+
+    Returns:
+        list:
+            CalibrationStep objects.
+    """
+    color = commands.get("color").wire
+    steps = [
+        CalibrationStep("red", commands.get("set red").wire, color,
+                        dominant_channel(0)),
+        CalibrationStep("green", commands.get("set green").wire, color,
+                        dominant_channel(1)),
+        CalibrationStep("blue", commands.get("set blue").wire, color,
+                        dominant_channel(2)),
+    ]
+    if level is not None:
+        steps.append(CalibrationStep("level", commands.get("level {}").encode(level),
+                                     commands.get("level").wire,
+                                     level_equals(level)))
+    return steps
+
+def run_calibration(devices, steps=None, display_hook=None, settle=0.0):
+    """
+    Calibrate one or more devices.
+
+    For each step the display hook is called
+    once, then every device runs the step in
+    parallel: the step command and its readback
+    are sent in one write and both replies are
+    checked with the step's verify function.
+
+    Args:
+        devices: Model2450 instance or list.
+        steps: CalibrationStep list, default
+            default_steps().
+        display_hook: Optional function called
+            with the step name; it must return
+            once the display shows the stimulus.
+        settle: Extra wait after the hook
+            (seconds) for the sensor to settle.
+
+    Returns:
+        dict:
+            Mapping of port to record:
+            {
+                "ok": bool,
+                "steps": [
+                    {"step": "red", "response": str,
+                     "readback": str, "ok": bool,
+                     "elapsed_ms": float}, ...
+                ]
+            }
+
+    Raises:
+        None
+    """
+    if not isinstance(devices, (list, tuple)):
+        devices = [devices]
+    if steps is None:
+        steps = default_steps()
+    records = {dev.port: {"ok": True, "steps": []} for dev in devices}
+
+    def run_step(dev, step):
+        t0 = time.perf_counter()
+        response, readback = dev.send_cmd_batch([step.command, step.readback])
+        try:
+            ok = bool(step.verify(response, readback))
+        except Exception as e:
+            print(f"Verify failed for {step.name} on {dev.port}: {e}")
+            ok = False
+        record = records[dev.port]
+        record["steps"].append({
+            "step": step.name,
+            "response": response,
+            "readback": readback,
+            "ok": ok,
+            "elapsed_ms": (time.perf_counter() - t0) * 1000.0,
+        })
+        if not ok:
+            record["ok"] = False
+
+    for step in steps:
+        if display_hook:
+            display_hook(step.name)
+        if settle:
+            time.sleep(settle)
+        threads = [threading.Thread(target=run_step, args=(dev, step),
+                                    name=f"model2450-cal-{dev.port}", daemon=True)
+                   for dev in devices]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return records
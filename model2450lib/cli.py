@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: cli.py
+#
+# Description:
+#     Command-line tool for MCCI Model 2450
+#     BACK (Brightness And Color Kit).
+#
+#     Provides the `model2450` console command with
+#     discover, query, stream, blank-run, record and
+#     bench subcommands built on the library APIs.
+#     Stream output is newline-delimited JSON or a
+#     compact binary record format, written through
+#     a large buffer so piping a full-rate stream to
+#     another process costs little CPU.
+#
+#     Binary record format (little endian):
+#         int64   host arrival timestamp (ns, monotonic)
+#         uint16  payload length
+#         bytes   ASCII payload
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 15:00:00  Vinay N
+#         Module created
+#     v2.2.0  Mon Oct 19 2026 22:00:00  Vinay N
+#         Add serve subcommand for the multiplexing server
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Query commands taken from the command registry
+#     v2.2.0  Wed Oct 21 2026 11:00:00  Vinay N
+#         Document subcommand handlers
+#     v2.2.0  Thu Oct 22 2026 11:00:00  Vinay N
+#         Reject sample counts below one
+#
+##############################################################################
+# Built-in imports
+import argparse
+import contextlib
+import json
+import struct
+import sys
+import threading
+import time
+
+# Own modules
+from model2450lib import commands
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+RECORD_HEADER = struct.Struct("<qH")
+
+QUERY_COMMANDS = {command.name: command.method for command in commands.queries()}
+
+class SampleWriter:
+    """
+    Buffered writer for streamed samples.
+
+    Attributes:
+        out: Binary output stream.
+        fmt: Output format, "ndjson" or "binary".
+        count: Number of samples written.
+    """
+    def __init__(self, out, fmt):
+        """
+        Initialize SampleWriter instance.
+
+        Args:
+            out: Binary output stream.
+            fmt: Output format, "ndjson" or "binary".
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.out = out
+        self.fmt = fmt
+        self.count = 0
+
+    def write(self, timestamp_ns, text):
+        """
+        Write one sample record.
+
+        Args:
+            timestamp_ns: Host timestamp (ns).
+            text: ASCII sample payload.
+
+        Returns:
+            None
+
+        Raises:
+            OSError:
+                If the output stream is closed.
+        """
+        if self.fmt == "binary":
+            data = text.encode("ascii", errors="ignore")
+            self.out.write(RECORD_HEADER.pack(timestamp_ns, len(data)))
+            self.out.write(data)
+        else:
+            line = '{"t":%d,"data":%s}\n' % (timestamp_ns, json.dumps(text))
+            self.out.write(line.encode("ascii"))
+        self.count += 1
+
+def positive_int(text):
+    """
+    Parse a count argument of at least one.
+
+    Args:
+        text: Argument text.
+
+    Returns:
+        int:
+            Parsed count.
+
+    Raises:
+        argparse.ArgumentTypeError:
+            If the text is not an integer of
+            at least one.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"count must be at least 1, got {value}")
+    return value
+
+def open_device(port):
+    """
+    Open a Model2450 on a port.
+
+    Args:
+        port: Serial COM port name.
+
+    Returns:
+        Model2450:
+            Connected device instance.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+    """
+    from model2450lib.model2450 import Model2450
+
+    dev = Model2450(port)
+    dev.connect()
+    if dev.ser is None:
+        raise SystemExit(f"model2450: cannot open {port}")
+    return dev
+
+def run_stream(dev, writer, duration=None, count=None):
+    """
+    Stream samples from a device into a writer.
+
+    Args:
+        dev: Connected Model2450 instance.
+        writer: SampleWriter instance.
+        duration: Optional run time (seconds).
+        count: Optional number of samples.
+
+    Returns:
+        int:
+            Number of samples written.
+
+    Raises:
+        None
+    """
+    def on_sample(text, timestamp_ns):
+        try:
+            writer.write(timestamp_ns, text)
+        except (BrokenPipeError, ValueError):
+            dev.stop_stream()
+            return
+        if count is not None and writer.count >= count:
+            dev.stop_stream()
+
+    timer = None
+    if duration is not None:
+        timer = threading.Timer(duration, dev.stop_stream)
+        timer.daemon = True
+        timer.start()
+    try:
+        dev.get_stream3(callback=on_sample, verbose=False, timestamps=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if timer:
+            timer.cancel()
+    return writer.count
+
+def cmd_discover(args, out):
+    """
+    Handle "model2450 discover".
+
+    Writes one JSON line per detected device.
+
+    Args:
+        args: Parsed arguments (no_cache,
+            timeout).
+        out: Binary output stream.
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        None
+    """
+    from model2450lib import searchmodel
+
+    models = searchmodel.get_models(use_cache=not args.no_cache,
+                                    timeout=args.timeout)
+    for entry in models["models"]:
+        out.write((json.dumps(entry) + "\n").encode("ascii"))
+    return 0
+
+def cmd_query(args, out):
+    """
+    Handle "model2450 query".
+
+    Runs the requested query commands and writes
+    one JSON line per response.
+
+    Args:
+        args: Parsed arguments (port, commands,
+            repeat).
+        out: Binary output stream.
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+    """
+    dev = open_device(args.port)
+    try:
+        for _ in range(args.repeat):
+            for name in args.commands:
+                response = getattr(dev, QUERY_COMMANDS[name])()
+                record = {"port": args.port, "cmd": name, "response": response}
+                out.write((json.dumps(record) + "\n").encode("ascii"))
+    finally:
+        dev.disconnect()
+    return 0
+
+def cmd_stream(args, out):
+    """
+    Handle "model2450 stream".
+
+    Streams timestamped samples to stdout.
+
+    Args:
+        args: Parsed arguments (port, format,
+            duration, count).
+        out: Binary output stream.
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+    """
+    dev = open_device(args.port)
+    try:
+        run_stream(dev, SampleWriter(out, args.format),
+                   duration=args.duration, count=args.count)
+    finally:
+        dev.disconnect()
+    return 0
+
+def cmd_record(args, out):
+    """
+    Handle "model2450 record".
+
+    Streams timestamped samples to a file.
+
+    Args:
+        args: Parsed arguments (port, output,
+            format, duration, count).
+        out: Binary output stream (unused).
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+        OSError:
+            If the output file cannot be written.
+    """
+    dev = open_device(args.port)
+    try:
+        with open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+            written = run_stream(dev, SampleWriter(f, args.format),
+                                 duration=args.duration, count=args.count)
+    finally:
+        dev.disconnect()
+    print(f"Recorded {written} samples to {args.output}", file=sys.stderr)
+    return 0
+
+def cmd_blank_run(args, out):
+    """
+    Handle "model2450 blank-run".
+
+    Runs a blank-frame sequence and writes the
+    count as one JSON line.
+
+    Args:
+        args: Parsed arguments (port, duration).
+        out: Binary output stream.
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+    """
+    dev = open_device(args.port)
+    try:
+        blank = dev.run_blank_frame_sequence(duration=args.duration)
+    finally:
+        dev.disconnect()
+    record = {"port": args.port, "duration": args.duration, "blank_frames": blank}
+    out.write((json.dumps(record) + "\n").encode("ascii"))
+    return 0
+
+def cmd_bench(args, out):
+    """
+    Handle "model2450 bench".
+
+    Times repeated round trips of one query
+    command and writes a latency summary as one
+    JSON line.
+
+    Args:
+        args: Parsed arguments (port, cmd,
+            count).
+        out: Binary output stream.
+
+    Returns:
+        int:
+            Exit status.
+
+    Raises:
+        SystemExit:
+            If the port cannot be opened.
+    """
+    dev = open_device(args.port)
+    method = getattr(dev, QUERY_COMMANDS[args.cmd])
+    samples = []
+    try:
+        for _ in range(args.count):
+            t0 = time.perf_counter_ns()
+            method()
+            samples.append(time.perf_counter_ns() - t0)
+    finally:
+        dev.disconnect()
+
+    samples.sort()
+    def pct(p):
+        return samples[min(len(samples) - 1, int(p / 100.0 * len(samples)))] / 1e6
+    total_s = sum(samples) / 1e9
+    record = {
+        "port": args.port,
+        "cmd": args.cmd,
+        "count": len(samples),
+        "rate_hz": len(samples) / total_s if total_s else 0.0,
+        "min_ms": samples[0] / 1e6,
+        "p50_ms": pct(50),
+        "p99_ms": pct(99),
+        "max_ms": samples[-1] / 1e6,
+    }
+    out.write((json.dumps(record) + "\n").encode("ascii"))
+    return 0
+
+def build_parser():
+    """
+    Build the argument parser.
+
+    Args:
+        None
+
+    Returns:
+        argparse.ArgumentParser:
+            Configured parser.
+
+    Raises:
+        None
+    """
+    parser = argparse.ArgumentParser(
+        prog="model2450",
+        description="MCCI Model 2450 BACK command-line tool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("discover", help="list connected devices as NDJSON")
+    p.add_argument("--no-cache", action="store_true",
+                   help="probe every port instead of using the discovery cache")
+    p.add_argument("--timeout", type=float, default=5,
+                   help="discovery deadline (seconds)")
+    p.set_defaults(func=cmd_discover)
+
+    p = sub.add_parser("query", help="run one or more query commands")
+    p.add_argument("port")
+    p.add_argument("commands", nargs="+", choices=sorted(QUERY_COMMANDS))
+    p.add_argument("--repeat", type=int, default=1)
+    p.set_defaults(func=cmd_query)
+
+    for name, func, text in (("stream", cmd_stream, "stream samples to stdout"),
+                             ("record", cmd_record, "record samples to a file")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("port")
+        if name == "record":
+            p.add_argument("-o", "--output", required=True)
+        p.add_argument("--format", choices=("ndjson", "binary"), default="ndjson")
+        p.add_argument("--duration", type=float, help="stop after N seconds")
+        p.add_argument("--count", type=positive_int, help="stop after N samples")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("blank-run", help="count blank frames for a duration")
+    p.add_argument("port")
+    p.add_argument("--duration", type=float, default=10)
+    p.set_defaults(func=cmd_blank_run)
+
+    p = sub.add_parser("serve", help="share devices over a Unix domain socket",
+                       add_help=False)
+    p.add_argument("args", nargs=argparse.REMAINDER)
+
+    p = sub.add_parser("bench", help="measure command round-trip latency")
+    p.add_argument("port")
+    p.add_argument("--cmd", choices=sorted(QUERY_COMMANDS), default="read")
+    p.add_argument("--count", type=positive_int, default=100)
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+def main(argv=None):
+    """
+    Console entry point.
+
+    Library diagnostics are redirected to stderr
+    so stdout carries only data records.
+
+    Args:
+        argv: Optional argument list.
+
+    Returns:
+        int:
+            Process exit status.
+
+    Raises:
+        None
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        # The server has its own options; hand them over untouched
+        from model2450lib import muxserver
+        return muxserver.main(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    out = open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE,
+               closefd=False)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            return args.func(args, out)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        try:
+            out.flush()
+        except BrokenPipeError:
+            pass
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: commands.py
+#
+# Description:
+#     Command registry for MCCI Model 2450 BACK
+#     (Brightness And Color Kit).
+#
+#     Describes every device command once: wire bytes
+#     (pre-encoded), response mode, expected reply
+#     command code, response parser and default
+#     deadline. The public Model2450 command methods,
+#     the sampler's pipelined commands and the CLI
+#     queries are all derived from this table.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         Stream stop command
+#     v2.2.0  Wed Oct 21 2026 13:00:00  Vinay N
+#         Command lookup from sent text, per-command metric keys
+#     v2.2.0  Wed Oct 21 2026 20:00:00  Vinay N
+#         Full Args/Raises sections in generated docstrings
+#
+##############################################################################
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+
+# Response modes
+FRAMED = "framed"   # one framed reply message
+TEXT = "text"       # plain text lines, collected for a while
+STREAM = "stream"   # continuous framed samples
+NONE = "none"       # no reply (device resets or changes mode)
+
+def parse_text(response):
+    """
+    Return the response unchanged.
+
+    Args:
+        response: Decoded response string.
+
+    Returns:
+        str:
+            The response.
+    """
+    return response
+
+def parse_number(response):
+    """
+    Parse the first number of a response.
+
+    Args:
+        response: Decoded response, e.g.
+            "Lux:123.4".
+
+    Returns:
+        float | None:
+            The number, or None if there is none.
+    """
+    values = parse_stream_sample(response)
+    return values[0] if values else None
+
+def parse_numbers(response):
+    """
+    Parse all numbers of a response.
+
+    Args:
+        response: Decoded response, e.g.
+            "R:10 G:20 B:30".
+
+    Returns:
+        tuple:
+            The numbers, in order.
+    """
+    return parse_stream_sample(response)
+
+def parse_version(response):
+    """
+    Parse a "F:H" version response.
+
+    Args:
+        response: Decoded response, e.g. "3:1".
+
+    Returns:
+        tuple | str:
+            (firmware, hardware) integers, or the
+            response if it has another format.
+    """
+    parts = response.strip().split(":")
+    if len(parts) == 2 and all(part.isdigit() for part in parts):
+        return int(parts[0]), int(parts[1])
+    return response
+
+class Command:
+    """
+    One device command.
+
+    Attributes:
+        method: Model2450 method name, or None
+            for commands without a generated
+            method.
+        text: Command text without CRLF; may
+            contain a "{}" placeholder for one
+            argument.
+        wire: Pre-encoded bytes with CRLF, or
+            None for commands taking an argument.
+        mode: FRAMED, TEXT, STREAM or NONE.
+        code: Expected reply command code, or
+            None to accept any.
+        parser: Function turning the response
+            string into a value.
+        timeout: Default reply deadline
+            (seconds).
+        query: True for read-only commands that
+            are safe to pipeline and repeat.
+        doc: Docstring of the generated method.
+        key: Metrics key: the method name, or
+            the command text for commands
+            without a method.
+    """
+    def __init__(self, method, text, mode=FRAMED, code=None, parser=parse_text,
+                 timeout=2.0, query=False, doc=None):
+        """
+        Initialize Command instance.
+
+        Args:
+            method: Generated method name or None.
+            text: Command text without CRLF.
+            mode: Response mode.
+            code: Expected reply command code.
+            parser: Response parser.
+            timeout: Default deadline (seconds).
+            query: Read-only, pipeline-safe.
+            doc: Generated method docstring.
+
+        Returns:
+            None
+        """
+        self.method = method
+        self.text = text
+        self.takes_arg = "{}" in text
+        self.wire = None if self.takes_arg else (text + "\r\n").encode("ascii")
+        self.name = text.split()[0]
+        self.key = method or text
+        self.mode = mode
+        self.code = code
+        self.parser = parser
+        self.timeout = timeout
+        self.query = query
+        self.doc = doc
+
+    def encode(self, arg=None):
+        """
+        Get the wire bytes of the command.
+
+        Args:
+            arg: Argument for commands with a
+                placeholder.
+
+        Returns:
+            bytes:
+                Command bytes including CRLF.
+        """
+        if self.wire is not None:
+            return self.wire
+        return (self.text.format(arg) + "\r\n").encode("ascii")
+
+    def parse(self, response):
+        """
+        Parse a response with the command's parser.
+
+        Args:
+            response: Decoded response string.
+
+        Returns:
+            object:
+                Parsed value, or None for no
+                response.
+        """
+        if response is None:
+            return None
+        return self.parser(response)
+
+COMMANDS = (
+    Command("read_sn", "sn", query=True, doc="""
+        Read device serial number.
+
+        Sends SN command to retrieve the
+        unique serial number stored in EEPROM.
+
+        Args:
+            None
+
+        Returns:
+            str:
+                Serial number string.
+
+        Raises:
+            RuntimeError:
+                If device communication fails.
+        """),
+    Command("get_version", "version", parser=parse_version, query=True, doc="""
+        Get firmware and hardware version.
+
+        Version format:
+            F:H
+            F → Firmware version
+            H → Hardware version
+
+        Args:
+            None
+
+        Returns:
+            str:
+                Version information string.
+
+        Raises:
+            RuntimeError:
+                If command execution fails.
+        """),
+    Command("get_status", "status", query=True, doc="""
+        Get device status.
+
+        Args:
+            None
+
+        Returns:
+            str:
+                Status text, including the
+                product name.
+
+        Raises:
+            RuntimeError:
+                If command execution fails.
+        """),
+    Command("get_color", "color", parser=parse_numbers, query=True, doc="""
+        Read RGB color sensor values.
+
+        Retrieves color readings from
+        BH1749 color sensor.
+
+        Args:
+            None
+
+        Returns:
+            str:
+                RGB measurement data.
+
+        Raises:
+            RuntimeError:
+                If sensor read fails.
+        """),
+    Command("get_read", "read", parser=parse_number, query=True, doc="""
+        Read ambient light sensor value.
+
+        Retrieves lux data from the
+        OPT4001 ambient light sensor.
+
+        Args:
+            None
+
+        Returns:
+            str:
+                Ambient light measurement.
+
+        Raises:
+            RuntimeError:
+                If sensor read fails.
+        """),
+    Command("get_level", "level", parser=parse_number, query=True, doc="""
+        Get blank frame detection level.
+
+        Reads configured light threshold
+        used for black frame detection.
+
+        Args:
+            None
+
+        Returns:
+            str:
+                Current detection level.
+
+        Raises:
+            RuntimeError:
+                If read fails.
+        """),
+    Command("set_level", "level {}", doc="""
+        Set blank frame detection level.
+
+        Configures light threshold used
+        to detect blank frames.
+
+        Args:
+            value:
+                Detection level value.
+
+        Returns:
+            str:
+                Device acknowledgement.
+
+        Raises:
+            ValueError:
+                If value is invalid.
+        """),
+    Command("set_red", "set red", doc="""
+        Calibrate red channel.
+
+        Stores calibration reference
+        for red color.
+
+        Note:
+            Place sensor over red display
+            region before executing.
+
+        Returns:
+            str:
+                Calibration response.
+        """),
+    Command("set_blue", "set blue", doc="""
+        Calibrate blue channel.
+
+        Stores calibration reference
+        for blue color.
+
+        Note:
+            Place sensor over blue display
+            region before executing.
+
+        Returns:
+            str:
+                Calibration response.
+        """),
+    Command("set_green", "set green", doc="""
+        Calibrate green channel.
+
+        Stores calibration reference
+        for green color.
+
+        Note:
+            Place sensor over green display
+            region before executing.
+
+        Returns:
+            str:
+                Calibration response.
+        """),
+    Command("set_run", "run", mode=TEXT, doc="""
+        Start blank frame detection.
+
+        Device begins scanning
+        for black frames.
+
+        Returns:
+            str:
+                Run mode response.
+        """),
+    Command("set_stop", "stop", mode=TEXT, doc="""
+        Stop blank frame detection.
+
+        Stops scanning and prints
+        detection results.
+
+        Returns:
+            str:
+                Stop response output.
+        """),
+    Command(None, "stream 3", mode=STREAM),
+    # Stream type 0 selects no stream: the device stops sending samples
+    Command(None, "stream 0", mode=NONE),
+    Command(None, "reset", mode=NONE),
+    Command(None, "reset -b", mode=NONE),
+)
+
+# Lookup by method name and by command text
+BY_METHOD = {command.method: command for command in COMMANDS if command.method}
+BY_TEXT = {command.text: command for command in COMMANDS}
+
+def get(text):
+    """
+    Look up a command by its text.
+
+    Args:
+        text: Command text without CRLF, e.g.
+            "color" or "level {}".
+
+    Returns:
+        Command:
+            The registered command.
+
+    Raises:
+        KeyError:
+            If the command is not registered.
+    """
+    return BY_TEXT[text]
+
+def match(text):
+    """
+    Find the command a sent line belongs to.
+
+    Accepts the text as written to the device,
+    with or without CRLF and with the argument
+    filled in (e.g. "level 40").
+
+    Args:
+        text: Command line, str or bytes.
+
+    Returns:
+        Command | None:
+            The registered command, or None if
+            the line matches none.
+    """
+    if isinstance(text, bytes):
+        text = text.decode("ascii", errors="ignore")
+    text = " ".join(text.split())
+    command = BY_TEXT.get(text)
+    if command is None and " " in text:
+        command = BY_TEXT.get(text.rsplit(" ", 1)[0] + " {}")
+    return command
+
+def queries():
+    """
+    Get the read-only commands.
+
+    Returns:
+        list:
+            Commands with query set, in
+            registry order.
+    """
+    return [command for command in COMMANDS if command.query]
+
+def bind_methods(cls):
+    """
+    Add a method to cls for every named command.
+
+    Each method calls cls.execute(command) (or
+    execute(command, value) for commands taking
+    an argument) and carries the registry
+    docstring. Methods already defined on cls
+    are left alone.
+
+    Args:
+        cls: Device class providing execute().
+
+    Returns:
+        cls:
+            The class, so this can be used as a
+            decorator.
+    """
+    for command in COMMANDS:
+        if command.method is None or command.method in cls.__dict__:
+            continue
+        method = _make_method(command)
+        method.__qualname__ = f"{cls.__name__}.{command.method}"
+        method.__module__ = cls.__module__
+        setattr(cls, command.method, method)
+    return cls
+
+def _make_method(command):
+    if command.takes_arg:
+        def method(self, value):
+            return self.execute(command, value)
+    else:
+        def method(self):
+            return self.execute(command)
+    method.__name__ = command.method
+    method.__doc__ = command.doc
+    method.command = command
+    return method
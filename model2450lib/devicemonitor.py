@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: devicemonitor.py
+#
+# Description:
+#     Hot-plug monitor for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     Tracks port add/remove events by diffing
+#     port list snapshots and re-binds Model2450
+#     instances to their device's new port, matched
+#     by USB serial number, after a re-enumeration.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 13:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         Owner-side port drop, paced and quiet reconnect attempts
+#
+##############################################################################
+# Built-in imports
+import threading
+import time
+
+# Own modules
+from model2450lib import searchmodel
+
+class DeviceMonitor:
+    """
+    Port add/remove watcher with automatic reconnect.
+
+    A background thread polls the filtered port
+    list and reports differences between
+    successive snapshots. Attached Model2450
+    instances are reconnected when a port with
+    their USB serial number shows up again.
+
+    Attributes:
+        interval: Poll period (seconds).
+        on_add: Handler called with ListPortInfo
+            of each new port.
+        on_remove: Handler called with
+            ListPortInfo of each removed port.
+        on_reconnect: Handler called with
+            (device, seconds) after a device
+            is re-bound to its port.
+        retry_max: Longest pause between
+            reconnect attempts (seconds).
+        warn_interval: Minimum time between
+            reconnect failure messages (seconds).
+    """
+    retry_max = 2.0
+    warn_interval = 10.0
+
+    def __init__(self, interval=0.25, on_add=None, on_remove=None,
+                 on_reconnect=None):
+        """
+        Initialize DeviceMonitor instance.
+
+        Args:
+            interval: Poll period (seconds).
+            on_add: Optional port-added handler.
+            on_remove: Optional port-removed handler.
+            on_reconnect: Optional reconnect handler.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.interval = interval
+        self.on_add = on_add
+        self.on_remove = on_remove
+        self.on_reconnect = on_reconnect
+        self.ports = {}
+        self._bound = {}
+        self._lost = {}
+        self._retry = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def snapshot(self):
+        """
+        Take a snapshot of supported ports.
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                Mapping of port name to
+                ListPortInfo.
+
+        Raises:
+            None
+        """
+        return {info.device: info for info in searchmodel.filter_port_info()}
+
+    def start(self):
+        """
+        Start the background poll thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self.ports = self.snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="model2450-monitor",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background poll thread.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def attach(self, dev, usb_serial=None):
+        """
+        Bind a Model2450 instance to its USB serial number.
+
+        Args:
+            dev: SerialDevice or Model2450 instance.
+            usb_serial: USB serial number. Looked
+                up from the device's current port
+                when omitted.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError:
+                If the USB serial number cannot
+                be determined.
+        """
+        if usb_serial is None:
+            info = self.ports.get(dev.port) or self.snapshot().get(dev.port)
+            usb_serial = info.serial_number if info else None
+        if not usb_serial:
+            raise ValueError(f"No USB serial number known for {dev.port}")
+        with self._cond:
+            self._bound[id(dev)] = (dev, usb_serial)
+        dev.monitor = self
+
+    def detach(self, dev):
+        """
+        Stop tracking a Model2450 instance.
+
+        Args:
+            dev: Attached device instance.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            self._bound.pop(id(dev), None)
+            self._lost.pop(id(dev), None)
+            self._cond.notify_all()
+        dev.monitor = None
+
+    def mark_lost(self, dev):
+        """
+        Report that a device's port stopped responding.
+
+        Schedules the device for reconnect. The
+        dead handle is closed right away only if no
+        thread is reading or writing it; otherwise
+        the thread using it drops it, so the port is
+        never closed under a blocked read.
+
+        Args:
+            dev: Attached device instance.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            if id(dev) in self._bound and id(dev) not in self._lost:
+                self._lost[id(dev)] = time.monotonic()
+        dev.release_port()
+
+    def wait_reconnect(self, dev, timeout=None):
+        """
+        Block until a lost device is reconnected.
+
+        Args:
+            dev: Attached device instance.
+            timeout: Maximum wait (seconds), or
+                None to wait indefinitely.
+
+        Returns:
+            bool:
+                True if the device is connected
+                again, False on timeout or if the
+                device is not attached.
+
+        Raises:
+            None
+        """
+        self.mark_lost(dev)
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: id(dev) not in self._lost or id(dev) not in self._bound
+                        or self._stop.is_set(),
+                timeout) and id(dev) in self._bound and id(dev) not in self._lost
+
+    def poll(self):
+        """
+        Diff the port list once and reconnect lost devices.
+
+        Called periodically by the background
+        thread; may also be called directly when
+        no thread is running.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        current = self.snapshot()
+        added = [current[p] for p in current if p not in self.ports]
+        removed = [self.ports[p] for p in self.ports if p not in current]
+        self.ports = current
+
+        for info in removed:
+            for dev, usb_serial in self._bound_list():
+                if info.serial_number == usb_serial:
+                    self.mark_lost(dev)
+            if self.on_remove:
+                self.on_remove(info)
+
+        for info in added:
+            if self.on_add:
+                self.on_add(info)
+
+        with self._cond:
+            lost = [(self._bound[key], since) for key, since in self._lost.items()
+                    if key in self._bound]
+        for (dev, usb_serial), since in lost:
+            for info in current.values():
+                if info.serial_number == usb_serial:
+                    self._reconnect(dev, info.device, since)
+                    break
+
+    def _bound_list(self):
+        with self._cond:
+            return list(self._bound.values())
+
+    def _reconnect(self, dev, port, since):
+        if dev.ser is not None and not dev.release_port():
+            # Still in use: its owner drops it before the next read
+            return
+        now = time.monotonic()
+        next_try, failures, warned = self._retry.get(id(dev), (0.0, 0, None))
+        if now < next_try:
+            return
+        dev.port = port
+        dev.connect(quiet=True)
+        if not (dev.ser and dev.ser.is_open):
+            failures += 1
+            if warned is None or now - warned >= self.warn_interval:
+                print(f"Reconnect to {port} failed, retrying")
+                warned = now
+            delay = min(self.interval * (1 << min(failures, 8)), self.retry_max)
+            self._retry[id(dev)] = (now + delay, failures, warned)
+            return
+        self._retry.pop(id(dev), None)
+        elapsed = time.monotonic() - since
+        dev.reconnect_time = elapsed
+        with self._cond:
+            self._lost.pop(id(dev), None)
+            self._cond.notify_all()
+        print(f"Reconnected {port} after {elapsed:.3f} s")
+        if self.on_reconnect:
+            self.on_reconnect(dev, elapsed)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Device monitor poll failed: {e}")
+        with self._cond:
+            self._cond.notify_all()
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: discoverycache.py
+#
+# Description:
+#     Persistent discovery cache for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     Maps the USB identity of a port (VID/PID,
+#     USB serial number, location) to the model
+#     and version verified by a protocol probe, so
+#     known devices can be reported without
+#     opening their port again.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 11:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import json
+import os
+import time
+
+CACHE_VERSION = 1
+
+def cache_path():
+    """
+    Get default discovery cache file path.
+
+    The MODEL2450_CACHE environment variable
+    overrides the default location in the
+    per-user cache directory.
+
+    Args:
+        None
+
+    Returns:
+        str:
+            Cache file path.
+
+    Raises:
+        None
+    """
+    path = os.environ.get("MODEL2450_CACHE")
+    if path:
+        return path
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME",
+                              os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "model2450lib", "discovery.json")
+
+def usb_identity(info):
+    """
+    Build USB identity key for a port.
+
+    Args:
+        info: pyserial ListPortInfo object.
+
+    Returns:
+        str | None:
+            Identity key, or None if the port
+            exposes neither a USB serial number
+            nor a location to tell it apart.
+
+    Raises:
+        None
+    """
+    if info.vid is None or info.pid is None:
+        return None
+    if not info.serial_number and not info.location:
+        return None
+    return f"{info.vid:04X}:{info.pid:04X}:{info.serial_number}:{info.location}"
+
+def load_cache(path=None):
+    """
+    Load discovery cache from disk.
+
+    A missing, unreadable or outdated cache
+    file yields an empty cache.
+
+    Args:
+        path: Optional cache file path.
+
+    Returns:
+        dict:
+            Mapping of identity key to entry.
+
+    Raises:
+        None
+    """
+    path = path or cache_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    devices = data.get("devices")
+    return devices if isinstance(devices, dict) else {}
+
+def save_cache(cache, path=None):
+    """
+    Write discovery cache to disk.
+
+    The file is replaced atomically so a
+    concurrent reader never sees a partial
+    cache.
+
+    Args:
+        cache: Mapping of identity key to entry.
+        path: Optional cache file path.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+    path = path or cache_path()
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "devices": cache}, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Failed to save discovery cache: {e}")
+
+def lookup(cache, key, port):
+    """
+    Find a verified entry for a port.
+
+    Args:
+        cache: Mapping of identity key to entry.
+        key: USB identity key of the port.
+        port: Current COM port name.
+
+    Returns:
+        dict | None:
+            Cached entry if the identity is known
+            and still enumerates on the same port,
+            otherwise None.
+
+    Raises:
+        None
+    """
+    if key is None:
+        return None
+    entry = cache.get(key)
+    if entry is None or entry.get("port") != port:
+        return None
+    return entry
+
+def store(cache, key, entry):
+    """
+    Record a verified device in the cache.
+
+    Args:
+        cache: Mapping of identity key to entry.
+        key: USB identity key of the port.
+        entry: Discovery entry with port, model
+            and version.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+    cache[key] = {
+        "port": entry["port"],
+        "model": entry["model"],
+        "version": entry.get("version"),
+        "verified": time.time()
+    }
+
+def clear_cache(path=None):
+    """
+    Delete the discovery cache file.
+
+    Args:
+        path: Optional cache file path.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+    try:
+        os.remove(path or cache_path())
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: displaylatency.py
+#
+# Description:
+#     End-to-end display latency analysis for MCCI Model
+#     2450 BACK (Brightness And Color Kit) recordings.
+#
+#     Aligns a timestamped light stream with a stimulus
+#     log (frame-present timestamps and expected levels)
+#     by FFT cross-correlation, then matches every
+#     stimulus transition to the light edge that follows
+#     it and reports per-frame and aggregate latency.
+#     All steps are vectorized, so hours of samples are
+#     processed in seconds.
+#
+#     Requires numpy (pip install model2450lib[analysis]),
+#     which is imported on first use.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 15:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import json
+import struct
+
+# Lib imports (numpy is imported on first use)
+
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+
+# Record layout written by "model2450 record --format binary"
+RECORD_HEADER = struct.Struct("<qH")
+# Transitions matched per vectorized block (bounds memory)
+BLOCK = 65536
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("display latency analysis needs numpy: "
+                          "pip install model2450lib[analysis]") from None
+    return numpy
+
+def load_recording(path, channel=0):
+    """
+    Load a recording written by "model2450 record".
+
+    Args:
+        path: File in ndjson or binary format
+            (detected from the content).
+        channel: Sample value index (0 = light).
+
+    Returns:
+        tuple:
+            (t_ns, values) numpy arrays of int64
+            timestamps and float64 values.
+
+    Raises:
+        ImportError:
+            If numpy is not installed.
+        OSError:
+            If the file cannot be read.
+    """
+    np = _numpy()
+    with open(path, "rb") as f:
+        data = f.read()
+    times = []
+    values = []
+    if data[:1] == b"{":
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            sample = parse_stream_sample(record["data"])
+            if len(sample) > channel:
+                times.append(record["t"])
+                values.append(sample[channel])
+    else:
+        pos = 0
+        size = RECORD_HEADER.size
+        while pos + size <= len(data):
+            timestamp_ns, length = RECORD_HEADER.unpack_from(data, pos)
+            pos += size
+            sample = parse_stream_sample(data[pos:pos + length])
+            pos += length
+            if len(sample) > channel:
+                times.append(timestamp_ns)
+                values.append(sample[channel])
+    return np.array(times, dtype=np.int64), np.array(values, dtype=np.float64)
+
+def load_stimulus(path):
+    """
+    Load a stimulus log.
+
+    Each line holds a frame-present timestamp in
+    nanoseconds and the expected brightness
+    level, separated by a comma or whitespace.
+    Lines that do not start with a number (such
+    as a header) are skipped.
+
+    Args:
+        path: Text file path.
+
+    Returns:
+        tuple:
+            (present_ns, levels) numpy arrays.
+
+    Raises:
+        ImportError:
+            If numpy is not installed.
+        OSError:
+            If the file cannot be read.
+    """
+    np = _numpy()
+    times = []
+    levels = []
+    with open(path) as f:
+        for line in f:
+            fields = line.replace(",", " ").split()
+            if len(fields) < 2:
+                continue
+            try:
+                times.append(int(float(fields[0])))
+                levels.append(float(fields[1]))
+            except ValueError:
+                continue
+    return np.array(times, dtype=np.int64), np.array(levels, dtype=np.float64)
+
+def cross_correlate_lag(t_ns, values, present_ns, levels, grid_ms=1.0,
+                        max_lag_ms=500.0):
+    """
+    Estimate the overall stream lag behind the stimulus.
+
+    Both signals are resampled to a uniform grid,
+    normalized, and cross-correlated with an FFT;
+    the best lag within [0, max_lag_ms] wins.
+
+    Args:
+        t_ns: Sample timestamps (ns).
+        values: Sample values.
+        present_ns: Stimulus timestamps (ns).
+        levels: Expected level per stimulus.
+        grid_ms: Resampling interval (ms).
+        max_lag_ms: Largest lag considered (ms).
+
+    Returns:
+        int:
+            Lag in nanoseconds.
+
+    Raises:
+        ImportError:
+            If numpy is not installed.
+    """
+    np = _numpy()
+    step = int(grid_ms * 1e6)
+    start = int(present_ns[0])
+    stop = int(max(present_ns[-1], t_ns[-1]))
+    grid = np.arange(start, stop + step, step, dtype=np.int64)
+    measured = np.interp(grid, t_ns, values)
+    index = np.searchsorted(present_ns, grid, side="right") - 1
+    expected = levels[np.clip(index, 0, len(levels) - 1)]
+    measured = measured - measured.mean()
+    expected = expected - expected.mean()
+
+    n = len(grid)
+    size = 1 << int(2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(measured, size) * np.conj(np.fft.rfft(expected, size))
+    corr = np.fft.irfft(spectrum, size)
+    max_lag = min(int(max_lag_ms / grid_ms), n - 1)
+    best = int(np.argmax(corr[:max_lag + 1]))
+    return best * step
+
+def match_edges(t_ns, values, present_ns, levels, lag_ns=0, window_ms=100.0):
+    """
+    Match stimulus transitions to light edges.
+
+    Expected levels are mapped to sensor units
+    with a least-squares fit over the lag-aligned
+    signals. For every level change the midpoint
+    threshold is computed and the first sample
+    crossing it in the right direction inside
+    [present + lag - window, present + lag +
+    window] is found; the crossing time is
+    interpolated between samples.
+
+    Args:
+        t_ns: Sample timestamps (ns).
+        values: Sample values.
+        present_ns: Stimulus timestamps (ns).
+        levels: Expected level per stimulus.
+        lag_ns: Coarse lag (ns), e.g. from
+            cross_correlate_lag().
+        window_ms: Half-width of the search
+            window (ms).
+
+    Returns:
+        tuple:
+            (present_ns of each transition,
+             latency_ns as float64 with NaN for
+             unmatched transitions).
+
+    Raises:
+        ImportError:
+            If numpy is not installed.
+    """
+    np = _numpy()
+    # Map expected levels to sensor units
+    index = np.searchsorted(present_ns, t_ns - lag_ns, side="right") - 1
+    valid = index >= 0
+    expected = levels[index[valid]]
+    if np.ptp(expected) > 0:
+        gain, offset = np.polyfit(expected, values[valid], 1)
+    else:
+        gain, offset = 1.0, 0.0
+
+    change = np.nonzero(np.diff(levels))[0] + 1
+    edges = present_ns[change]
+    threshold = offset + gain * (levels[change - 1] + levels[change]) / 2.0
+    rising = (levels[change] > levels[change - 1]) == (gain > 0)
+
+    window = int(window_ms * 1e6)
+    first = np.searchsorted(t_ns, edges + lag_ns - window)
+    last = np.searchsorted(t_ns, edges + lag_ns + window)
+    span = int((last - first).max()) if len(edges) else 0
+    latency = np.full(len(edges), np.nan)
+    if span == 0:
+        return edges, latency
+
+    offsets = np.arange(span + 1)
+    for lo in range(0, len(edges), BLOCK):
+        hi = min(lo + BLOCK, len(edges))
+        pos = first[lo:hi, None] + offsets
+        inside = pos < last[lo:hi, None]
+        pos = np.minimum(pos, len(values) - 1)
+        level = values[pos]
+        thr = threshold[lo:hi, None]
+        crossed = np.where(rising[lo:hi, None], level >= thr, level <= thr)
+        # Only count a crossing that starts on the other side
+        crossed &= inside & (pos > 0)
+        prev = values[np.maximum(pos - 1, 0)]
+        crossed &= np.where(rising[lo:hi, None], prev < thr, prev > thr)
+        found = crossed.any(axis=1)
+        hit = first[lo:hi] + crossed.argmax(axis=1)
+        hit = hit[found]
+        v0 = values[hit - 1]
+        v1 = values[hit]
+        t0 = t_ns[hit - 1].astype(np.float64)
+        t1 = t_ns[hit].astype(np.float64)
+        denom = np.where(v1 != v0, v1 - v0, 1.0)
+        frac = np.clip((threshold[lo:hi][found] - v0) / denom, 0.0, 1.0)
+        latency[lo:hi][found] = t0 + frac * (t1 - t0) - edges[lo:hi][found]
+    return edges, latency
+
+def summarize(latency_ns):
+    """
+    Aggregate per-frame latencies.
+
+    Args:
+        latency_ns: Latencies in ns, NaN for
+            unmatched frames.
+
+    Returns:
+        dict:
+            matched and missed counts, mean, std,
+            min, p50, p90, p99 and max in
+            milliseconds.
+    """
+    np = _numpy()
+    matched = latency_ns[~np.isnan(latency_ns)] / 1e6
+    summary = {"frames": int(len(latency_ns)), "matched": int(len(matched)),
+               "missed": int(len(latency_ns) - len(matched))}
+    if len(matched):
+        p50, p90, p99 = np.percentile(matched, [50, 90, 99])
+        summary.update({
+            "mean_ms": float(matched.mean()),
+            "std_ms": float(matched.std()),
+            "min_ms": float(matched.min()),
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(matched.max()),
+        })
+    return summary
+
+def measure_latency(t_ns, values, present_ns, levels, grid_ms=1.0,
+                    max_lag_ms=500.0, window_ms=100.0):
+    """
+    Measure end-to-end display latency.
+
+    Args:
+        t_ns: Sample arrival timestamps (ns),
+            ascending, e.g. from load_recording()
+            or get_stream3(timestamps=True).
+        values: Light (or one color channel)
+            value per sample.
+        present_ns: Frame-present timestamps (ns)
+            on the same clock, ascending.
+        levels: Expected brightness per frame.
+        grid_ms: Cross-correlation grid (ms).
+        max_lag_ms: Largest latency considered
+            by cross-correlation (ms).
+        window_ms: Edge search half-width around
+            the correlated lag (ms).
+
+    Returns:
+        dict:
+            {"lag_ms": coarse correlation lag,
+             "present_ns": transition times,
+             "latency_ns": per-frame latency
+                 (NaN where no edge matched),
+             "summary": summarize() result}
+
+    Raises:
+        ImportError:
+            If numpy is not installed.
+        ValueError:
+            If either input is empty.
+    """
+    np = _numpy()
+    t_ns = np.asarray(t_ns, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    present_ns = np.asarray(present_ns, dtype=np.int64)
+    levels = np.asarray(levels, dtype=np.float64)
+    if len(t_ns) < 2 or len(present_ns) < 2:
+        raise ValueError("need at least two samples and two stimulus frames")
+
+    lag = cross_correlate_lag(t_ns, values, present_ns, levels,
+                              grid_ms, max_lag_ms)
+    edges, latency = match_edges(t_ns, values, present_ns, levels,
+                                 lag, window_ms)
+    return {"lag_ms": lag / 1e6, "present_ns": edges, "latency_ns": latency,
+            "summary": summarize(latency)}
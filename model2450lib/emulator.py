@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: emulator.py
+#
+# Description:
+#     Emulated MCCI Model 2450 BACK (Brightness And Color
+#     Kit) endpoints for testing without hardware.
+#
+#     Each emulated device is a pseudo-terminal that
+#     answers the text commands used by Model2450 with
+#     framed replies in the decode_packet format and
+#     produces "stream 3" samples at a fixed rate. One
+#     selector thread serves every device of a farm, so
+#     dozens of endpoints cost a single host thread.
+#
+#     POSIX only (uses the pty module).
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 14:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         "stream 0" stops stream output
+#
+##############################################################################
+# Built-in imports
+import os
+import selectors
+import threading
+import time
+
+# Command code of stream sample frames
+STREAM_COMMAND = 3
+# Command code of command replies
+REPLY_COMMAND = 1
+MAX_PAYLOAD = 29
+
+def encode_frames(payload, command=REPLY_COMMAND):
+    """
+    Split a payload into protocol frames.
+
+    Args:
+        payload: Payload bytes.
+        command: Command code (0-31).
+
+    Returns:
+        bytes:
+            Concatenated frames with start/end
+            bits and sequence numbers set.
+    """
+    chunks = [payload[i:i + MAX_PAYLOAD]
+              for i in range(0, len(payload), MAX_PAYLOAD)] or [b""]
+    out = bytearray()
+    last = len(chunks) - 1
+    for seq, chunk in enumerate(chunks):
+        b0 = command & 0x1F
+        if seq == 0:
+            b0 |= 0x80
+        if seq == last:
+            b0 |= 0x40
+        out.append(b0)
+        out.append(((seq & 0x07) << 5) | (len(chunk) + 2))
+        out += chunk
+    return bytes(out)
+
+class EmulatedDevice:
+    """
+    One emulated Model 2450 endpoint.
+
+    Attributes:
+        port: Pseudo-terminal path to open.
+        serial: Emulated serial number.
+        level: Blank-frame level.
+        streaming: True once a stream command
+            was received.
+        sent: Stream samples written.
+        dropped: Stream samples dropped because
+            the host did not drain the pty.
+        commands: Commands answered.
+    """
+    def __init__(self, index=0):
+        """
+        Initialize EmulatedDevice instance.
+
+        Args:
+            index: Device number, used for the
+                serial number.
+
+        Returns:
+            None
+
+        Raises:
+            OSError:
+                If no pseudo-terminal is available.
+        """
+        import pty
+        import tty
+
+        self.master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self.master, False)
+        self.port = os.ttyname(self._slave)
+        self.serial = f"EMU{index:04d}"
+        self.level = 100
+        self.streaming = False
+        self.sent = 0
+        self.dropped = 0
+        self.commands = 0
+        self._inbuf = b""
+
+    def reply(self, line):
+        """
+        Build the response to one command line.
+
+        Args:
+            line: Command text without CRLF.
+
+        Returns:
+            bytes | None:
+                Raw bytes to send, or None when the
+                command has no reply.
+        """
+        self.commands += 1
+        if line.startswith("stream"):
+            self.streaming = line.split()[-1] != "0"
+            return None
+        if line in ("run", "stop"):
+            return b"ok\r\n"
+        if line.startswith("level "):
+            try:
+                self.level = int(line.split()[1])
+                text = "OK"
+            except ValueError:
+                text = "ERR"
+        else:
+            text = {
+                "sn": self.serial,
+                "version": "3:1",
+                "status": "Model 2450 Brightness And Color Kit",
+                "color": "R:10 G:20 B:30",
+                "read": "Lux:123.4",
+                "level": f"Level:{self.level}",
+                "set red": "OK",
+                "set green": "OK",
+                "set blue": "OK",
+            }.get(line, "ERR")
+        return encode_frames(text.encode("ascii"))
+
+    def sample(self):
+        """
+        Build the next stream sample.
+
+        Returns:
+            bytes:
+                Framed "light,red,green,blue" line.
+        """
+        n = self.sent
+        text = f"{100 + n % 50}.0,{n % 7},{n % 11},{n % 13}\r\n"
+        return encode_frames(text.encode("ascii"), STREAM_COMMAND)
+
+    def on_readable(self):
+        try:
+            data = os.read(self.master, 4096)
+        except (BlockingIOError, OSError):
+            return
+        buf = self._inbuf + data
+        while b"\r\n" in buf:
+            line, buf = buf.split(b"\r\n", 1)
+            out = self.reply(line.decode("ascii", errors="ignore").strip())
+            if out:
+                self.write(out)
+        self._inbuf = buf
+
+    def write(self, data):
+        """
+        Write bytes to the host side.
+
+        Args:
+            data: Bytes to write.
+
+        Returns:
+            bool:
+                False if the pty buffer was full and
+                the data was dropped.
+        """
+        try:
+            written = os.write(self.master, data)
+        except BlockingIOError:
+            return False
+        except OSError:
+            return False
+        # A short write leaves a torn frame, like a real overflow
+        return written == len(data)
+
+    def close(self):
+        """
+        Close the pseudo-terminal.
+
+        Returns:
+            None
+        """
+        for fd in (self.master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+class EmulatorFarm:
+    """
+    A set of emulated devices served by one thread.
+
+    Attributes:
+        devices: EmulatedDevice instances.
+        rate: Stream samples per second per
+            device.
+        ports: Pseudo-terminal paths, in device
+            order.
+    """
+    def __init__(self, count, rate=200.0):
+        """
+        Initialize EmulatorFarm instance.
+
+        Args:
+            count: Number of devices.
+            rate: Stream rate per device (Hz).
+
+        Returns:
+            None
+        """
+        self.devices = [EmulatedDevice(i) for i in range(count)]
+        self.rate = rate
+        self.ports = [dev.port for dev in self.devices]
+        self._sel = selectors.DefaultSelector()
+        for dev in self.devices:
+            self._sel.register(dev.master, selectors.EVENT_READ, dev)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start serving the devices.
+
+        Returns:
+            None
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="model2450-emulator", daemon=True)
+        self._thread.start()
+
+    def stop_streams(self):
+        """
+        Stop stream output of every device.
+
+        Returns:
+            None
+        """
+        for dev in self.devices:
+            dev.streaming = False
+
+    def stats(self):
+        """
+        Get emulator counters.
+
+        Returns:
+            dict:
+                sent and dropped stream samples and
+                commands answered, summed over the
+                farm.
+        """
+        return {
+            "sent": sum(dev.sent for dev in self.devices),
+            "dropped": sum(dev.dropped for dev in self.devices),
+            "commands": sum(dev.commands for dev in self.devices),
+        }
+
+    def close(self):
+        """
+        Stop the serving thread and close all devices.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._sel.close()
+        for dev in self.devices:
+            dev.close()
+
+    def _run(self):
+        period_ns = int(1e9 / self.rate)
+        next_ns = time.monotonic_ns() + period_ns
+        while not self._stop.is_set():
+            wait = max(next_ns - time.monotonic_ns(), 0) / 1e9
+            for key, _ in self._sel.select(min(wait, 0.05)):
+                key.data.on_readable()
+            now = time.monotonic_ns()
+            if now < next_ns:
+                continue
+            # Catch up on missed ticks, at most one second's worth
+            ticks = min((now - next_ns) // period_ns + 1, int(self.rate) or 1)
+            next_ns += ticks * period_ns
+            if next_ns <= now:
+                next_ns = now + period_ns
+            for dev in self.devices:
+                if not dev.streaming:
+                    continue
+                for _ in range(ticks):
+                    if dev.write(dev.sample()):
+                        dev.sent += 1
+                    else:
+                        dev.dropped += 1
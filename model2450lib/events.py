@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: events.py
+#
+# Description:
+#     Low-latency light-transition events for MCCI Model 2450
+#     BACK (Brightness And Color Kit).
+#
+#     Watches the sensor stream with incremental,
+#     constant-time-per-sample detectors (threshold
+#     crossings with hysteresis, CUSUM step detection,
+#     color-change distance) and fires registered
+#     handlers from the stream read loop with the
+#     frame's arrival timestamp.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 12:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 18:30:00  Vinay N
+#         Detector parameter documentation
+#
+##############################################################################
+# Built-in imports
+import math
+import time
+
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+
+# Sample value layout for "stream 3": light, red, green, blue
+LIGHT = 0
+RGB = (1, 2, 3)
+
+class ThresholdDetector:
+    """
+    Threshold crossing with hysteresis.
+
+    A "falling" event fires when the channel
+    drops below threshold - hysteresis after
+    having been above threshold + hysteresis;
+    "rising" is the reverse. Typical use: screen
+    went dark / lit up.
+
+    Attributes:
+        name: Event name.
+        threshold: Crossing level.
+        hysteresis: Half-width of the dead band.
+        channel: Sample value index.
+        direction: "falling", "rising" or "both".
+    """
+    def __init__(self, name, threshold, hysteresis=0.0, channel=LIGHT,
+                 direction="falling"):
+        """
+        Initialize ThresholdDetector instance.
+
+        Args:
+            name: Event name passed to handlers.
+            threshold: Crossing level in sensor
+                units.
+            hysteresis: Half-width of the dead
+                band around threshold. The value
+                must pass threshold + hysteresis
+                (rising) or threshold - hysteresis
+                (falling) before the next event, so
+                noise near the level fires once.
+            channel: Sample value index (LIGHT or
+                one of RGB).
+            direction: "falling", "rising" or
+                "both".
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.name = name
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.channel = channel
+        self.direction = direction
+        self._high = None
+
+    def update(self, values):
+        """
+        Process one sample.
+
+        Args:
+            values: Parsed sample values.
+
+        Returns:
+            str | None:
+                "falling" or "rising" when an
+                enabled crossing occurs.
+        """
+        value = values[self.channel]
+        if self._high is None:
+            self._high = value >= self.threshold
+            return None
+        if self._high and value < self.threshold - self.hysteresis:
+            self._high = False
+            if self.direction in ("falling", "both"):
+                return "falling"
+        elif not self._high and value > self.threshold + self.hysteresis:
+            self._high = True
+            if self.direction in ("rising", "both"):
+                return "rising"
+        return None
+
+class CusumDetector:
+    """
+    Two-sided CUSUM step detector.
+
+    Tracks the channel's baseline with an
+    exponential average and accumulates
+    deviations beyond the drift allowance; an
+    event fires when either sum exceeds the
+    threshold, after which the baseline jumps
+    to the new level.
+
+    Attributes:
+        name: Event name.
+        drift: Deviation tolerated per sample.
+        threshold: Accumulated deviation that
+            signals a step.
+        channel: Sample value index.
+        alpha: Baseline averaging factor.
+    """
+    def __init__(self, name, drift, threshold, channel=LIGHT, alpha=0.05):
+        """
+        Initialize CusumDetector instance.
+
+        Args:
+            name: Event name passed to handlers.
+            drift: Deviation from the baseline
+                ignored per sample (sensor units),
+                typically half the smallest step
+                to detect; larger values suppress
+                slow drift and noise.
+            threshold: Accumulated deviation
+                beyond drift that signals a step;
+                lower values detect sooner but
+                fire more false events.
+            channel: Sample value index (LIGHT or
+                one of RGB).
+            alpha: Exponential averaging factor
+                of the baseline (0-1).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.name = name
+        self.drift = drift
+        self.threshold = threshold
+        self.channel = channel
+        self.alpha = alpha
+        self._mean = None
+        self._pos = 0.0
+        self._neg = 0.0
+
+    def update(self, values):
+        """
+        Process one sample.
+
+        Args:
+            values: Parsed sample values.
+
+        Returns:
+            str | None:
+                "step-up" or "step-down" when a
+                step is detected.
+        """
+        value = values[self.channel]
+        if self._mean is None:
+            self._mean = value
+            return None
+        dev = value - self._mean
+        self._pos = max(0.0, self._pos + dev - self.drift)
+        self._neg = max(0.0, self._neg - dev - self.drift)
+        if self._pos > self.threshold or self._neg > self.threshold:
+            kind = "step-up" if self._pos > self.threshold else "step-down"
+            self._mean = value
+            self._pos = self._neg = 0.0
+            return kind
+        self._mean += self.alpha * dev
+        return None
+
+class ColorChangeDetector:
+    """
+    Color change by Euclidean RGB distance.
+
+    Fires when the color moves farther than
+    distance from the reference color; the new
+    color then becomes the reference.
+
+    Attributes:
+        name: Event name.
+        distance: Trigger distance in sensor
+            counts.
+        channels: Sample value indices of the
+            red, green and blue channels.
+    """
+    def __init__(self, name, distance, channels=RGB):
+        """
+        Initialize ColorChangeDetector instance.
+
+        Args:
+            name: Event name passed to handlers.
+            distance: Euclidean RGB distance from
+                the reference color that fires an
+                event (sensor counts).
+            channels: Sample value indices of the
+                red, green and blue channels.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.name = name
+        self.distance = distance
+        self.channels = channels
+        self._ref = None
+
+    def update(self, values):
+        """
+        Process one sample.
+
+        Args:
+            values: Parsed sample values.
+
+        Returns:
+            str | None:
+                "color-change" when the distance
+                is exceeded.
+        """
+        color = [values[i] for i in self.channels]
+        if self._ref is None:
+            self._ref = color
+            return None
+        if math.dist(color, self._ref) > self.distance:
+            self._ref = color
+            return "color-change"
+        return None
+
+class EventEngine:
+    """
+    Runs detectors on the stream and fires handlers.
+
+    Handlers run on the stream read thread and
+    receive an event dict:
+        {"name", "kind", "t_ns", "detected_ns",
+         "latency_ns", "values"}
+    where t_ns is the frame arrival time and
+    latency_ns the detection delay after it.
+    Handlers should be short; hand heavy work
+    to another thread.
+
+    Attributes:
+        detectors: List of (detector, handlers).
+        events: Number of events fired.
+        max_latency_ns: Worst detection delay.
+    """
+    def __init__(self):
+        """
+        Initialize EventEngine instance.
+
+        Returns:
+            None
+        """
+        self.detectors = []
+        self.events = 0
+        self.samples = 0
+        self.total_latency_ns = 0
+        self.max_latency_ns = 0
+
+    def add(self, detector, handler):
+        """
+        Register a detector with a handler.
+
+        Args:
+            detector: Detector instance.
+            handler: Function called with the
+                event dict.
+
+        Returns:
+            detector:
+                The registered detector.
+        """
+        self.detectors.append((detector, handler))
+        return detector
+
+    def on_sample(self, text, timestamp_ns):
+        """
+        Stream callback for get_stream3(timestamps=True).
+
+        Args:
+            text: ASCII sample payload.
+            timestamp_ns: Frame arrival time.
+
+        Returns:
+            None
+        """
+        values = parse_stream_sample(text)
+        if values:
+            self.feed(values, timestamp_ns)
+
+    def feed(self, values, timestamp_ns):
+        """
+        Run all detectors on one parsed sample.
+
+        Args:
+            values: Parsed sample values.
+            timestamp_ns: Frame arrival time
+                (time.monotonic_ns).
+
+        Returns:
+            None
+        """
+        self.samples += 1
+        for detector, handler in self.detectors:
+            try:
+                kind = detector.update(values)
+            except IndexError:
+                continue
+            if kind is None:
+                continue
+            now = time.monotonic_ns()
+            latency = now - timestamp_ns
+            self.events += 1
+            self.total_latency_ns += latency
+            if latency > self.max_latency_ns:
+                self.max_latency_ns = latency
+            handler({
+                "name": detector.name,
+                "kind": kind,
+                "t_ns": timestamp_ns,
+                "detected_ns": now,
+                "latency_ns": latency,
+                "values": values,
+            })
+
+    def watch(self, dev):
+        """
+        Start streaming a device into this engine.
+
+        Args:
+            dev: Connected Model2450 instance.
+
+        Returns:
+            threading.Thread:
+                The device's stream thread.
+        """
+        return dev.start_stream(callback=self.on_sample, timestamps=True)
+
+    def stats(self):
+        """
+        Get detection counters.
+
+        Returns:
+            dict:
+                samples, events, mean and max
+                detection latency (ms).
+        """
+        return {
+            "samples": self.samples,
+            "events": self.events,
+            "mean_latency_ms": (self.total_latency_ns / self.events / 1e6
+                                if self.events else None),
+            "max_latency_ms": self.max_latency_ns / 1e6,
+        }
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: metrics.py
+#
+# Description:
+#     Low-overhead instrumentation for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     Provides per-command round-trip latency
+#     histograms, read/decode counters and stream
+#     rates, a stats() snapshot and an optional
+#     periodic text/JSON exporter. Devices only pay
+#     for instrumentation after enable_metrics().
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 19:00:00  Vinay N
+#         Module created
+#     v2.2.0  Mon Oct 19 2026 20:00:00  Vinay N
+#         Framing resync counters
+#     v2.2.0  Tue Oct 20 2026 13:00:00  Vinay N
+#         Reader backlog and overload reporting
+#     v2.2.0  Wed Oct 21 2026 13:00:00  Vinay N
+#         Full command keys, side-effect free snapshot()
+#
+##############################################################################
+# Built-in imports
+import json
+import sys
+import threading
+import time
+
+# Four sub-buckets per power of two: <= 12.5 % relative error
+HISTOGRAM_BUCKETS = 4 * 64 + 4
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in nanoseconds.
+
+    Attributes:
+        count: Number of recorded samples.
+        total_ns: Sum of recorded samples.
+        min_ns: Smallest sample.
+        max_ns: Largest sample.
+    """
+    def __init__(self):
+        """
+        Initialize LatencyHistogram instance.
+
+        Returns:
+            None
+        """
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def record(self, ns):
+        """
+        Record one latency sample.
+
+        Args:
+            ns: Latency in nanoseconds.
+
+        Returns:
+            None
+        """
+        bits = ns.bit_length()
+        if bits > 2:
+            index = (bits << 2) | ((ns >> (bits - 3)) & 3)
+        else:
+            index = ns
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, pct):
+        """
+        Estimate a latency percentile.
+
+        Args:
+            pct: Percentile (0-100).
+
+        Returns:
+            int | None:
+                Bucket midpoint in nanoseconds,
+                clamped to the observed min/max,
+                or None if empty.
+        """
+        if not self.count:
+            return None
+        target = max(1, int(self.count * pct / 100.0 + 0.5))
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= target:
+                value = _bucket_mid(index)
+                return min(max(value, self.min_ns), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            dict:
+                count, mean, min, p50, p90, p99
+                and max in milliseconds.
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6,
+            "min_ms": self.min_ns / 1e6,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p90_ms": self.percentile(90) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+def _bucket_mid(index):
+    if index < 12:
+        return index
+    bits = index >> 2
+    step = 1 << (bits - 3)
+    return (1 << (bits - 1)) + (index & 3) * step + step // 2
+
+class DeviceMetrics:
+    """
+    Counters and histograms for one device.
+
+    Attributes:
+        bytes_read: Bytes read from the port.
+        frames_read: Protocol frames parsed.
+        decode_errors: Frames that failed to
+            decode.
+        discarded_bytes: Bytes skipped to
+            resynchronize framing.
+        resyncs: Framing resynchronizations.
+        messages: Complete messages reassembled.
+        multi_frame_messages: Messages spanning
+            more than one frame.
+        stream_samples: Stream samples delivered.
+        batches: Bulk reads that returned data.
+        batch_bytes: Bytes in those reads.
+        backlog_bytes: Driver backlog at the
+            last read.
+        backlog_peak: Largest backlog seen.
+        overloads: Reader overload episodes.
+        overloaded: True while the reader is
+            falling behind.
+        read_size: Current adaptive read size.
+        processing: LatencyHistogram of the time
+            spent consuming each read batch.
+        commands: Mapping of command key (see
+            commands.Command.key) to
+            LatencyHistogram.
+    """
+    def __init__(self):
+        """
+        Initialize DeviceMetrics instance.
+
+        Returns:
+            None
+        """
+        self.started_ns = time.monotonic_ns()
+        self.bytes_read = 0
+        self.frames_read = 0
+        self.decode_errors = 0
+        self.discarded_bytes = 0
+        self.resyncs = 0
+        self.messages = 0
+        self.multi_frame_messages = 0
+        self.stream_samples = 0
+        self.batches = 0
+        self.batch_bytes = 0
+        self.backlog_bytes = 0
+        self.backlog_peak = 0
+        self.overloads = 0
+        self.overloaded = False
+        self.read_size = 0
+        self.processing = LatencyHistogram()
+        self.commands = {}
+
+    def command_done(self, cmd, elapsed_ns):
+        """
+        Record a command round trip.
+
+        Args:
+            cmd: Command key, e.g. "get_level" or
+                "set_red"; other text is recorded
+                under the line without CRLF.
+            elapsed_ns: Round-trip time (ns).
+
+        Returns:
+            None
+        """
+        name = cmd.strip()
+        hist = self.commands.get(name)
+        if hist is None:
+            hist = self.commands[name] = LatencyHistogram()
+        hist.record(elapsed_ns)
+
+    def reader_batch(self, reader, size, processing_ns):
+        """
+        Record one bulk read of a FrameReader.
+
+        Args:
+            reader: FrameReader that did the read.
+            size: Bytes read.
+            processing_ns: Time the consumer spent
+                on the previous batch, or None.
+
+        Returns:
+            None
+        """
+        if size:
+            self.batches += 1
+            self.batch_bytes += size
+        if processing_ns is not None:
+            self.processing.record(processing_ns)
+        self.backlog_bytes = reader.backlog
+        if reader.backlog_peak > self.backlog_peak:
+            self.backlog_peak = reader.backlog_peak
+        self.overloaded = reader.overloaded
+        self.read_size = reader.read_size
+
+    def snapshot(self, since=None):
+        """
+        Take a snapshot of all counters.
+
+        Rates are reported over the whole
+        lifetime and, as recent_* rates, since an
+        earlier snapshot passed by the caller.
+        Taking a snapshot changes no state, so
+        several readers can poll independently.
+
+        Args:
+            since: Earlier snapshot() result to
+                compute recent rates from; None
+                uses the whole lifetime.
+
+        Returns:
+            dict:
+                Counter values, rates and
+                per-command latency summaries.
+        """
+        now = time.monotonic_ns()
+        elapsed = max(now - self.started_ns, 1) / 1e9
+        if since is None:
+            since = {"monotonic_ns": self.started_ns, "frames_read": 0,
+                     "stream_samples": 0}
+        window = max(now - since["monotonic_ns"], 1) / 1e9
+        snap = {
+            "monotonic_ns": now,
+            "uptime_s": elapsed,
+            "bytes_read": self.bytes_read,
+            "frames_read": self.frames_read,
+            "decode_errors": self.decode_errors,
+            "discarded_bytes": self.discarded_bytes,
+            "resyncs": self.resyncs,
+            "messages": self.messages,
+            "multi_frame_messages": self.multi_frame_messages,
+            "stream_samples": self.stream_samples,
+            "backlog_bytes": self.backlog_bytes,
+            "backlog_peak": self.backlog_peak,
+            "overloads": self.overloads,
+            "overloaded": self.overloaded,
+            "read_size": self.read_size,
+            "mean_batch_bytes": (self.batch_bytes / self.batches
+                                 if self.batches else 0),
+            "batch_processing": self.processing.snapshot(),
+            "frame_rate": self.frames_read / elapsed,
+            "stream_rate": self.stream_samples / elapsed,
+            "recent_frame_rate": (self.frames_read - since["frames_read"]) / window,
+            "recent_stream_rate": ((self.stream_samples - since["stream_samples"])
+                                   / window),
+            "commands": {name: hist.snapshot()
+                         for name, hist in list(self.commands.items())},
+        }
+        return snap
+
+def format_text(stats):
+    """
+    Render a stats snapshot as text.
+
+    Args:
+        stats: Mapping of device name to
+            snapshot dict.
+
+    Returns:
+        str:
+            Multi-line report.
+    """
+    lines = []
+    for name, snap in stats.items():
+        lines.append(
+            f"{name}: frames={snap['frames_read']} "
+            f"({snap['recent_frame_rate']:.1f}/s) "
+            f"samples={snap['stream_samples']} "
+            f"({snap['recent_stream_rate']:.1f}/s) "
+            f"bytes={snap['bytes_read']} msgs={snap['messages']} "
+            f"errors={snap['decode_errors']} "
+            f"resyncs={snap['resyncs']}/{snap['discarded_bytes']}B "
+            f"backlog={snap['backlog_bytes']}B (peak {snap['backlog_peak']}B) "
+            f"overloads={snap['overloads']}"
+            + (" OVERLOADED" if snap['overloaded'] else ""))
+        for cmd, hist in snap["commands"].items():
+            if hist["count"]:
+                lines.append(
+                    f"    {cmd}: n={hist['count']} p50={hist['p50_ms']:.2f}ms "
+                    f"p99={hist['p99_ms']:.2f}ms max={hist['max_ms']:.2f}ms")
+    return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """
+    Periodic stats exporter.
+
+    Writes a stats snapshot of every device
+    to a text stream at a fixed interval, as a
+    text report or one JSON object per line.
+
+    Attributes:
+        devices: Devices with metrics enabled.
+        interval: Export period (seconds).
+        out: Text output stream.
+        fmt: "text" or "json".
+    """
+    def __init__(self, devices, interval=5.0, out=None, fmt="text"):
+        """
+        Initialize MetricsExporter instance.
+
+        Args:
+            devices: SerialDevice instances.
+            interval: Export period (seconds).
+            out: Text stream, default sys.stderr.
+            fmt: "text" or "json".
+
+        Returns:
+            None
+        """
+        self.devices = list(devices)
+        self.interval = interval
+        self.out = out or sys.stderr
+        self.fmt = fmt
+        self._last = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def export(self):
+        """
+        Write one snapshot now.
+
+        Recent rates cover the time since the
+        previous export.
+
+        Returns:
+            None
+        """
+        stats = {}
+        for dev in self.devices:
+            if dev.metrics is None:
+                continue
+            snap = dev.stats(since=self._last.get(dev.port))
+            self._last[dev.port] = snap
+            stats[dev.port] = snap
+        if self.fmt == "json":
+            self.out.write(json.dumps({"t": time.time(), "devices": stats}) + "\n")
+        else:
+            self.out.write(format_text(stats))
+        self.out.flush()
+
+    def start(self):
+        """
+        Start the export thread.
+
+        Returns:
+            None
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="model2450-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the export thread.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.export()
+            except Exception as e:
+                print(f"Metrics export failed: {e}")
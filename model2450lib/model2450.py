@@ -17,16 +17,45 @@
 # Revision history:
 #     v2.1.0  Wed Feb 16 2026 12:05:00  Vinay N
 #         Module created
+#     v2.2.0  Mon Oct 19 2026 13:00:00  Vinay N
+#         Stream resume after reconnect
+#     v2.2.0  Mon Oct 19 2026 15:00:00  Vinay N
+#         Optional quiet streaming for command-line use
+#     v2.2.0  Mon Oct 19 2026 18:00:00  Vinay N
+#         Arrival timestamps on streamed samples
+#     v2.2.0  Mon Oct 19 2026 19:00:00  Vinay N
+#         Stream and blank-frame metrics
+#     v2.2.0  Mon Oct 19 2026 21:00:00  Vinay N
+#         Verified reset and reconnect cycle
+#     v2.2.0  Mon Oct 19 2026 23:00:00  Vinay N
+#         Stream subscriptions with bounded queues
+#     v2.2.0  Tue Oct 20 2026 11:00:00  Vinay N
+#         Shared Reassembler for stream and blank-frame reads
+#     v2.2.0  Tue Oct 20 2026 12:00:00  Vinay N
+#         Timestamped callbacks for background streams
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Command methods generated from the command registry
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         Stop device output and drain input when a stream ends
+#     v2.2.0  Wed Oct 21 2026 13:00:00  Vinay N
+#         stats(since) for recent rates
+#     v2.2.0  Wed Oct 21 2026 15:00:00  Vinay N
+#         Reconnect only after the reset was seen to take effect
+#     v2.2.0  Wed Oct 21 2026 17:00:00  Vinay N
+#         Close stream subscriptions when the stream ends
 #
 ##############################################################################
 # Built-in imports
+import threading
 import time
 
 # Own modules
+from model2450lib import searchmodel
+from model2450lib import commands
 from model2450lib.serialmodel import SerialDevice
+from model2450lib.streambus import StreamBus
+from model2450lib.streambus import DROP_OLDEST
 from model2450lib.packetutils import decode_packet
-from model2450lib.packetutils import read_packet_from_serial
-from model2450lib.packetutils import read_block_frames
 
 class Model2450(SerialDevice):
     """
@@ -40,6 +69,12 @@ class Model2450(SerialDevice):
     RGB color sensing, blank frame detection,
     calibration storage, streaming telemetry,
     and EEPROM tag operations.
+
+    The command methods (read_sn, get_version,
+    get_status, get_color, get_read, get_level,
+    set_level, set_red, set_green, set_blue,
+    set_run, set_stop) are generated from the
+    registry in model2450lib.commands.
     """
     def __init__(self, port):
         """
@@ -61,276 +96,424 @@ class Model2450(SerialDevice):
         self.light_data = []
         self.time_data = []
         self.keep_running = True
+        self.bus = StreamBus()
+        self.stream_thread = None
 
-    def read_sn(self):
+    def do_reset(self):
         """
-        Read device serial number.
-
-        Sends SN command to retrieve the
-        unique serial number stored in EEPROM.
+        Perform bootloader reset.
 
-        Args:
-            None
+        Resets device into firmware
+        update mode.
 
         Returns:
-            str:
-                Serial number string.
-
-        Raises:
-            RuntimeError:
-                If device communication fails.
+            None
         """
-        return self.send_cmd('sn\r\n')
-
-    def get_version(self):
+        try:
+            self.send_command(commands.get("reset -b").wire)
+            time.sleep(0.1)  # Give time for device to reset
+            self.disconnect()  # Close serial port cleanly
+        except Exception as e:
+            print(f"Ignoring expected error during reset: {e}")
+            
+    def reset_mode(self):
         """
-        Get firmware and hardware version.
-
-        Version format:
-            F:H
-            F → Firmware version
-            H → Hardware version
+        Perform device reset.
 
-        Args:
-            None
+        Reboots device for firmware
+        or configuration updates.
 
         Returns:
-            str:
-                Version information string.
-
-        Raises:
-            RuntimeError:
-                If command execution fails.
+            None
         """
-        return self.send_cmd('version\r\n')
+        try:
+            self.send_command(commands.get("reset").wire)
+            time.sleep(0.1)  # Give time for device to reset
+            self.disconnect()  # Close serial port cleanly
+        except Exception as e:
+            print(f"Ignoring expected error during reset: {e}")
 
-    def get_color(self):
+    def reset(self, timeout=2, poll=0.02):
         """
-        Read RGB color sensor values.
+        Reboot device and wait for it to leave the bus.
 
-        Retrieves color readings from
-        BH1749 color sensor.
+        Sends the reset command and keeps the port
+        open until the device is seen to go away:
+        its port disappears from the port list, or
+        the open handle fails because the device
+        disconnected (this also works on platforms
+        that keep the port name across a reboot).
+        The port is closed afterwards.
 
         Args:
-            None
+            timeout:
+                Maximum wait for the device to
+                leave (seconds).
+            poll:
+                Port list poll period (seconds).
 
         Returns:
-            str:
-                RGB measurement data.
-
-        Raises:
-            RuntimeError:
-                If sensor read fails.
-        """
-        return self.send_cmd('color\r\n')
-
-    def get_read(self):
-        """
-        Read ambient light sensor value.
+            float | None:
+                Seconds until the device left, or
+                None if the reset could not be sent
+                or the device was still there at
+                the deadline.
+        """
+        import serial
+
+        listed = searchmodel.find_port_info(self.port) is not None
+        start = time.monotonic()
+        if not (self.ser and self.ser.is_open):
+            print(f"Reset of {self.port} failed: port not open")
+            return None
+        try:
+            self.send_command(commands.get("reset").wire)
+        except (OSError, serial.SerialException) as e:
+            print(f"Reset of {self.port} failed: {e}")
+            self.drop_port()
+            return None
 
-        Retrieves lux data from the
-        OPT4001 ambient light sensor.
+        left = None
+        try:
+            while time.monotonic() - start < timeout:
+                if listed and searchmodel.find_port_info(self.port) is None:
+                    left = time.monotonic() - start
+                    break
+                with self.io_lock:
+                    ser = self.ser
+                    if ser is None or self.port_lost:
+                        # The device monitor saw it go
+                        left = time.monotonic() - start
+                        break
+                    try:
+                        ser.timeout = poll
+                        # Discard output; a vanished device fails the read
+                        ser.read(ser.in_waiting or 1)
+                    except (OSError, serial.SerialException):
+                        left = time.monotonic() - start
+                        break
+        finally:
+            self.drop_port()
+        return left
+
+    def reboot_and_reconnect(self, timeout=10, poll=0.02):
+        """
+        Reboot device and reopen it once ready.
+
+        Waits for the device to leave the bus
+        (see reset()) and re-enumerate, matches it
+        by USB serial number (it may come back on
+        a different port), reopens it and confirms
+        readiness with a version probe instead of
+        fixed sleeps. With a DeviceMonitor
+        attached, the monitor does the re-binding.
 
         Args:
-            None
+            timeout:
+                Maximum time until ready (seconds).
+            poll:
+                Port list poll period (seconds).
 
         Returns:
-            str:
-                Ambient light measurement.
+            float:
+                Time from reset to ready (seconds),
+                also stored in reconnect_time.
 
         Raises:
             RuntimeError:
-                If sensor read fails.
-        """
-        return self.send_cmd('read\r\n')
-
-    def get_level(self):
-        """
-        Get blank frame detection level.
-
-        Reads configured light threshold
-        used for black frame detection.
+                If the reset was not acknowledged
+                by the device leaving the bus, or
+                the device is not ready within the
+                timeout.
+        """
+        info = searchmodel.find_port_info(self.port)
+        usb_serial = info.serial_number if info else None
+        start = time.monotonic()
+        deadline = start + timeout
+
+        if self.reset(timeout=min(2, timeout), poll=poll) is None:
+            # Reopening now could reach the device before it reboots
+            raise RuntimeError(f"Reset of {self.port} was not acknowledged")
+
+        if self.monitor is not None:
+            self.monitor.wait_reconnect(self, max(0, deadline - time.monotonic()))
+        else:
+            while time.monotonic() < deadline:
+                port = searchmodel.find_port_by_usb_serial(usb_serial)
+                if port is None and (info is None
+                                     or searchmodel.find_port_info(self.port)):
+                    port = self.port
+                if port is not None:
+                    self.port = port
+                    self.connect()
+                    if self.ser is not None:
+                        break
+                time.sleep(poll)
+
+        if not (self.ser and self.ser.is_open) or not self.wait_ready(deadline):
+            raise RuntimeError(f"Device on {self.port} not ready after {timeout} s")
+
+        self.reconnect_time = time.monotonic() - start
+        return self.reconnect_time
+
+    def wait_ready(self, deadline, interval=0.05):
+        """
+        Probe an open port until the device answers.
+
+        Repeatedly sends the version command with
+        a short read timeout until a framed reply
+        decodes.
 
         Args:
-            None
+            deadline:
+                time.monotonic() value to give up at.
+            interval:
+                Read timeout per probe (seconds).
 
         Returns:
-            str:
-                Current detection level.
-
-        Raises:
-            RuntimeError:
-                If read fails.
+            bool:
+                True once the device answered.
         """
-        return self.send_cmd('level\r\n')
-    
-    def set_red(self):
+        saved_timeout = self.ser.timeout
+        self.ser.timeout = interval
+        try:
+            while time.monotonic() < deadline:
+                self.ser.reset_input_buffer()
+                self.reader = None
+                self.send_command(commands.get("version").wire)
+                frame = self.read_frame()
+                if frame:
+                    try:
+                        decode_packet(frame[0])
+                        return True
+                    except ValueError:
+                        pass
+            return False
+        except OSError as e:
+            print(f"Ready probe failed: {e}")
+            return False
+        finally:
+            if self.ser is not None:
+                self.ser.timeout = saved_timeout
+
+    def get_stream3(self, callback=None, verbose=True, timestamps=False):
         """
-        Calibrate red channel.
-
-        Stores calibration reference
-        for red color.
-
-        Note:
-            Place sensor over red display
-            region before executing.
+        Start dual sensor streaming.
 
-        Returns:
-            str:
-                Calibration response.
-        """
-        return self.send_cmd('set red\r\n')
-    
-    def set_blue(self):
-        """
-        Calibrate blue channel.
+        Streams ambient light and
+        color sensor data.
 
-        Stores calibration reference
-        for blue color.
+        Streaming continues until stop_stream()
+        is called. With a DeviceMonitor attached,
+        the stream resumes after the device
+        re-enumerates. When the loop ends the
+        device is told to stop streaming and the
+        leftover input is drained, so commands
+        sent afterwards read their own replies,
+        and every subscription is closed, so
+        consumers iterating over one finish.
 
-        Note:
-            Place sensor over blue display
-            region before executing.
+        Args:
+            callback:
+                Optional handler function
+                to process streamed data.
+            verbose:
+                Print each received sample.
+            timestamps:
+                Call callback(sample, timestamp_ns)
+                with the frame's host arrival time
+                (time.monotonic_ns) instead of
+                callback(sample).
 
         Returns:
-            str:
-                Calibration response.
-        """
-        return self.send_cmd('set blue\r\n')
-    
-    def set_green(self):
+            None
         """
-        Calibrate green channel.
+        import serial
 
-        Stores calibration reference
-        for green color.
-
-        Note:
-            Place sensor over green display
-            region before executing.
+        self.stream_cmd = commands.get("stream 3").wire
+        self.keep_running = True
+        asm = self.line_asm
+        asm.reset()
+        self.send_command(self.stream_cmd)
+
+        while self.keep_running:
+            if not (self.ser and self.ser.is_open):
+                if not self.await_reconnect():
+                    break
+                asm.reset()
+                continue
+            try:
+                frame = self.read_frame()
+            except (OSError, serial.SerialException) as e:
+                print(f"[get_stream3] Read error: {e}")
+                self.drop_port()
+                continue
+            if frame:
+                packet, timestamp_ns = frame
+                try:
+                    decoded = decode_packet(packet)
+                    lines = asm.feed_lines(decoded["payload"], timestamp_ns)
+                    if decoded["end_bit"]:
+                        # A message without a trailing CRLF is a sample too
+                        tail = asm.flush()
+                        if tail is not None:
+                            lines.append(tail)
+
+                    for line in lines:
+                        ascii_payload = str(line, "ascii", "ignore").strip()
+                        if not ascii_payload:
+                            continue
+                        self.last_timestamp_ns = timestamp_ns
+                        if self.metrics is not None:
+                            self.metrics.stream_samples += 1
+                        if self.bus.subscriptions:
+                            self.bus.publish((timestamp_ns, ascii_payload))
+                        if verbose:
+                            print(f"[get_stream3] Received: {ascii_payload}")
+                        if callback:
+                            if timestamps:
+                                callback(ascii_payload, timestamp_ns)
+                            else:
+                                callback(ascii_payload)
 
-        Returns:
-            str:
-                Calibration response.
-        """
-        return self.send_cmd('set green\r\n')
-    
-    def set_run(self):
-        """
-        Start blank frame detection.
+                except Exception as e:
+                    if self.metrics is not None:
+                        self.metrics.decode_errors += 1
+                    print(f"[get_stream3] Decode error: {e}")
 
-        Device begins scanning
-        for black frames.
+        self.stream_cmd = None
+        self.end_stream()
+        # Wake consumers blocked on a subscription that will get no more
+        self.bus.close()
 
-        Returns:
-            str:
-                Run mode response.
+    def end_stream(self):
         """
-        return self.send_text_command('run\r\n')
-    
-    def set_stop(self):
-        """
-        Stop blank frame detection.
+        Stop device stream output and drain the input.
 
-        Stops scanning and prints
-        detection results.
+        Args:
+            None
 
         Returns:
-            str:
-                Stop response output.
+            int:
+                Number of stream bytes discarded.
         """
-        return self.send_text_command('stop\r\n')
+        try:
+            self.send_command(commands.get("stream 0").wire)
+        except OSError as e:
+            print(f"Stream stop failed: {e}")
+            return 0
+        return self.drain()
 
-    def do_reset(self):
+    def stop_stream(self, wait=True):
         """
-        Perform bootloader reset.
+        Stop the streaming read loop.
 
-        Resets device into firmware
-        update mode.
+        The loop exits after the current read
+        returns (at most the serial timeout), then
+        stops device output and drains the input.
+
+        Args:
+            wait: Wait for a start_stream() thread
+                to finish, so the port is ready
+                for commands on return.
 
         Returns:
             None
         """
-        try:
-            self.send_command('reset -b\r\n')
-            time.sleep(0.1)  # Give time for device to reset
-            self.disconnect()  # Close serial port cleanly
-        except Exception as e:
-            print(f"Ignoring expected error during reset: {e}")
-            
-    def reset_mode(self):
+        self.keep_running = False
+        thread = self.stream_thread
+        if (wait and thread is not None and thread.is_alive()
+                and thread is not threading.current_thread()):
+            thread.join()
+
+    def start_stream(self, callback=None, timestamps=False):
         """
-        Perform device reset.
+        Run get_stream3 on a background thread.
 
-        Reboots device for firmware
-        or configuration updates.
+        Consumers read samples through
+        subscribe() instead of a callback
+        running inside the read loop.
+
+        Args:
+            callback:
+                Optional handler passed to
+                get_stream3.
+            timestamps:
+                Pass arrival timestamps to the
+                callback, as in get_stream3.
 
         Returns:
-            None
+            threading.Thread:
+                The reader thread.
         """
-        try:
-            self.send_command('reset\r\n')
-            time.sleep(0.1)  # Give time for device to reset
-            self.disconnect()  # Close serial port cleanly
-        except Exception as e:
-            print(f"Ignoring expected error during reset: {e}")
+        if self.stream_thread and self.stream_thread.is_alive():
+            return self.stream_thread
+        self.keep_running = True
+        self.stream_thread = threading.Thread(
+            target=self.get_stream3,
+            kwargs={"callback": callback, "verbose": False,
+                    "timestamps": timestamps},
+            name=f"model2450-stream-{self.port}", daemon=True)
+        self.stream_thread.start()
+        return self.stream_thread
 
-    def set_level(self, value):
+    def subscribe(self, maxsize=1024, policy=DROP_OLDEST):
         """
-        Set blank frame detection level.
+        Subscribe to stream samples.
 
-        Configures light threshold used
-        to detect blank frames.
+        Each subscription has its own bounded
+        queue of (timestamp_ns, sample) tuples,
+        filled by the stream read loop. It is
+        closed when the stream ends: iteration
+        stops once the queued samples are read.
+        Subscribe again for the next stream.
 
         Args:
-            value:
-                Detection level value.
+            maxsize:
+                Queue capacity.
+            policy:
+                "block", "drop-oldest",
+                "drop-newest" or "conflate".
 
         Returns:
-            str:
-                Device acknowledgement.
-
-        Raises:
-            ValueError:
-                If value is invalid.
+            Subscription:
+                Queue to read samples from.
         """
-        cmd = f'level {value}\r\n'
-        return self.send_cmd(cmd)
-    
-    def get_stream3(self, callback=None):
-        """
-        Start dual sensor streaming.
+        return self.bus.subscribe(maxsize, policy)
 
-        Streams ambient light and
-        color sensor data.
+    def unsubscribe(self, sub):
+        """
+        Cancel a stream subscription.
 
         Args:
-            callback:
-                Optional handler function
-                to process streamed data.
+            sub:
+                Subscription from subscribe().
 
         Returns:
             None
         """
-        self.send_stream_cmd("stream 3\r\n")  # or whatever command starts the stream
+        self.bus.unsubscribe(sub)
 
-        while self.ser and self.ser.is_open:
-            packet = read_packet_from_serial(self.ser)
-            if packet:
-                try:
-                    decoded = decode_packet(packet)
-                    payload = decoded.get("payload", b"")
-                    ascii_payload = payload.decode("ascii", errors="ignore").strip()
-                    
-                    if ascii_payload:
-                        print(f"[get_stream3] Received: {ascii_payload}")
-                        if callback:
-                            callback(ascii_payload)
+    def stats(self, since=None):
+        """
+        Get metrics and subscriber counters.
 
-                except Exception as e:
-                    print(f"[get_stream3] Decode error: {e}")
+        Args:
+            since:
+                Earlier stats() result for the
+                recent_* rates.
+
+        Returns:
+            dict:
+                Metrics snapshot (when enabled)
+                plus a "subscribers" list when
+                any subscription is active.
+        """
+        snap = super().stats(since)
+        if self.bus.subscriptions:
+            snap["subscribers"] = self.bus.stats()
+        return snap
 
-  
     def run_blank_frame_sequence(self, duration=10):
         """
         Execute blank frame detection sequence.
@@ -346,44 +529,42 @@ class Model2450(SerialDevice):
             int:
                 Blank frame count.
         """
-        self.ser.write(b"run\r\n")  # Use self.ser instead of ser
+        self.ser.write(commands.get("run").wire)  # Use self.ser instead of ser
 
-        start_time = time.time()  # Track the start time
-        buffered_payload = b""
+        start_time = time.monotonic()  # Track the start time
+        asm = self.message_asm
+        asm.reset()
         blank_frame_count = 0  # Initialize a counter for blank frames
 
         while self.ser and self.ser.is_open:
             # Check if the elapsed time has passed the duration
-            if time.time() - start_time >= duration:
+            if time.monotonic() - start_time >= duration:
                 self.stop_blank_frame_sequence()  # Stop the sequence after the specified duration
                 break
 
-            packet = read_block_frames(self.ser)
-            if packet:
+            frame = self.read_frame()
+            if frame:
+                packet, timestamp_ns = frame
                 try:
                     decoded = decode_packet(packet)
-                    payload = decoded.get("payload", b"")
-                    start_bit = decoded["start_bit"]
-                    end_bit = decoded["end_bit"]
-                    if start_bit:
-                        buffered_payload = payload
-                    else:
-                        buffered_payload += payload
-
-                    if end_bit or len(payload) < decoded["length"] - 2:
+                    message = asm.feed(decoded, timestamp_ns)
+
+                    if message is not None:
+                        self.last_timestamp_ns = timestamp_ns
+                        if self.metrics is not None:
+                            self.metrics.messages += 1
                         try:
-                            ascii_payload = buffered_payload.decode("ascii").strip()
+                            ascii_payload = str(message, "ascii").strip()
                             if not ascii_payload:  # Consider empty payload as blank frame
                                 blank_frame_count += 1
                         except UnicodeDecodeError:
-                            print(f"payload: {buffered_payload.hex()} (non-ascii)")
-                        buffered_payload = b""
+                            print(f"payload: {message.hex()} (non-ascii)")
 
                 except Exception as decode_err:
+                    if self.metrics is not None:
+                        self.metrics.decode_errors += 1
                     print("Decode error:", decode_err)
 
-            time.sleep(0.0006)
-
         return blank_frame_count  # Return the count of blank frames detected
 
     def stop_blank_frame_sequence(self):
@@ -393,5 +574,7 @@ class Model2450(SerialDevice):
         Returns:
             None
         """
-        self.ser.write(b"stop\r\n")  # Use self.ser instead of ser
+        self.ser.write(commands.get("stop").wire)  # Use self.ser instead of ser
         print("Sent: stop")
+
+commands.bind_methods(Model2450)
@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: mpcapture.py
+#
+# Description:
+#     Process-per-device capture for MCCI Model 2450
+#     BACK (Brightness And Color Kit).
+#
+#     Each worker process owns one Model2450 and its
+#     read/decode loop, and writes parsed samples into
+#     a multiprocessing.shared_memory ring buffer. The
+#     parent reads every ring directly from shared
+#     memory, so no samples are pickled and aggregate
+#     throughput scales with the number of cores.
+#
+#     Ring layout:
+#         header  uint64 total records written,
+#                 uint64 capacity
+#         slots   capacity x RECORD
+#
+#     RECORD (little endian, 40 bytes):
+#         int64   host arrival time (ns, monotonic)
+#         float64 light, red, green, blue
+#                 (NaN when the sample has fewer fields)
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 17:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 11:00:00  Vinay N
+#         Workers report port open failures
+#     v2.2.0  Thu Oct 22 2026 12:00:00  Vinay N
+#         Readers keep one slot clear of the writer
+#
+##############################################################################
+# Built-in imports
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+# Own modules
+from model2450lib.packetutils import parse_stream_sample
+
+# Worker status values
+STATUS_STARTING = 0
+STATUS_OPEN = 1
+STATUS_FAILED = -1
+
+RECORD = struct.Struct("<q4d")
+HEADER = struct.Struct("<QQ")
+NAN = float("nan")
+
+class SampleRing:
+    """
+    Single-writer sample ring in shared memory.
+
+    The writer fills a slot and then publishes it
+    by bumping the write counter; readers keep
+    their own read position and detect overruns
+    when they fall behind. At most capacity - 1
+    records are readable at once: the remaining
+    slot is the one the writer may be filling.
+
+    Attributes:
+        shm: SharedMemory block.
+        capacity: Number of record slots.
+        read_count: Records consumed by this
+            reader.
+        dropped: Records overwritten before this
+            reader got to them.
+    """
+    def __init__(self, shm, capacity):
+        """
+        Initialize SampleRing instance.
+
+        Use SampleRing.create() or SampleRing.attach().
+
+        Args:
+            shm: SharedMemory block.
+            capacity: Number of record slots.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.shm = shm
+        self.capacity = capacity
+        self.read_count = 0
+        self.dropped = 0
+        self._buf = shm.buf
+        self._write_count = 0
+
+    @classmethod
+    def create(cls, capacity=65536):
+        """
+        Allocate a new ring.
+
+        Args:
+            capacity: Number of record slots.
+
+        Returns:
+            SampleRing:
+                Ring owning a new shared memory
+                block.
+
+        Raises:
+            OSError:
+                If shared memory cannot be
+                allocated.
+        """
+        shm = shared_memory.SharedMemory(
+            create=True, size=HEADER.size + capacity * RECORD.size)
+        HEADER.pack_into(shm.buf, 0, 0, capacity)
+        return cls(shm, capacity)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Attach to an existing ring by name.
+
+        Args:
+            name: Shared memory block name.
+
+        Returns:
+            SampleRing:
+                Ring view of the block.
+
+        Raises:
+            FileNotFoundError:
+                If the block does not exist.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        _, capacity = HEADER.unpack_from(shm.buf, 0)
+        return cls(shm, capacity)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write_count(self):
+        """
+        Get total number of records written.
+
+        Returns:
+            int:
+                Records published by the writer.
+        """
+        return HEADER.unpack_from(self._buf, 0)[0]
+
+    def write(self, timestamp_ns, values):
+        """
+        Append one sample (writer side).
+
+        Args:
+            timestamp_ns: Host arrival time (ns).
+            values: Parsed sample values; the
+                first four are stored.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        fields = (tuple(values[:4]) + (NAN, NAN, NAN, NAN))[:4]
+        count = self._write_count
+        RECORD.pack_into(self._buf,
+                         HEADER.size + (count % self.capacity) * RECORD.size,
+                         timestamp_ns, *fields)
+        self._write_count = count + 1
+        HEADER.pack_into(self._buf, 0, self._write_count, self.capacity)
+
+    def read_views(self):
+        """
+        Get unread records as shared memory views.
+
+        Returns up to two memoryviews (the unread
+        span may wrap around the end of the ring)
+        that point straight into shared memory.
+        The views are only valid until the writer
+        laps them; call commit() once consumed.
+
+        Args:
+            None
+
+        Returns:
+            tuple:
+                (list of memoryviews, end count)
+                to pass to commit().
+
+        Raises:
+            None
+        """
+        end = self.write_count()
+        start = self.read_count
+        limit = self.capacity - 1
+        if end - start > limit:
+            self.dropped += end - start - limit
+            start = end - limit
+            self.read_count = start
+        views = []
+        while start < end:
+            slot = start % self.capacity
+            n = min(end - start, self.capacity - slot)
+            offset = HEADER.size + slot * RECORD.size
+            views.append(self._buf[offset:offset + n * RECORD.size])
+            start += n
+        return views, end
+
+    def commit(self, end):
+        """
+        Mark records up to end as consumed.
+
+        Args:
+            end: Count returned by read_views().
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.read_count = end
+
+    def read(self):
+        """
+        Read and consume all unread records.
+
+        Args:
+            None
+
+        Returns:
+            list:
+                (timestamp_ns, light, red, green,
+                blue) tuples.
+
+        Raises:
+            None
+        """
+        views, end = self.read_views()
+        rows = []
+        for view in views:
+            rows.extend(RECORD.iter_unpack(view))
+            view.release()
+        # Drop anything the writer lapped while we were unpacking,
+        # including the slot it may be filling now
+        lapped = min(self.write_count() - (self.capacity - 1) - self.read_count,
+                     len(rows))
+        if lapped > 0:
+            self.dropped += lapped
+            rows = rows[lapped:]
+        self.commit(end)
+        return rows
+
+    def close(self, unlink=False):
+        """
+        Release the ring.
+
+        Args:
+            unlink: Also destroy the shared
+                memory block (owner only).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def capture_worker(port, ring_name, stop_event, ready_event, status=None):
+    """
+    Worker process entry: stream one device into a ring.
+
+    Args:
+        port: Serial COM port name.
+        ring_name: Shared memory block name.
+        stop_event: multiprocessing.Event that
+            ends the capture.
+        ready_event: multiprocessing.Event set
+            once the port open was attempted.
+        status: multiprocessing.Value set to
+            STATUS_OPEN or STATUS_FAILED before
+            ready_event is set.
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+    from model2450lib.model2450 import Model2450
+
+    ring = SampleRing.attach(ring_name)
+    dev = Model2450(port)
+    dev.connect()
+    opened = dev.ser is not None
+    if status is not None:
+        status.value = STATUS_OPEN if opened else STATUS_FAILED
+    ready_event.set()
+    if not opened:
+        ring.close()
+        return
+
+    def on_sample(text, timestamp_ns):
+        values = parse_stream_sample(text)
+        if values:
+            ring.write(timestamp_ns, values)
+
+    def watch_stop():
+        stop_event.wait()
+        dev.stop_stream()
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+    try:
+        dev.get_stream3(callback=on_sample, verbose=False, timestamps=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dev.disconnect()
+        ring.close()
+
+class MultiProcessCapture:
+    """
+    Capture many devices with one process per device.
+
+    Attributes:
+        ports: Serial COM port names.
+        capacity: Ring slots per device.
+        rings: Mapping of port to SampleRing.
+        processes: Mapping of port to worker
+            process.
+        failed: Ports whose worker could not
+            open the device.
+    """
+    def __init__(self, ports, capacity=65536):
+        """
+        Initialize MultiProcessCapture instance.
+
+        Args:
+            ports: Serial COM port names.
+            capacity: Ring slots per device.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.ports = list(ports)
+        self.capacity = capacity
+        self.rings = {}
+        self.processes = {}
+        self.failed = []
+        self._stop = None
+        self._status = {}
+
+    def start(self, timeout=10):
+        """
+        Start one worker process per device.
+
+        Args:
+            timeout: Maximum wait for all ports
+                to open (seconds).
+
+        Returns:
+            list:
+                Ports that failed to open or did
+                not report within timeout; also
+                kept in failed.
+
+        Raises:
+            None
+        """
+        ctx = multiprocessing.get_context()
+        self._stop = ctx.Event()
+        ready = {}
+        for port in self.ports:
+            ring = SampleRing.create(self.capacity)
+            event = ctx.Event()
+            status = ctx.Value("i", STATUS_STARTING, lock=False)
+            proc = ctx.Process(target=capture_worker,
+                               args=(port, ring.name, self._stop, event,
+                                     status),
+                               name=f"model2450-capture-{port}", daemon=True)
+            proc.start()
+            self.rings[port] = ring
+            self.processes[port] = proc
+            self._status[port] = status
+            ready[port] = event
+        deadline = time.monotonic() + timeout
+        self.failed = []
+        for port, event in ready.items():
+            event.wait(max(0, deadline - time.monotonic()))
+            state = self._status[port].value
+            if state == STATUS_OPEN:
+                continue
+            if state == STATUS_FAILED:
+                print(f"Capture worker failed to open {port}")
+            else:
+                print(f"Capture worker for {port} did not start "
+                      f"within {timeout} s")
+            self.failed.append(port)
+        return list(self.failed)
+
+    def read(self):
+        """
+        Read new samples from every device.
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                Mapping of port to list of
+                (timestamp_ns, light, red, green,
+                blue) tuples.
+
+        Raises:
+            None
+        """
+        return {port: ring.read() for port, ring in self.rings.items()}
+
+    def stats(self):
+        """
+        Get per-device ring counters.
+
+        Returns:
+            dict:
+                Mapping of port to written, read
+                and dropped record counts.
+        """
+        return {port: {"written": ring.write_count(),
+                       "read": ring.read_count,
+                       "dropped": ring.dropped}
+                for port, ring in self.rings.items()}
+
+    def stop(self, timeout=5):
+        """
+        Stop all workers and free the rings.
+
+        Args:
+            timeout: Maximum wait per worker
+                (seconds).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self._stop is not None:
+            self._stop.set()
+        for proc in self.processes.values():
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        for ring in self.rings.values():
+            ring.close(unlink=True)
+        self.processes = {}
+        self.rings = {}
+        self._status = {}
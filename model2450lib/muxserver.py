@@ -0,0 +1,635 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: muxserver.py
+#
+# Description:
+#     Local multiplexing server for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     One server process owns the serial ports. Each
+#     device stream is decoded once and fanned out to
+#     every subscribed client; command requests from
+#     clients are serialized per device. MuxClient
+#     mirrors the Model2450 API over the socket.
+#
+#     Protocol (Unix domain socket, one JSON object
+#     per line):
+#         -> {"id": 1, "op": "list"}
+#         -> {"id": 2, "op": "call", "device": "COM3",
+#             "method": "get_color", "args": []}
+#         -> {"id": 3, "op": "subscribe", "device": "COM3"}
+#         -> {"id": 4, "op": "unsubscribe", "device": "COM3"}
+#         <- {"id": 2, "result": "..."} | {"id": 2, "error": "..."}
+#         <- {"event": "sample", "device": "COM3",
+#             "t": 123456789, "data": "..."}
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 22:00:00  Vinay N
+#         Module created
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Callable methods taken from the command registry
+#     v2.2.0  Wed Oct 21 2026 16:00:00  Vinay N
+#         Client request timeout, keep a live server's socket
+#     v2.2.0  Thu Oct 22 2026 13:00:00  Vinay N
+#         Client disconnect shuts the connection down
+#
+##############################################################################
+# Built-in imports
+import argparse
+import errno
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+
+# Own modules
+from model2450lib import commands
+
+# Methods clients may call on a device
+CALLABLE_METHODS = tuple(commands.BY_METHOD) + ("stats",)
+CLIENT_QUEUE_SIZE = 4096
+# Default wait for a reply; a reply the server could not queue
+# (client not reading) is never sent
+REQUEST_TIMEOUT = 30.0
+
+def socket_in_use(path):
+    """
+    Check whether a server is listening on a socket.
+
+    Args:
+        path: Socket path.
+
+    Returns:
+        bool:
+            True if a connection succeeds, False
+            if the path is missing or stale.
+
+    Raises:
+        None
+    """
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+def default_socket_path():
+    """
+    Get default server socket path.
+
+    Args:
+        None
+
+    Returns:
+        str:
+            Per-user socket path in the temp
+            directory.
+
+    Raises:
+        None
+    """
+    return os.path.join(tempfile.gettempdir(), f"model2450-{os.getuid()}.sock")
+
+class DeviceChannel:
+    """
+    Server-side state of one shared device.
+
+    Attributes:
+        name: Device name used by clients.
+        dev: Connected Model2450 instance.
+        lock: Serializes command requests.
+        subscribers: Client sessions receiving
+            the stream.
+    """
+    def __init__(self, name, dev):
+        """
+        Initialize DeviceChannel instance.
+
+        Args:
+            name: Device name used by clients.
+            dev: Connected Model2450 instance.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.name = name
+        self.dev = dev
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self._sub_lock = threading.Lock()
+        self._thread = None
+
+    def call(self, method, args):
+        """
+        Run a device method on behalf of a client.
+
+        Args:
+            method: Method name.
+            args: Positional arguments.
+
+        Returns:
+            object:
+                Method result.
+
+        Raises:
+            ValueError:
+                If the method is not allowed.
+            RuntimeError:
+                If the device is streaming.
+        """
+        if method not in CALLABLE_METHODS:
+            raise ValueError(f"Method not allowed: {method}")
+        if method != "stats" and self.streaming():
+            raise RuntimeError(f"{self.name} is streaming")
+        with self.lock:
+            return getattr(self.dev, method)(*args)
+
+    def streaming(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, session):
+        """
+        Add a stream subscriber, starting the stream if needed.
+
+        Args:
+            session: Client session.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._sub_lock:
+            self.subscribers.add(session)
+            if not self.streaming():
+                self._thread = threading.Thread(
+                    target=self._stream, name=f"model2450-mux-{self.name}",
+                    daemon=True)
+                self._thread.start()
+
+    def unsubscribe(self, session):
+        """
+        Remove a stream subscriber, stopping the stream when idle.
+
+        Args:
+            session: Client session.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._sub_lock:
+            self.subscribers.discard(session)
+            if not self.subscribers:
+                self.dev.stop_stream()
+
+    def _stream(self):
+        name = self.name
+
+        def on_sample(text, timestamp_ns):
+            # Encode once, fan out to every subscriber
+            line = ('{"event":"sample","device":%s,"t":%d,"data":%s}\n'
+                    % (json.dumps(name), timestamp_ns, json.dumps(text))).encode()
+            sessions = list(self.subscribers)
+            if not sessions:
+                self.dev.stop_stream()
+            for session in sessions:
+                session.push(line)
+
+        while True:
+            with self.lock:
+                self.dev.get_stream3(callback=on_sample, verbose=False,
+                                     timestamps=True)
+            with self._sub_lock:
+                # A client may have subscribed while the stream was stopping
+                if not self.subscribers or self.dev.ser is None:
+                    self._thread = None
+                    return
+
+class ClientSession(socketserver.StreamRequestHandler):
+    """
+    Connection handler for one client.
+
+    Requests are read line by line; all output
+    to the client goes through a bounded queue
+    drained by a writer thread, so a slow client
+    never stalls a device stream. Samples that
+    do not fit are dropped and counted.
+    """
+    def setup(self):
+        super().setup()
+        self.outq = queue.Queue(CLIENT_QUEUE_SIZE)
+        self.dropped = 0
+        self.subscriptions = set()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def push(self, line, block=False):
+        """
+        Queue a line for the client.
+
+        Args:
+            line: Encoded JSON line.
+            block: Wait for queue space (used for
+                replies, never for samples).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        try:
+            self.outq.put(line, block=block, timeout=5 if block else None)
+        except queue.Full:
+            self.dropped += 1
+            if block:
+                # The client times the request out
+                print("Reply dropped: client is not reading its output")
+
+    def _write_loop(self):
+        while True:
+            line = self.outq.get()
+            if line is None:
+                return
+            try:
+                self.wfile.write(line)
+                if self.outq.empty():
+                    self.wfile.flush()
+            except OSError:
+                return
+
+    def handle(self):
+        channels = self.server.channels
+        for raw in self.rfile:
+            request = None
+            try:
+                request = json.loads(raw)
+                reply = {"id": request.get("id")}
+                op = request.get("op")
+                if op == "list":
+                    reply["result"] = sorted(channels)
+                else:
+                    channel = channels.get(request.get("device"))
+                    if channel is None:
+                        raise KeyError(f"Unknown device: {request.get('device')}")
+                    if op == "call":
+                        reply["result"] = channel.call(request["method"],
+                                                       request.get("args", []))
+                    elif op == "subscribe":
+                        self.subscriptions.add(channel)
+                        channel.subscribe(self)
+                        reply["result"] = True
+                    elif op == "unsubscribe":
+                        self.subscriptions.discard(channel)
+                        channel.unsubscribe(self)
+                        reply["result"] = True
+                    else:
+                        raise ValueError(f"Unknown op: {op}")
+            except Exception as e:
+                reply = {"id": request.get("id") if isinstance(request, dict) else None,
+                         "error": f"{type(e).__name__}: {e}"}
+            self.push((json.dumps(reply) + "\n").encode(), block=True)
+
+    def finish(self):
+        for channel in self.subscriptions:
+            channel.unsubscribe(self)
+        self.outq.put(None)
+        self.writer.join(1)
+        super().finish()
+
+class MuxServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix domain socket server sharing Model2450 devices.
+
+    Attributes:
+        channels: Mapping of device name to
+            DeviceChannel.
+    """
+    daemon_threads = True
+
+    def __init__(self, devices, path=None):
+        """
+        Initialize MuxServer instance.
+
+        Args:
+            devices: Mapping of device name to
+                connected Model2450 instance.
+            path: Socket path, default
+                default_socket_path().
+
+        Returns:
+            None
+
+        Raises:
+            OSError:
+                If another server is listening on
+                the path or the socket cannot be
+                bound.
+        """
+        self.path = path or default_socket_path()
+        if os.path.exists(self.path):
+            if socket_in_use(self.path):
+                raise OSError(errno.EADDRINUSE,
+                              f"Server already running on {self.path}")
+            # Left behind by a server that exited without cleanup
+            os.unlink(self.path)
+        self.channels = {name: DeviceChannel(name, dev)
+                         for name, dev in devices.items()}
+        super().__init__(self.path, ClientSession)
+
+    def server_close(self):
+        for channel in self.channels.values():
+            channel.dev.stop_stream()
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+class MuxClient:
+    """
+    Client for a device shared through MuxServer.
+
+    Mirrors the Model2450 command methods
+    (read_sn, get_color, set_level, ...) and
+    get_stream3()/stop_stream().
+
+    Attributes:
+        port: Device name on the server.
+        path: Server socket path.
+        request_timeout: Default reply wait
+            (seconds).
+    """
+    def __init__(self, port, path=None, request_timeout=REQUEST_TIMEOUT):
+        """
+        Initialize MuxClient instance.
+
+        Args:
+            port: Device name on the server
+                (its serial port name).
+            path: Server socket path.
+            request_timeout: Default reply wait
+                (seconds).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.port = port
+        self.path = path or default_socket_path()
+        self.request_timeout = request_timeout
+        self.sock = None
+        self._ids = itertools.count(1)
+        self._replies = {}
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._callback = None
+        self._timestamps = False
+        self._stream_done = threading.Event()
+        self._reader = None
+        self._closed = False
+
+    def connect(self):
+        """
+        Connect to the server.
+
+        Returns:
+            None
+
+        Raises:
+            OSError:
+                If the server is not running.
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+        self._closed = False
+        self._wfile = self.sock.makefile("wb")
+        self._reader = threading.Thread(target=self._read_loop,
+                                        args=(self.sock,), daemon=True)
+        self._reader.start()
+
+    def disconnect(self):
+        """
+        Close the connection.
+
+        Shuts the socket down before closing it:
+        the reader's file object keeps the socket
+        open, and the server only drops this
+        client's subscriptions once it sees the
+        connection end. A get_stream3() call
+        blocked in another thread returns.
+
+        Returns:
+            None
+        """
+        sock, self.sock = self.sock, None
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self._wfile.close()
+        except OSError:
+            pass
+        sock.close()
+        self._callback = None
+        self._stream_done.set()
+        if self._reader is not None and self._reader is not threading.current_thread():
+            self._reader.join(1)
+
+    def request(self, op, timeout=None, **fields):
+        """
+        Send a request and wait for its reply.
+
+        Args:
+            op: Operation name.
+            timeout: Maximum wait (seconds),
+                default request_timeout.
+            fields: Additional request fields.
+
+        Returns:
+            object:
+                Reply result.
+
+        Raises:
+            RuntimeError:
+                If the server reports an error.
+            TimeoutError:
+                If no reply arrives in time.
+            ConnectionError:
+                If the client is not connected or
+                the connection closed before the
+                reply arrived.
+        """
+        if timeout is None:
+            timeout = self.request_timeout
+        req_id = self._send(op, **fields)
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: req_id in self._replies or self._closed, timeout):
+                raise TimeoutError(f"No reply to {op} within {timeout} s")
+            if req_id not in self._replies:
+                raise ConnectionError(f"Connection closed before reply to {op}")
+            reply = self._replies.pop(req_id)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply.get("result")
+
+    def _send(self, op, **fields):
+        if self.sock is None:
+            raise ConnectionError(f"Not connected to {self.path}")
+        req_id = next(self._ids)
+        fields.update(id=req_id, op=op)
+        with self._send_lock:
+            self._wfile.write((json.dumps(fields) + "\n").encode())
+            self._wfile.flush()
+        return req_id
+
+    def call(self, method, *args):
+        return self.request("call", device=self.port, method=method,
+                            args=list(args))
+
+    def __getattr__(self, name):
+        if name in CALLABLE_METHODS:
+            return lambda *args: self.call(name, *args)
+        raise AttributeError(name)
+
+    def get_stream3(self, callback=None, verbose=True, timestamps=False):
+        """
+        Receive the shared device stream.
+
+        Blocks until stop_stream() or
+        disconnect() is called, like
+        Model2450.get_stream3().
+
+        Args:
+            callback: Optional sample handler.
+            verbose: Print each received sample.
+            timestamps: Pass the server-side
+                arrival time to the callback.
+
+        Returns:
+            None
+        """
+        def on_sample(text, timestamp_ns):
+            if verbose:
+                print(f"[get_stream3] Received: {text}")
+            if callback:
+                if timestamps:
+                    callback(text, timestamp_ns)
+                else:
+                    callback(text)
+
+        self._callback = on_sample
+        self._stream_done.clear()
+        self.request("subscribe", device=self.port)
+        self._stream_done.wait()
+
+    def stop_stream(self):
+        """
+        Stop receiving the stream.
+
+        Returns:
+            None
+        """
+        self._callback = None
+        if self.sock is None:
+            self._stream_done.set()
+            return
+        try:
+            if threading.current_thread() is self._reader:
+                # Called from a sample callback: the reply cannot be read here
+                self._send("unsubscribe", device=self.port)
+            else:
+                self.request("unsubscribe", device=self.port, timeout=5)
+        finally:
+            self._stream_done.set()
+
+    def _read_loop(self, sock):
+        rfile = sock.makefile("rb")
+        try:
+            for raw in rfile:
+                msg = json.loads(raw)
+                if msg.get("event") == "sample":
+                    callback = self._callback
+                    if callback and msg.get("device") == self.port:
+                        callback(msg["data"], msg["t"])
+                    continue
+                with self._cond:
+                    self._replies[msg.get("id")] = msg
+                    self._cond.notify_all()
+        except (OSError, ValueError):
+            pass
+        finally:
+            rfile.close()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._stream_done.set()
+
+def main(argv=None):
+    """
+    Run the server until interrupted.
+
+    Args:
+        argv: Optional argument list.
+
+    Returns:
+        int:
+            Process exit status.
+    """
+    from model2450lib.model2450 import Model2450
+
+    parser = argparse.ArgumentParser(
+        prog="model2450 serve",
+        description="Share Model 2450 devices over a Unix domain socket")
+    parser.add_argument("ports", nargs="+")
+    parser.add_argument("--socket", default=None, help="socket path")
+    args = parser.parse_args(argv)
+
+    devices = {}
+    for port in args.ports:
+        dev = Model2450(port)
+        dev.connect()
+        if dev.ser is None:
+            print(f"Cannot open {port}", file=sys.stderr)
+            return 1
+        devices[port] = dev
+
+    server = MuxServer(devices, args.socket)
+    print(f"Serving {', '.join(devices)} on {server.path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for dev in devices.values():
+            dev.disconnect()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,10 +18,34 @@
 # Revision history:
 #     v2.1.0  Wed Feb 16 2026 12:05:00  Vinay N
 #         Module created
+#     v2.2.0  Mon Oct 19 2026 17:00:00  Vinay N
+#         Stream sample parsing helper
+#     v2.2.0  Mon Oct 19 2026 18:00:00  Vinay N
+#         Bulk frame reader with arrival timestamps
+#     v2.2.0  Mon Oct 19 2026 19:00:00  Vinay N
+#         Byte and frame counters for metrics
+#     v2.2.0  Mon Oct 19 2026 20:00:00  Vinay N
+#         Resynchronize framing after corrupt bytes
+#     v2.2.0  Tue Oct 20 2026 11:00:00  Vinay N
+#         Shared multi-frame message reassembler
+#     v2.2.0  Tue Oct 20 2026 13:00:00  Vinay N
+#         Backlog tracking and adaptive read sizing
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         FrameReader.reset() for drained input
+#     v2.2.0  Wed Oct 21 2026 12:00:00  Vinay N
+#         Don't interpolate timestamps across idle periods
+#     v2.2.0  Wed Oct 21 2026 14:00:00  Vinay N
+#         Keep a good frame before corruption, settle lone frames
+#     v2.2.0  Wed Oct 21 2026 19:00:00  Vinay N
+#         Overloaded reads never ask for unbuffered bytes
 #
 ##############################################################################
+import collections
+import re
 import time
 
+_NUMBER_RE = re.compile(rb"[-+]?\d+(?:\.\d+)?")
+
 def decode_packet(packet_bytes):
     """
     Decode protocol packet structure.
@@ -156,3 +180,526 @@ def read_block_frames(ser):
         return None
 
     return header + payload
+
+class FrameReader:
+    """
+    Bulk frame reader with arrival timestamps.
+
+    Reads everything the serial driver has
+    buffered in one call, splits it into frames
+    and stamps each frame with its host arrival
+    time from time.monotonic_ns(). When one bulk
+    read returns bytes that accumulated since the
+    previous read, frame timestamps are
+    interpolated across that interval by byte
+    offset; when the read had to wait for data,
+    the frames are stamped with the wake-up time.
+    The interval never starts earlier than the
+    bytes could have taken to arrive at the line
+    rate, so data that arrives after the reader
+    sat idle (e.g. a command reply) is not
+    spread back across the idle period.
+
+    Framing resynchronizes after lost or garbage
+    bytes: a header is only accepted if its
+    length is at least 2, the reserved bit is
+    clear and the command code is known (when a
+    command set is given). While in sync, a
+    frame is emitted even when corrupt bytes
+    follow it, and the reader resynchronizes
+    after it. While resynchronizing (and after
+    creation or reset(), when the first byte may
+    be mid-frame), a candidate is only accepted
+    if the bytes after it start another
+    plausible header or continue the message's
+    sequence numbers; otherwise the reader
+    slides forward one byte and counts it as
+    discarded. A candidate with nothing after it
+    is accepted once the line stays quiet for
+    settle_time, so a lone reply is not held
+    for a full serial timeout.
+
+    The reader watches the driver backlog
+    (in_waiting) before every read. When it
+    crosses high_water or keeps growing, the
+    host is falling behind: the reader warns,
+    marks itself overloaded and raises read_size
+    (up to max_read), the largest batch one call
+    pulls and splits. A read never asks for more
+    than the driver has buffered, so it never
+    waits for data. Once the backlog drains
+    read_size shrinks back toward min_read and
+    the reader returns to waking on the first
+    header for lowest latency.
+
+    Attributes:
+        ser: Active serial connection object.
+        commands: Optional set of valid command
+            codes.
+        pending: Parsed (frame, timestamp_ns)
+            tuples not yet consumed.
+        metrics: Optional DeviceMetrics updated
+            with byte and frame counts.
+        discarded: Bytes skipped while
+            resynchronizing.
+        resyncs: Number of resynchronizations.
+        backlog: Bytes buffered by the driver at
+            the last read.
+        backlog_peak: Largest backlog seen.
+        overloaded: True while falling behind.
+        overloads: Number of overload episodes.
+        read_size: Largest batch per read while
+            overloaded.
+        settle_time: Quiet time that confirms a
+            trailing candidate frame (seconds).
+    """
+    settle_time = 0.005
+    min_read = 64
+    max_read = 65536
+    high_water = 2048
+    growth_limit = 4
+
+    def __init__(self, ser, commands=None):
+        """
+        Initialize FrameReader instance.
+
+        Args:
+            ser: Active serial connection object.
+            commands: Optional iterable of valid
+                command codes (0-31).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.ser = ser
+        self.commands = frozenset(commands) if commands is not None else None
+        self.pending = collections.deque()
+        self.metrics = None
+        self.discarded = 0
+        self.resyncs = 0
+        self._expect_seq = None
+        # The first byte seen may be mid-frame
+        self._resyncing = True
+        self._unconfirmed = False
+        self._buf = bytearray()
+        self._last_ns = time.monotonic_ns()
+        self._done_ns = None
+        self._growing = 0
+        self.backlog = 0
+        self.backlog_peak = 0
+        self.overloaded = False
+        self.overloads = 0
+        self.read_size = self.min_read
+
+    def reset(self):
+        """
+        Forget buffered bytes and queued frames.
+
+        Call after the driver's input was flushed
+        so stale partial frames are not joined to
+        new data.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.pending.clear()
+        del self._buf[:]
+        self._expect_seq = None
+        self._resyncing = True
+        self._unconfirmed = False
+        self._last_ns = time.monotonic_ns()
+
+    def read_frame(self):
+        """
+        Get the next frame.
+
+        Args:
+            None
+
+        Returns:
+            tuple | None:
+                (frame bytes, timestamp_ns), or
+                None if no complete frame arrived
+                within the serial timeout.
+
+        Raises:
+            IOError:
+                If serial read fails.
+        """
+        if not self.pending:
+            self.fill()
+        if self.pending:
+            return self.pending.popleft()
+        return None
+
+    def fill(self):
+        """
+        Perform one bulk read and queue complete frames.
+
+        Args:
+            None
+
+        Returns:
+            int:
+                Number of frames queued.
+
+        Raises:
+            IOError:
+                If serial read fails.
+        """
+        ser = self.ser
+        began = time.monotonic_ns()
+        waiting = ser.in_waiting
+        self._track_backlog(waiting)
+        if waiting:
+            size = waiting
+            if self.overloaded:
+                # Behind: take what is buffered, one bounded batch at a time
+                size = min(waiting, self.read_size)
+            data = ser.read(size)
+            now = time.monotonic_ns()
+            # If the reader sat idle, the bytes arrived at line rate
+            # just before now, not spread across the idle period
+            start_ns = max(self._last_ns, now - len(data) * self._byte_ns())
+        else:
+            # Nothing buffered: block for a header, then take the rest
+            data = ser.read(2)
+            now = time.monotonic_ns()
+            start_ns = now
+            if data:
+                waiting = ser.in_waiting
+                if waiting:
+                    data += ser.read(waiting)
+        self._last_ns = now
+        done = self._done_ns
+        self._done_ns = None
+        if not data:
+            if not (self._resyncing and self._buf):
+                return 0
+            # Quiet line while resynchronizing: accept what is buffered
+            queued = self._split(b"", now, now, flush=True)
+        else:
+            queued = self._split(data, start_ns, now)
+            if self._unconfirmed and self._settled():
+                # Nothing follows the candidate: it was the last frame
+                queued += self._split(b"", now, now, flush=True)
+        self._done_ns = time.monotonic_ns()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.bytes_read += len(data)
+            metrics.frames_read += queued
+            metrics.reader_batch(self, len(data),
+                                 began - done if done is not None else None)
+        return queued
+
+    def _settled(self):
+        ser = self.ser
+        deadline = time.monotonic() + self.settle_time
+        while not ser.in_waiting:
+            if time.monotonic() >= deadline:
+                return True
+            time.sleep(self.settle_time / 5)
+        return False
+
+    def _byte_ns(self):
+        # Transfer time of one byte (start + 8 data + stop bits)
+        baudrate = getattr(self.ser, "baudrate", None) or 115200
+        return 10 * 1000000000 // baudrate
+
+    def _track_backlog(self, waiting):
+        if waiting > self.backlog and waiting > self.min_read:
+            self._growing += 1
+        else:
+            self._growing = 0
+        self.backlog = waiting
+        if waiting > self.backlog_peak:
+            self.backlog_peak = waiting
+        if self.overloaded:
+            if waiting < self.min_read:
+                self.overloaded = False
+        elif waiting >= self.high_water or self._growing >= self.growth_limit:
+            self.overloaded = True
+            self.overloads += 1
+            if self.metrics is not None:
+                self.metrics.overloads += 1
+            print(f"Reader falling behind on {getattr(self.ser, 'port', None)}: "
+                  f"{waiting} bytes buffered")
+        if self.overloaded:
+            self.read_size = min(self.max_read, max(self.read_size * 2, waiting))
+        elif self.read_size > self.min_read:
+            self.read_size = max(self.min_read, self.read_size // 2)
+
+    def _header_ok(self, b0, b1):
+        if (b1 & 0x1F) < 2 or b0 & 0x20:
+            return False
+        return self.commands is None or (b0 & 0x1F) in self.commands
+
+    def _split(self, data, start_ns, end_ns, flush=False):
+        buf = self._buf
+        base = len(buf)
+        buf += data
+        span = end_ns - start_ns
+        size = len(data)
+        pos = 0
+        queued = 0
+        skipped = 0
+        self._unconfirmed = False
+        while len(buf) - pos >= 2:
+            b0 = buf[pos]
+            b1 = buf[pos + 1]
+            if not self._header_ok(b0, b1):
+                pos += 1
+                skipped += 1
+                continue
+            length = b1 & 0x1F
+            if len(buf) - pos < length:
+                break
+            end = pos + length
+            # Look-ahead: a true boundary is usually followed by another
+            # plausible header; sequence continuity breaks ties.
+            in_sequence = (b0 & 0x80 == 0 and self._expect_seq is not None
+                           and (b1 >> 5) == self._expect_seq)
+            if not in_sequence and (self._resyncing or skipped):
+                if len(buf) - end >= 2:
+                    if not self._header_ok(buf[end], buf[end + 1]):
+                        pos += 1
+                        skipped += 1
+                        continue
+                elif not flush:
+                    # Not yet confirmed by the next header: wait for it
+                    self._unconfirmed = True
+                    break
+            # In sync, the frame is kept even if garbage follows it;
+            # the next pass resynchronizes on that garbage.
+            if skipped:
+                self._discard(skipped)
+                skipped = 0
+            self._resyncing = False
+            if b0 & 0x40:
+                self._expect_seq = None
+            else:
+                self._expect_seq = ((b1 >> 5) + 1) & 0x07
+            ts = start_ns + span * max(end - base, 0) // size if size else end_ns
+            self.pending.append((bytes(buf[pos:end]), ts))
+            pos = end
+            queued += 1
+        if skipped:
+            self._discard(skipped)
+        del buf[:pos]
+        return queued
+
+    def _discard(self, count):
+        self.discarded += count
+        self.resyncs += 1
+        self._expect_seq = None
+        self._resyncing = True
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.discarded_bytes += count
+            metrics.resyncs += 1
+
+class Reassembler:
+    """
+    Multi-frame payload reassembler.
+
+    Collects frame payloads in a preallocated
+    bytearray that is reused across messages.
+    Completed messages and lines are returned
+    as memoryviews into that buffer, so finding
+    a boundary copies nothing; the views stay
+    valid until the next feed() or reset().
+
+    Modes:
+        message  A message starts at a frame
+                 with the start bit and ends at
+                 a frame with the end bit (or a
+                 short frame).
+        line     Payloads form a byte stream
+                 split on CRLF; each line is
+                 returned without its CRLF.
+
+    Attributes:
+        mode: "message" or "line".
+        frames: Frames in the current (or just
+            completed) message.
+        first_ns: Arrival time of its first frame.
+        last_ns: Arrival time of its last frame.
+    """
+    def __init__(self, mode="message", capacity=4096):
+        """
+        Initialize Reassembler instance.
+
+        Args:
+            mode: "message" or "line".
+            capacity: Initial buffer size (bytes).
+
+        Returns:
+            None
+
+        Raises:
+            ValueError:
+                If the mode is unknown.
+        """
+        if mode not in ("message", "line"):
+            raise ValueError(f"Unknown reassembly mode: {mode}")
+        self.mode = mode
+        self.frames = 0
+        self.first_ns = None
+        self.last_ns = None
+        self._buf = bytearray(capacity)
+        self._size = 0
+        self._scan = 0
+        self._consumed = 0
+        self._done = False
+
+    def reset(self):
+        """
+        Drop any partial message.
+
+        Returns:
+            None
+        """
+        self._size = 0
+        self._scan = 0
+        self._consumed = 0
+        self._done = False
+        self.frames = 0
+
+    def _append(self, payload, timestamp_ns):
+        size = self._size
+        end = size + len(payload)
+        buf = self._buf
+        if end > len(buf):
+            # Grow into a new buffer so views handed out earlier stay valid
+            grown = bytearray(max(end, 2 * len(buf)))
+            grown[:size] = buf[:size]
+            self._buf = buf = grown
+        buf[size:end] = payload
+        self._size = end
+        if self.frames == 0:
+            self.first_ns = timestamp_ns
+        self.frames += 1
+        self.last_ns = timestamp_ns
+
+    def feed(self, decoded, timestamp_ns=None):
+        """
+        Add a decoded frame (message mode).
+
+        Args:
+            decoded: decode_packet() result.
+            timestamp_ns: Frame arrival time.
+
+        Returns:
+            memoryview | None:
+                Complete message payload, or None
+                while the message is incomplete.
+
+        Raises:
+            None
+        """
+        if self._done or decoded["start_bit"]:
+            self._size = 0
+            self.frames = 0
+            self._done = False
+        payload = decoded["payload"]
+        self._append(payload, timestamp_ns)
+        if decoded["end_bit"] or len(payload) < decoded["length"] - 2:
+            self._done = True
+            return memoryview(self._buf)[:self._size]
+        return None
+
+    def feed_lines(self, payload, timestamp_ns=None):
+        """
+        Add a frame payload (line mode).
+
+        Args:
+            payload: Frame payload bytes.
+            timestamp_ns: Frame arrival time.
+
+        Returns:
+            list:
+                memoryviews of the lines completed
+                by this payload (without CRLF).
+
+        Raises:
+            None
+        """
+        buf = self._buf
+        if self._consumed:
+            # Move the unfinished tail to the front, once per feed
+            tail = self._size - self._consumed
+            buf[:tail] = buf[self._consumed:self._size]
+            self._size = tail
+            self._scan -= self._consumed
+            self._consumed = 0
+            self.frames = 0
+        self._append(payload, timestamp_ns)
+        buf = self._buf
+        view = memoryview(buf)
+        lines = []
+        start = 0
+        pos = buf.find(b"\r\n", max(self._scan, 0), self._size)
+        while pos >= 0:
+            lines.append(view[start:pos])
+            start = pos + 2
+            pos = buf.find(b"\r\n", start, self._size)
+        # A CR at the very end may pair with the next payload's LF
+        self._scan = max(start, self._size - 1)
+        self._consumed = start
+        return lines
+
+    def flush(self):
+        """
+        Take the unfinished line (line mode).
+
+        Args:
+            None
+
+        Returns:
+            memoryview | None:
+                Bytes received since the last
+                CRLF, or None if there are none.
+
+        Raises:
+            None
+        """
+        start = self._consumed
+        if self._size <= start:
+            return None
+        self._consumed = self._size
+        self._scan = self._size
+        return memoryview(self._buf)[start:self._size]
+
+def parse_stream_sample(payload):
+    """
+    Parse numeric fields of a stream sample.
+
+    Extracts the numbers of an ASCII stream
+    payload in order of appearance. For
+    "stream 3" samples these are the ambient
+    light value followed by the color sensor
+    channels.
+
+    Args:
+        payload: ASCII payload as bytes or str.
+
+    Returns:
+        tuple:
+            Parsed values as floats (empty if
+            the payload holds no numbers).
+
+    Raises:
+        None
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("ascii", errors="ignore")
+    return tuple(float(num) for num in _NUMBER_RE.findall(payload))
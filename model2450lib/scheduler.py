@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: scheduler.py
+#
+# Description:
+#     Jitter-compensated periodic sampling for MCCI Model 2450
+#     BACK (Brightness And Color Kit) devices.
+#
+#     Samples one or more query commands at a fixed
+#     target rate against absolute monotonic deadlines,
+#     on one or many devices. Commands are sent early by
+#     half the measured round trip so the device samples
+#     close to the deadline, multi-command ticks are
+#     pipelined in one write, and the achieved rate and
+#     timing jitter are reported.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 20 2026
+#
+# Revision history:
+#     v2.2.0  Tue Oct 20 2026 09:00:00  Vinay N
+#         Module created
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Pipelined commands taken from the command registry
+#
+##############################################################################
+# Built-in imports
+import math
+import threading
+import time
+
+# Own modules
+from model2450lib import commands
+
+# Query methods that can be pipelined, with their wire commands
+PIPELINE_COMMANDS = {command.method: command.wire for command in commands.queries()}
+
+# Final stretch before a deadline that is busy-waited instead of slept
+SPIN_NS = 500000
+
+class PeriodicSampler:
+    """
+    Fixed-rate sampler for one or more devices.
+
+    Attributes:
+        devices: Connected Model2450 instances.
+        commands: Query method names run each
+            tick, e.g. ("get_read", "get_color").
+        rate: Target ticks per second.
+        pipeline: Send all commands of a tick in
+            one write when possible.
+        samples: Collected sample dicts.
+    """
+    def __init__(self, devices, commands=("get_read",), rate=10.0, pipeline=True):
+        """
+        Initialize PeriodicSampler instance.
+
+        Args:
+            devices: Model2450 instance or list.
+            commands: Query method names.
+            rate: Target ticks per second.
+            pipeline: Pipeline multi-command ticks.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError:
+                If the rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not isinstance(devices, (list, tuple)):
+            devices = [devices]
+        self.devices = list(devices)
+        self.commands = tuple(commands)
+        self.rate = rate
+        self.pipeline = pipeline and all(c in PIPELINE_COMMANDS for c in self.commands)
+        self.samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._missed = {}
+
+    def run(self, duration=None, count=None, callback=None):
+        """
+        Sample until the duration or count is reached.
+
+        All devices share the same start time and
+        deadline grid.
+
+        Args:
+            duration: Run time (seconds).
+            count: Ticks per device.
+            callback: Optional handler called with
+                each sample dict from the device's
+                sampling thread.
+
+        Returns:
+            dict:
+                {"samples": list, "stats": dict}
+                as returned by report().
+
+        Raises:
+            ValueError:
+                If neither duration nor count is
+                given.
+        """
+        if duration is None and count is None:
+            raise ValueError("duration or count is required")
+        period_ns = int(1e9 / self.rate)
+        ticks = count if count is not None else int(duration * self.rate)
+        self._stop.clear()
+        start_ns = time.monotonic_ns() + period_ns
+
+        threads = [threading.Thread(target=self._sample_device,
+                                    args=(dev, start_ns, period_ns, ticks, callback),
+                                    name=f"model2450-sampler-{dev.port}",
+                                    daemon=True)
+                   for dev in self.devices]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {"samples": self.samples, "stats": self.report()}
+
+    def stop(self):
+        """
+        Stop sampling early.
+
+        Returns:
+            None
+        """
+        self._stop.set()
+
+    def _sample_device(self, dev, start_ns, period_ns, ticks, callback):
+        cmds = [PIPELINE_COMMANDS.get(name) for name in self.commands]
+        methods = [getattr(dev, name) for name in self.commands]
+        half_rtt = 0
+        missed = 0
+        tick = 0
+        while tick < ticks and not self._stop.is_set():
+            deadline = start_ns + tick * period_ns
+            send_at = deadline - half_rtt
+            now = _sleep_until(send_at)
+            if now - send_at > period_ns:
+                # Too late for this slot: skip ahead rather than bunch up
+                skip = (now - send_at) // period_ns
+                missed += skip
+                tick += skip
+                continue
+
+            t0 = time.monotonic_ns()
+            if self.pipeline and len(cmds) > 1:
+                values = dev.send_cmd_batch(cmds)
+            else:
+                values = [method() for method in methods]
+            t1 = time.monotonic_ns()
+
+            # Exponential average of the one-way delay for the next send
+            half_rtt = (half_rtt * 7 + (t1 - t0) // 2) // 8 if half_rtt else (t1 - t0) // 2
+            sample = {
+                "port": dev.port,
+                "tick": tick,
+                "deadline_ns": deadline,
+                "t_ns": (t0 + t1) // 2,
+                "rtt_ns": t1 - t0,
+                "values": dict(zip(self.commands, values)),
+            }
+            with self._lock:
+                self.samples.append(sample)
+            if callback:
+                callback(sample)
+            tick += 1
+        with self._lock:
+            self._missed[dev.port] = missed
+
+    def report(self):
+        """
+        Summarize achieved rate and timing jitter.
+
+        Jitter is the difference between each
+        sample's estimated device-side time (mid
+        round trip) and its deadline.
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                Per-port dict with count, missed,
+                target_hz, achieved_hz,
+                jitter_mean_us, jitter_std_us,
+                jitter_p99_us and jitter_max_us.
+
+        Raises:
+            None
+        """
+        stats = {}
+        by_port = {}
+        for sample in self.samples:
+            by_port.setdefault(sample["port"], []).append(sample)
+        for port, rows in by_port.items():
+            errors = [(row["t_ns"] - row["deadline_ns"]) / 1000.0 for row in rows]
+            abs_sorted = sorted(abs(err) for err in errors)
+            mean = sum(errors) / len(errors)
+            std = math.sqrt(sum((err - mean) ** 2 for err in errors) / len(errors))
+            span = rows[-1]["t_ns"] - rows[0]["t_ns"]
+            stats[port] = {
+                "count": len(rows),
+                "missed": self._missed.get(port, 0),
+                "target_hz": self.rate,
+                "achieved_hz": (len(rows) - 1) * 1e9 / span if span else 0.0,
+                "jitter_mean_us": mean,
+                "jitter_std_us": std,
+                "jitter_p99_us": abs_sorted[min(len(abs_sorted) - 1,
+                                                int(len(abs_sorted) * 0.99))],
+                "jitter_max_us": abs_sorted[-1],
+            }
+        return stats
+
+def _sleep_until(target_ns):
+    """
+    Wait until an absolute monotonic time.
+
+    Sleeps for the bulk of the wait and
+    busy-waits the last SPIN_NS to avoid
+    scheduler wake-up jitter.
+
+    Args:
+        target_ns: time.monotonic_ns() target.
+
+    Returns:
+        int:
+            time.monotonic_ns() on return.
+    """
+    now = time.monotonic_ns()
+    remaining = target_ns - now
+    if remaining > SPIN_NS:
+        time.sleep((remaining - SPIN_NS) / 1e9)
+    now = time.monotonic_ns()
+    while now < target_ns:
+        now = time.monotonic_ns()
+    return now
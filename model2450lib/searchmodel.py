@@ -17,21 +17,41 @@
 # Revision history:
 #     v2.1.0  Wed Feb 16 2026 12:05:00  Vinay N
 #         Module created
+#     v2.2.0  Mon Oct 19 2026 10:00:00  Vinay N
+#         Parallel device discovery with global deadline
+#     v2.2.0  Mon Oct 19 2026 11:00:00  Vinay N
+#         Persistent discovery cache keyed by USB identity
+#     v2.2.0  Mon Oct 19 2026 12:00:00  Vinay N
+#         Descriptor-based identification without serial I/O
+#     v2.2.0  Mon Oct 19 2026 14:00:00  Vinay N
+#         Defer pyserial imports, drop unused pyusb imports
+#     v2.2.0  Mon Oct 19 2026 21:00:00  Vinay N
+#         Port lookup by name and USB serial number
+#     v2.2.0  Tue Oct 20 2026 14:00:00  Vinay N
+#         Explicit port list for search_models
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Probe commands taken from the command registry
+#     v2.2.0  Wed Oct 21 2026 09:00:00  Vinay N
+#         Close abandoned probe ports at the discovery deadline
+#     v2.2.0  Wed Oct 21 2026 09:30:00  Vinay N
+#         Descriptor match on VID/PID, manufacturer and product
 #
 ##############################################################################
 # Built-in imports
-import sys
 import time
 
-# Lib imports
-import serial
-import serial.tools.list_ports
-import usb.util
-from usb.backend import libusb1
+# Lib imports (pyserial and concurrent.futures are
+# imported on first use to keep package import fast)
 
 # Own modules
 from .packetutils import read_packet_from_serial
 from .packetutils import decode_packet
+from . import discoverycache
+from . import commands
+
+# USB identity of the Model 2450
+USB_VID = 0x045E
+USB_PID = 0x0646
 
 def version():
     """
@@ -49,12 +69,21 @@ def version():
     """
     return "Model2450 2.1.0"
 
-def get_models():
+def get_models(use_cache=True, timeout=5):
     """
     Retrieve list of detected Model 2450 devices.
 
+    When use_cache is set, ports whose USB
+    identity was already verified are reported
+    from the on-disk discovery cache without
+    opening them; only new or changed ports
+    are probed.
+
     Args:
-        None
+        use_cache:
+            Use the persistent discovery cache.
+        timeout:
+            Global discovery deadline (seconds).
 
     Returns:
         dict:
@@ -64,8 +93,9 @@ def get_models():
     Raises:
         None
     """
-    devList = search_models()
-    return devList
+    if not use_cache:
+        return search_models(timeout=timeout)
+    return search_cached(timeout=timeout)
 
 def get_avail_ports():
     """
@@ -85,7 +115,9 @@ def get_avail_ports():
     Raises:
         None
     """
-    comlist = serial.tools.list_ports.comports()
+    from serial.tools import list_ports
+
+    comlist = list_ports.comports()
     port_name = []
     for port, desc, hwid in sorted(comlist):
         port_name.append((hwid, port, desc))
@@ -108,15 +140,83 @@ def filter_port():
     Raises:
         None
     """
+    return [info.device for info in filter_port_info()]
+
+def filter_port_info():
+    """
+    Filter supported USB ports with descriptor data.
+
+    Same filtering as filter_port(), but keeps
+    the pyserial ListPortInfo objects so USB
+    identity (serial number, location) is
+    available to callers.
+
+    Args:
+        None
+
+    Returns:
+        list:
+            Filtered ListPortInfo objects,
+            sorted by port name.
+
+    Raises:
+        None
+    """
+    from serial.tools import list_ports
+
     usb_hwid_str = ["USB VID:PID=045E:0646"]
-    comlist = serial.tools.list_ports.comports()
-    port_name = []
+    comlist = list_ports.comports()
+    port_info = []
 
-    for port, desc, hwid in sorted(comlist):
-        res = [True for gnhwid in usb_hwid_str if(gnhwid in hwid)]
+    for info in sorted(comlist, key=lambda item: item.device):
+        res = [True for gnhwid in usb_hwid_str if(gnhwid in info.hwid)]
         if(res):
-            port_name.append(port)
-    return port_name
+            port_info.append(info)
+    return port_info
+
+def find_port_info(port):
+    """
+    Look up descriptor data of a port.
+
+    Args:
+        port: Serial COM port name.
+
+    Returns:
+        ListPortInfo | None:
+            Port information, or None if the
+            port is not currently enumerated.
+
+    Raises:
+        None
+    """
+    from serial.tools import list_ports
+
+    for info in list_ports.comports():
+        if info.device == port:
+            return info
+    return None
+
+def find_port_by_usb_serial(usb_serial):
+    """
+    Find the port of a device by USB serial number.
+
+    Args:
+        usb_serial: USB serial number string.
+
+    Returns:
+        str | None:
+            Serial COM port name, or None if no
+            enumerated port matches.
+
+    Raises:
+        None
+    """
+    from serial.tools import list_ports
+
+    for info in list_ports.comports():
+        if usb_serial and info.serial_number == usb_serial:
+            return info.device
+    return None
 
 def check_status(myport):
     """
@@ -134,18 +234,58 @@ def check_status(myport):
             otherwise None.
 
     Raises:
-        serial.SerialException:
-            If serial communication fails.
+        None
+    """
+    info = probe_port(myport)
+    if info is None:
+        return None
+    return info["model"]
+
+def probe_port(myport, cancel=None, handles=None):
+    """
+    Probe a port and report verified identity.
+
+    Sends protocol commands to confirm whether
+    connected device is Model 2450 BACK kit.
+    The port is always closed before returning.
+
+    Args:
+        myport: Serial COM port name.
+        cancel: Optional threading.Event; the
+            probe gives up as soon as it is set.
+        handles: Optional dict the open serial
+            handle is registered in (keyed by
+            port) while the probe runs, so a
+            caller can close it to abort.
+
+    Returns:
+        dict | None:
+            {"model": "2450", "version": str}
+            if detected, otherwise None. The
+            version is None when the device
+            was identified by status only.
+
+    Raises:
+        None
     """
+    import serial
+
+    ser = None
     try:
         ser = serial.Serial(myport, baudrate=115200, 
                             bytesize=serial.EIGHTBITS,
                             parity=serial.PARITY_NONE, timeout=1, 
                             stopbits=serial.STOPBITS_ONE)
-        time.sleep(1)
+        if handles is not None:
+            handles[myport] = ser
+        if cancel is not None:
+            if cancel.wait(1):
+                return None
+        else:
+            time.sleep(1)
 
         # Send version command and try to decode the response
-        ser.write(b'version\r\n')
+        ser.write(commands.get("version").wire)
         time.sleep(0.1)
         raw_packet = read_packet_from_serial(ser)
 
@@ -154,13 +294,15 @@ def check_status(myport):
                 decoded = decode_packet(raw_packet)
                 payload_str = bytes(decoded["payload"]).decode('ascii', errors='ignore')
                 if '3:1' in payload_str or '8:1' in payload_str or '9:1' in payload_str:
-                    ser.close()
-                    return '2450'
+                    return {"model": '2450', "version": payload_str.strip()}
             except Exception as e:
                 print(f"Packet decoding failed: {e}")
 
+        if cancel is not None and cancel.is_set():
+            return None
+
         # If version didn't return valid result, try status
-        ser.write(b'status\r\n')
+        ser.write(commands.get("status").wire)
         time.sleep(0.1)
         raw_packet = read_packet_from_serial(ser)
 
@@ -169,32 +311,174 @@ def check_status(myport):
                 decoded = decode_packet(raw_packet)
                 payload_str = bytes(decoded["payload"]).decode('ascii', errors='ignore')
                 if 'Brightness And Color Kit' in payload_str:
-                    ser.close()
-                    return '2450'
+                    return {"model": '2450', "version": None}
             except Exception as e:
                 print(f"Packet decoding failed: {e}")
 
-        ser.close()
         return None
 
     except serial.SerialException as e:
-        print(f"Serial communication error: {e}")
+        if cancel is None or not cancel.is_set():
+            print(f"Serial communication error: {e}")
         return None
 
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        if cancel is None or not cancel.is_set():
+            print(f"Unexpected error: {e}")
+        return None
+
+    finally:
+        if handles is not None:
+            handles.pop(myport, None)
+        if ser is not None:
+            try:
+                ser.close()
+            except Exception:
+                pass
+
+def identify_descriptor(info):
+    """
+    Identify a device from its USB descriptors.
+
+    A port is confirmed only when its VID/PID is
+    the Model 2450's, the manufacturer string
+    names MCCI and the product (or interface)
+    string names the Model 2450. No serial I/O
+    is performed.
+
+    Args:
+        info: pyserial ListPortInfo object.
+
+    Returns:
+        str | None:
+            '2450' if the descriptors confirm a
+            Model 2450, None if they are
+            ambiguous and a protocol probe is
+            needed.
+
+    Raises:
+        None
+    """
+    if (info.vid, info.pid) != (USB_VID, USB_PID):
         return None
+    if not info.manufacturer or 'MCCI' not in info.manufacturer.upper():
+        return None
+    for text in (info.product, info.interface):
+        if text and ('Model 2450' in text or 'Brightness And Color Kit' in text):
+            return '2450'
+    return None
+
+def iter_models(ports=None, timeout=5, max_workers=None, use_descriptors=True):
+    """
+    Identify candidate ports concurrently.
+
+    Ports whose USB descriptors already confirm
+    a Model 2450 are yielded immediately. The
+    remaining ports are probed with check_status
+    in parallel and each detected device is
+    yielded as soon as its probe completes.
+    Probes still running when the global
+    deadline expires are cancelled and their
+    ports closed before the generator returns.
+
+    Args:
+        ports:
+            Optional list of COM port names or
+            ListPortInfo objects. Defaults to
+            filter_port_info() result.
+        timeout:
+            Global discovery deadline (seconds).
+        max_workers:
+            Maximum concurrent probes. Defaults
+            to one worker per port.
+        use_descriptors:
+            Try descriptor identification before
+            falling back to the protocol probe.
+
+    Returns:
+        generator:
+            Yields dict entries of the form
+            {"port": "COM3", "model": "2450",
+             "version": "3:1"}.
 
+    Raises:
+        None
+    """
+    if ports is None:
+        ports = filter_port_info()
+
+    ambiguous = []
+    for port in ports:
+        if isinstance(port, str):
+            ambiguous.append(port)
+            continue
+        model = identify_descriptor(port) if use_descriptors else None
+        if model is not None:
+            yield {"port": port.device, "model": model, "version": None}
+        else:
+            ambiguous.append(port.device)
+
+    ports = ambiguous
+    if not ports:
+        return
+
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures import as_completed
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+
+    cancel = threading.Event()
+    handles = {}
+    pool = ThreadPoolExecutor(max_workers=max_workers or len(ports),
+                              thread_name_prefix="model2450-probe")
+    futures = {pool.submit(probe_port, port, cancel, handles): port
+               for port in ports}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            try:
+                info = future.result()
+            except Exception as e:
+                print(f"Probe failed on {futures[future]}: {e}")
+                continue
+            if info is not None:
+                yield {"port": futures[future], "model": info["model"],
+                       "version": info["version"]}
+    except FutureTimeoutError:
+        pending = [futures[f] for f in futures if not f.done()]
+        print(f"Discovery deadline expired, skipped: {pending}")
+    finally:
+        # Abort running probes so no port stays open after discovery
+        cancel.set()
+        for ser in list(handles.values()):
+            try:
+                ser.close()
+            except Exception:
+                pass
+        pool.shutdown(wait=True, cancel_futures=True)
 
-def search_models():
+def search_models(callback=None, timeout=5, use_descriptors=True, ports=None):
     """
     Scan system for available Model 2450 devices.
 
     Filters supported ports and validates each
-    device using protocol status checks.
+    device using its USB descriptors, falling
+    back to protocol status checks. All probed
+    ports are handled concurrently, so total
+    discovery time is close to a single probe.
 
     Args:
-        None
+        callback:
+            Optional handler called with each
+            device entry as soon as it is found.
+        timeout:
+            Global discovery deadline (seconds).
+        use_descriptors:
+            Identify devices from USB descriptors
+            when they are conclusive.
+        ports:
+            Optional list of COM port names or
+            ListPortInfo objects to check instead
+            of the filtered system ports.
 
     Returns:
         dict:
@@ -210,25 +494,72 @@ def search_models():
     Raises:
         None
     """
-    
-    port_name = filter_port()
-    rev_list = []
-    dev_list = []
+    devlist = []
 
-    for i in range(len(port_name)):
-        model = check_status(port_name[i])
-        if model is not None:
-            rev_list.append(port_name[i])
-            dev_list.append(model)
+    for entry in iter_models(ports, timeout=timeout,
+                             use_descriptors=use_descriptors):
+        devlist.append(entry)
+        if callback:
+            callback(entry)
+
+    # Keep port ordering stable regardless of probe completion order
+    devlist.sort(key=lambda entry: entry["port"])
 
     rdict = {}
+    rdict["models"] = devlist
+    return rdict
+
+
+def search_cached(timeout=5, path=None):
+    """
+    Scan for Model 2450 devices using the discovery cache.
+
+    Ports whose USB identity (VID/PID, USB serial
+    number, location) and port name match a cached
+    entry are reported without being opened. The
+    remaining ports are probed concurrently and
+    verified devices are added to the cache.
+
+    Args:
+        timeout:
+            Global deadline for probing uncached
+            ports (seconds).
+        path:
+            Optional cache file path. Defaults to
+            discoverycache.cache_path().
+
+    Returns:
+        dict:
+            Same layout as search_models().
+
+    Raises:
+        None
+    """
+    cache = discoverycache.load_cache(path)
     devlist = []
-    
-    for i in range(len(rev_list)):
-        tempdict = {}
-        tempdict["port"] = rev_list[i]
-        tempdict["model"] = dev_list[i]
-        devlist.append(tempdict)
+    unknown = {}
+    unknown_info = []
+
+    for info in filter_port_info():
+        key = discoverycache.usb_identity(info)
+        entry = discoverycache.lookup(cache, key, info.device)
+        if entry is not None:
+            devlist.append({"port": info.device, "model": entry["model"],
+                            "version": entry.get("version")})
+        else:
+            unknown[info.device] = key
+            unknown_info.append(info)
+
+    if unknown:
+        for entry in iter_models(unknown_info, timeout=timeout):
+            devlist.append(entry)
+            key = unknown[entry["port"]]
+            if key is not None:
+                discoverycache.store(cache, key, entry)
+        discoverycache.save_cache(cache, path)
+
+    devlist.sort(key=lambda entry: entry["port"])
 
+    rdict = {}
     rdict["models"] = devlist
-    return rdict
\ No newline at end of file
+    return rdict
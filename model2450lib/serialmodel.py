@@ -17,17 +17,56 @@
 # Revision history:
 #     v2.1.0  Wed Feb 16 2026 12:05:00  Vinay N
 #         Module created
+#     v2.2.0  Mon Oct 19 2026 13:00:00  Vinay N
+#         Stream resume through DeviceMonitor reconnect
+#     v2.2.0  Mon Oct 19 2026 14:00:00  Vinay N
+#         Import pyserial on first connect
+#     v2.2.0  Mon Oct 19 2026 18:00:00  Vinay N
+#         Arrival timestamps on frames and messages
+#     v2.2.0  Mon Oct 19 2026 19:00:00  Vinay N
+#         Optional metrics and stats() snapshot
+#     v2.2.0  Tue Oct 20 2026 09:00:00  Vinay N
+#         Pipelined command batches
+#     v2.2.0  Tue Oct 20 2026 11:00:00  Vinay N
+#         Shared Reassembler for all read paths
+#     v2.2.0  Tue Oct 20 2026 17:00:00  Vinay N
+#         Registry-driven execute() with reply deadlines
+#     v2.2.0  Wed Oct 21 2026 10:00:00  Vinay N
+#         Port I/O lock, owner-side port drop and input drain
+#     v2.2.0  Wed Oct 21 2026 12:00:00  Vinay N
+#         Replies returned with their arrival timestamp
+#     v2.2.0  Wed Oct 21 2026 13:00:00  Vinay N
+#         Command latency keyed per registered command
+#     v2.2.0  Wed Oct 21 2026 14:00:00  Vinay N
+#         Frame command codes passed to the frame reader
+#     v2.2.0  Thu Oct 22 2026 14:00:00  Vinay N
+#         Reply deadlines for pipelined command batches
 #
 ##############################################################################
 
 # Built-in imports
+import threading
 import time
-# Lib imports
-import serial
-import serial.tools.list_ports
+# Lib imports (pyserial is imported in connect() so that
+# importing the package does not pay for it)
 # Own modules
 from model2450lib.packetutils import decode_packet
-from model2450lib.packetutils import read_packet_from_serial
+from model2450lib.packetutils import FrameReader
+from model2450lib.packetutils import Reassembler
+from model2450lib.metrics import DeviceMetrics
+from model2450lib import commands
+
+# Reply deadline of batched commands missing from the registry
+BATCH_REPLY_TIMEOUT = 2.0
+
+def _metric_key(cmd):
+    # Registered commands are keyed like execute() keys them
+    command = commands.match(cmd)
+    if command is not None:
+        return command.key
+    if isinstance(cmd, bytes):
+        cmd = cmd.decode("ascii", errors="ignore")
+    return cmd.strip()
 
 class SerialDevice:
     """
@@ -43,6 +82,31 @@ class SerialDevice:
         baudrate: Communication speed.
         ser: Serial connection object.
         keep_running: Streaming control flag.
+        monitor: Attached DeviceMonitor, if any.
+        reconnect_timeout: Maximum wait for a
+            lost device to come back (seconds).
+        reconnect_time: Duration of the last
+            reconnect (seconds).
+        last_timestamp_ns: Host arrival time
+            (time.monotonic_ns) of the last
+            complete message. Shared by every
+            thread using the device; use
+            timestamps=True on read_and_process()
+            or execute() to get the timestamp of
+            a particular reply.
+        metrics: DeviceMetrics when enabled,
+            otherwise None.
+        io_lock: Held around every port read and
+            write, so another thread (the device
+            monitor) only closes the port while
+            it is idle.
+        port_lost: Set when the port must be
+            dropped by the thread using it.
+        frame_commands: Command codes the device
+            sends, used by the frame reader to
+            reject false headers while
+            resynchronizing; None accepts any
+            code.
     """
     def __init__(self, port):
         """
@@ -61,8 +125,20 @@ class SerialDevice:
         self.baudrate = 115200
         self.ser = None
         self.keep_running = False
-
-    def connect(self):
+        self.monitor = None
+        self.reconnect_timeout = 30
+        self.reconnect_time = None
+        self.stream_cmd = None
+        self.reader = None
+        self.last_timestamp_ns = None
+        self.metrics = None
+        self.message_asm = Reassembler("message")
+        self.line_asm = Reassembler("line")
+        self.io_lock = threading.RLock()
+        self.port_lost = False
+        self.frame_commands = None
+
+    def connect(self, quiet=False):
         """
         Establish serial connection.
 
@@ -71,6 +147,7 @@ class SerialDevice:
 
         Args:
             self: Instance reference.
+            quiet: Don't print open failures.
 
         Returns:
             None
@@ -79,10 +156,14 @@ class SerialDevice:
             serial.SerialException:
                 If connection fails.
         """
+        import serial
+
         try:
             self.ser = serial.Serial(self.port, baudrate=self.baudrate, timeout=1)
+            self.port_lost = False
         except Exception as e:
-            print(f"Failed to connect: {e}")
+            if not quiet:
+                print(f"Failed to connect: {e}")
             self.ser = None
 
     def disconnect(self):
@@ -103,13 +184,235 @@ class SerialDevice:
         """
         if self.ser and self.ser.is_open:
             self.ser.close()
+
+    def read_frame(self):
+        """
+        Read next frame with its arrival timestamp.
+
+        Frames are read in bulk through a
+        FrameReader bound to the current serial
+        handle.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            tuple | None:
+                (frame bytes, timestamp_ns), or
+                None on timeout or when the port
+                is not (or no longer) open.
+
+        Raises:
+            IOError:
+                If serial read fails.
+        """
+        with self.io_lock:
+            if self.port_lost:
+                self.drop_port()
+            if self.ser is None:
+                return None
+            if self.reader is None or self.reader.ser is not self.ser:
+                self.reader = FrameReader(self.ser, self.frame_commands)
+                self.reader.metrics = self.metrics
+            return self.reader.read_frame()
+
+    def enable_metrics(self):
+        """
+        Turn on instrumentation.
+
+        Starts counting bytes, frames, decode
+        errors, reassembled messages, stream
+        samples and per-command latency.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            DeviceMetrics:
+                The active metrics object.
+
+        Raises:
+            None
+        """
+        if self.metrics is None:
+            self.metrics = DeviceMetrics()
+        if self.reader is not None:
+            self.reader.metrics = self.metrics
+        return self.metrics
+
+    def disable_metrics(self):
+        """
+        Turn off instrumentation.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.metrics = None
+        if self.reader is not None:
+            self.reader.metrics = None
+
+    def stats(self, since=None):
+        """
+        Get a metrics snapshot.
+
+        Args:
+            self: Instance reference.
+            since: Earlier stats() result for the
+                recent_* rates.
+
+        Returns:
+            dict:
+                DeviceMetrics snapshot, or an
+                empty dict when metrics are
+                disabled.
+
+        Raises:
+            None
+        """
+        if self.metrics is None:
+            return {}
+        return self.metrics.snapshot(since)
+
+    def drop_port(self):
+        """
+        Discard a serial handle that stopped working.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self.io_lock:
+            self.port_lost = False
+            try:
+                self.disconnect()
+            except Exception:
+                pass
+            self.ser = None
+
+    def release_port(self):
+        """
+        Drop the port from a thread that does not own it.
+
+        The port is closed right away when no read
+        or write is in progress; otherwise the
+        thread using it drops it before its next
+        read.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            bool:
+                True if the port was closed now.
+
+        Raises:
+            None
+        """
+        if not self.io_lock.acquire(blocking=False):
+            self.port_lost = True
+            return False
+        try:
+            self.drop_port()
+        finally:
+            self.io_lock.release()
+        return True
+
+    def drain(self, quiet=0.05, limit=1.0):
+        """
+        Discard input until the line goes quiet.
+
+        Used after a stream is stopped so that the
+        next command reads its own reply instead of
+        leftover stream frames.
+
+        Args:
+            self: Instance reference.
+            quiet: Silence that ends the drain
+                (seconds).
+            limit: Maximum drain time (seconds).
+
+        Returns:
+            int:
+                Number of bytes discarded.
+
+        Raises:
+            None
+        """
+        discarded = 0
+        with self.io_lock:
+            ser = self.ser
+            if not (ser and ser.is_open):
+                return 0
+            try:
+                ser.reset_input_buffer()
+                start = last = time.monotonic()
+                while True:
+                    waiting = ser.in_waiting
+                    now = time.monotonic()
+                    if waiting:
+                        discarded += len(ser.read(waiting))
+                        last = now
+                    elif now - last >= quiet:
+                        break
+                    if now - start >= limit:
+                        print(f"Input on {self.port} did not go quiet "
+                              f"within {limit}s")
+                        break
+                    time.sleep(quiet / 5)
+            except OSError as e:
+                print(f"Drain failed: {e}")
+            if self.reader is not None:
+                self.reader.reset()
+        return discarded
+
+    def await_reconnect(self):
+        """
+        Wait for a lost device to be reconnected.
+
+        Only effective when a DeviceMonitor is
+        attached; it re-binds the device to its
+        new port. An interrupted stream is
+        restarted once the port is back.
+
+        Args:
+            self: Instance reference.
+
+        Returns:
+            bool:
+                True if the device is connected
+                again, otherwise False.
+
+        Raises:
+            None
+        """
+        if self.monitor is None:
+            return False
+        print(f"Lost {self.port}, waiting for reconnect")
+        if not self.monitor.wait_reconnect(self, self.reconnect_timeout):
+            return False
+        if self.stream_cmd:
+            self.send_command(self.stream_cmd)
+        return True
+
     def send_command(self, command):
         """
         Send raw command to device.
 
         Args:
             self: Instance reference.
-            command: Command string.
+            command: Command string, or bytes
+                already encoded.
 
         Returns:
             None
@@ -118,11 +421,14 @@ class SerialDevice:
             IOError:
                 If write operation fails.
         """
-        if self.ser and self.ser.is_open:
-            self.ser.write(command.encode())
-            time.sleep(0.001)
-
-    def read_and_process(self):
+        if isinstance(command, str):
+            command = command.encode()
+        with self.io_lock:
+            if self.ser and self.ser.is_open:
+                self.ser.write(command)
+        time.sleep(0.001)
+
+    def read_and_process(self, code=None, timeout=None, timestamps=False):
         """
         Read packets and process payload.
 
@@ -131,62 +437,98 @@ class SerialDevice:
 
         Args:
             self: Instance reference.
+            code: Optional reply command code;
+                frames with other codes are
+                skipped.
+            timeout: Optional deadline (seconds).
+                The port's read timeout is lowered
+                only while the deadline is closer
+                than it.
+            timestamps: Return (response,
+                timestamp_ns) with the host arrival
+                time of the reply's last frame.
 
         Returns:
-            str | hex:
-                ASCII payload string or
-                hex string if non-ASCII.
+            str | hex | None | tuple:
+                ASCII payload string, hex string
+                if non-ASCII, or None if the
+                deadline expired; a (response,
+                timestamp_ns) tuple with
+                timestamps, timestamp_ns None when
+                there is no reply.
 
         Raises:
             None
         """
+        response, timestamp_ns = self._read_message(code, timeout)
+        if timestamps:
+            return response, timestamp_ns
+        return response
+
+    def _read_message(self, code, timeout):
         if not self.ser:
-            return
+            return None, None
 
-        buffered_payload = b""
+        asm = self.message_asm
+        asm.reset()
+        deadline = None
+        saved_timeout = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
 
-        while True:
-            packet = read_packet_from_serial(self.ser)
-            if packet:
+        try:
+            while True:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        print(f"No reply within {timeout:g}s")
+                        return None, None
+                    port_timeout = self.ser.timeout
+                    if port_timeout is None or remaining < port_timeout:
+                        # Don't let a blocking read run past the deadline
+                        if saved_timeout is None:
+                            saved_timeout = port_timeout
+                        self.ser.timeout = remaining
+
+                if not self.ser:
+                    return None, None
                 try:
-                    # Decode the packet
-                    decoded = decode_packet(packet)
-                    payload = decoded.get("payload", b"")
-                    start_bit = decoded["start_bit"]
-                    end_bit = decoded["end_bit"]
-                    reserved_bit = decoded["reserved"]
-                    command = decoded["command"]
-                    sequence = decoded["sequence"]
-                    length = decoded["length"]
-
-                    if start_bit:
-                        buffered_payload = payload
-                    else:
-                        buffered_payload += payload
-
-                    if end_bit or len(payload) < decoded["length"] - 2:
-                        try:
-                            ascii_payload = buffered_payload.decode("ascii").strip()
-                            
-                            # Optional filtering logic
-                            if ascii_payload and ascii_payload[0].isalpha():
-                                pass
-                            elif ':' in ascii_payload:
-                                pass
-
-                            buffered_payload = b""  # Reset after processing
-
-                            return ascii_payload  # ✅ Return here
-
-                        except UnicodeDecodeError:
-                            print("Non-ASCII Payload:", buffered_payload.hex())
-                            buffered_payload = b""  # Also reset here in error case
-                            return buffered_payload.hex()
-
-                except Exception as decode_err:
-                    print("Decode error:", decode_err)
-            time.sleep(0.0006)
-  
+                    frame = self.read_frame()
+                except OSError as e:
+                    print(f"Serial read failed: {e}")
+                    self.drop_port()
+                    return None, None
+                if frame:
+                    packet, timestamp_ns = frame
+                    try:
+                        # Decode the packet
+                        decoded = decode_packet(packet)
+                        if code is not None and decoded["command"] != code:
+                            continue
+                        message = asm.feed(decoded, timestamp_ns)
+
+                        if message is not None:
+                            self.last_timestamp_ns = timestamp_ns
+                            metrics = self.metrics
+                            if metrics is not None:
+                                metrics.messages += 1
+                                if asm.frames > 1:
+                                    metrics.multi_frame_messages += 1
+                            try:
+                                text = str(message, "ascii").strip()
+                            except UnicodeDecodeError:
+                                print("Non-ASCII Payload:", message.hex())
+                                text = message.hex()
+                            return text, timestamp_ns
+
+                    except Exception as decode_err:
+                        if self.metrics is not None:
+                            self.metrics.decode_errors += 1
+                        print("Decode error:", decode_err)
+        finally:
+            if saved_timeout is not None and self.ser is not None:
+                self.ser.timeout = saved_timeout
+
     def read_serial_data(self):
         """
         Stream and print serial payload data.
@@ -208,30 +550,44 @@ class SerialDevice:
             print("Serial not connected.")
             return
 
-        buffer = b""
+        import serial
 
-        while True:
-            packet = read_packet_from_serial(self.ser)
+        asm = self.line_asm
+        asm.reset()
+        self.keep_running = True
+
+        while self.keep_running:
+            if not (self.ser and self.ser.is_open):
+                if not self.await_reconnect():
+                    break
+                asm.reset()
+                continue
+            try:
+                frame = self.read_frame()
+            except (OSError, serial.SerialException) as e:
+                print(f"Serial read failed: {e}")
+                self.drop_port()
+                continue
             try:
-                if packet:
+                if frame:
+                    packet, timestamp_ns = frame
                     decoded = decode_packet(packet)
-                    payload = decoded["payload"]
 
-                    buffer += payload
-
-                    # Check if a complete message (ending with \r\n) is received
-                    while b'\r\n' in buffer:
-                        line, buffer = buffer.split(b'\r\n', 1)
-                        # print(f"Actual payload: {line + b'\r\n'}")
-                        full_line = line + b'\r\n'
+                    # Each complete message ends with \r\n
+                    for line in asm.feed_lines(decoded["payload"], timestamp_ns):
+                        self.last_timestamp_ns = timestamp_ns
+                        if self.metrics is not None:
+                            self.metrics.messages += 1
+                            self.metrics.stream_samples += 1
+                        full_line = bytes(line) + b'\r\n'
                         print(f"Actual payload: {full_line}")
-                        
-                        # return full_line
 
             except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.decode_errors += 1
                 print(f"Error reading data: {e}")
 
-    def send_cmd(self, cmd):
+    def send_cmd(self, cmd, timeout=None):
         """
         Send command and get response.
 
@@ -241,6 +597,8 @@ class SerialDevice:
         Args:
             self: Instance reference.
             cmd: Command string.
+            timeout: Optional reply deadline
+                (seconds).
 
         Returns:
             str:
@@ -249,9 +607,148 @@ class SerialDevice:
         Raises:
             None
         """
+        metrics = self.metrics
+        if metrics is None:
+            self.send_command(cmd)
+            return self.read_and_process(timeout=timeout)
+        t0 = time.perf_counter_ns()
         self.send_command(cmd)
-        return self.read_and_process()
-    
+        response = self.read_and_process(timeout=timeout)
+        metrics.command_done(_metric_key(cmd), time.perf_counter_ns() - t0)
+        return response
+
+    def execute(self, command, arg=None, parse=False, timeout=None,
+                timestamps=False):
+        """
+        Run a registered command.
+
+        Sends the command's pre-encoded bytes and
+        collects the reply according to its
+        response mode: one framed message (only
+        frames with the expected command code,
+        within the deadline), text lines, or
+        nothing.
+
+        Args:
+            self: Instance reference.
+            command: commands.Command, or its
+                text (e.g. "color").
+            arg: Argument for commands taking one.
+            parse: Return the parsed value
+                instead of the response string.
+            timeout: Deadline (seconds); defaults
+                to the command's own.
+            timestamps: Return (result,
+                timestamp_ns) with the reply's host
+                arrival time (framed commands only;
+                None for other modes).
+
+        Returns:
+            str | object | None | tuple:
+                Response, parsed value, or None
+                for commands without a reply or
+                on timeout; a (result,
+                timestamp_ns) tuple with
+                timestamps.
+
+        Raises:
+            KeyError:
+                If a command text is not
+                registered.
+        """
+        if isinstance(command, str):
+            command = commands.get(command)
+        if timeout is None:
+            timeout = command.timeout
+        data = command.encode(arg)
+        mode = command.mode
+        result = None
+        timestamp_ns = None
+        if mode == commands.TEXT:
+            result = self.send_text_command(data.decode("ascii"), wait=timeout)
+        elif mode == commands.STREAM:
+            result = self.send_stream_cmd(data.decode("ascii"))
+        elif mode == commands.NONE:
+            self.send_command(data)
+        else:
+            metrics = self.metrics
+            if metrics is None:
+                self.send_command(data)
+                result, timestamp_ns = self._read_message(command.code, timeout)
+            else:
+                t0 = time.perf_counter_ns()
+                self.send_command(data)
+                result, timestamp_ns = self._read_message(command.code, timeout)
+                metrics.command_done(command.key,
+                                     time.perf_counter_ns() - t0)
+            if parse:
+                result = command.parse(result)
+        if timestamps:
+            return result, timestamp_ns
+        return result
+
+    def send_cmd_batch(self, cmds, timeout=None):
+        """
+        Send several commands at once and collect replies.
+
+        All commands go out in a single write;
+        the replies are then read in order. This
+        pipelines the round trips so a batch costs
+        about one round trip instead of one per
+        command. Only use commands that answer
+        with exactly one framed message.
+
+        Each reply must arrive within its
+        command's registry deadline, counted from
+        the write, so a lost reply delays the
+        batch by at most the longest deadline.
+
+        Args:
+            self: Instance reference.
+            cmds: Command strings or encoded
+                bytes.
+            timeout: Optional reply deadline
+                (seconds) for every command;
+                defaults to each command's own.
+
+        Returns:
+            list:
+                Decoded payload responses, in
+                command order; None for replies
+                that did not arrive in time.
+
+        Raises:
+            None
+        """
+        if not (self.ser and self.ser.is_open):
+            return [None] * len(cmds)
+        replies = []
+        for cmd in cmds:
+            command = commands.match(cmd)
+            if command is None:
+                replies.append((None, timeout or BATCH_REPLY_TIMEOUT))
+            else:
+                replies.append((command.code, timeout or command.timeout))
+        t0 = time.perf_counter_ns()
+        with self.io_lock:
+            self.ser.write(b"".join(cmd if isinstance(cmd, bytes) else cmd.encode()
+                                    for cmd in cmds))
+        sent = time.monotonic()
+        responses = []
+        for code, limit in replies:
+            remaining = sent + limit - time.monotonic()
+            if remaining <= 0:
+                # Its deadline passed while an earlier reply was awaited
+                responses.append(None)
+                continue
+            responses.append(self._read_message(code, remaining)[0])
+        metrics = self.metrics
+        if metrics is not None:
+            elapsed = time.perf_counter_ns() - t0
+            for cmd in cmds:
+                metrics.command_done(_metric_key(cmd), elapsed)
+        return responses
+
     def send_stream_cmd(self, cmd):
         """
         Send command and stream response.
@@ -267,6 +764,7 @@ class SerialDevice:
             None
         """
 
+        self.stream_cmd = cmd
         self.send_command(cmd)
         return self.read_serial_data()
     
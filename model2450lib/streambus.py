@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: streambus.py
+#
+# Description:
+#     In-process stream publish/subscribe for MCCI Model 2450
+#     BACK (Brightness And Color Kit).
+#
+#     The stream read loop publishes each sample once;
+#     every subscriber gets its own bounded queue with
+#     its own overflow policy and lag/drop counters, so
+#     a slow consumer never stalls serial reading
+#     (unless it explicitly asks for "block").
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 23:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 17:00:00  Vinay N
+#         Iteration ends when the bus is closed
+#
+##############################################################################
+# Built-in imports
+import collections
+import threading
+
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+CONFLATE = "conflate"
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, CONFLATE)
+
+class Subscription:
+    """
+    Bounded per-consumer sample queue.
+
+    Items are (timestamp_ns, sample) tuples as
+    published by the stream reader.
+
+    Policies when the queue is full:
+        block        publisher waits for space
+        drop-oldest  discard the oldest item
+        drop-newest  discard the new item
+        conflate     keep only the latest item
+                     (queue size is forced to 1)
+
+    Attributes:
+        maxsize: Queue capacity.
+        policy: Overflow policy.
+        published: Items offered to this queue.
+        delivered: Items handed to the consumer.
+        dropped: Items discarded by the policy.
+        max_lag: Highest queue depth seen.
+        closed: True once unsubscribed.
+    """
+    def __init__(self, maxsize=1024, policy=DROP_OLDEST):
+        """
+        Initialize Subscription instance.
+
+        Args:
+            maxsize: Queue capacity.
+            policy: One of POLICIES.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError:
+                If the policy or size is invalid.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.policy = policy
+        self.maxsize = 1 if policy == CONFLATE else maxsize
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_lag = 0
+        self.closed = False
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """
+        Offer an item (publisher side).
+
+        Args:
+            item: (timestamp_ns, sample) tuple.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            if self.closed:
+                return
+            self.published += 1
+            items = self._items
+            if len(items) >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == BLOCK:
+                    self._cond.wait_for(
+                        lambda: len(items) < self.maxsize or self.closed)
+                    if self.closed:
+                        return
+                else:
+                    items.popleft()
+                    self.dropped += 1
+            items.append(item)
+            if len(items) > self.max_lag:
+                self.max_lag = len(items)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Take the next item.
+
+        Args:
+            timeout: Maximum wait (seconds), or
+                None to wait indefinitely.
+
+        Returns:
+            tuple | None:
+                (timestamp_ns, sample), or None on
+                timeout or once closed and empty.
+
+        Raises:
+            None
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            if not self._items:
+                return None
+            self.delivered += 1
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def get_batch(self, max_items=256, timeout=None):
+        """
+        Take all queued items, up to max_items.
+
+        Waits for at least one item.
+
+        Args:
+            max_items: Batch size limit.
+            timeout: Maximum wait (seconds).
+
+        Returns:
+            list:
+                (timestamp_ns, sample) tuples;
+                empty on timeout or close.
+
+        Raises:
+            None
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self.closed, timeout):
+                return []
+            items = self._items
+            count = min(len(items), max_items)
+            batch = [items.popleft() for _ in range(count)]
+            self.delivered += count
+            self._cond.notify_all()
+            return batch
+
+    def __iter__(self):
+        # Ends once the subscription is closed and drained
+        while True:
+            item = self.get()
+            if item is None:
+                return
+            yield item
+
+    def lag(self):
+        """
+        Get the current queue depth.
+
+        Returns:
+            int:
+                Items waiting for the consumer.
+        """
+        return len(self._items)
+
+    def close(self):
+        """
+        Close the subscription and wake all waiters.
+
+        Returns:
+            None
+        """
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Get per-subscriber counters.
+
+        Returns:
+            dict:
+                policy, maxsize, lag, max_lag,
+                published, delivered and dropped.
+        """
+        return {
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "lag": len(self._items),
+            "max_lag": self.max_lag,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+class StreamBus:
+    """
+    Fan-out of stream samples to subscriptions.
+
+    Attributes:
+        subscriptions: Active Subscription list.
+    """
+    def __init__(self):
+        """
+        Initialize StreamBus instance.
+
+        Returns:
+            None
+        """
+        self.subscriptions = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, maxsize=1024, policy=DROP_OLDEST):
+        """
+        Create a new subscription.
+
+        Args:
+            maxsize: Queue capacity.
+            policy: One of POLICIES.
+
+        Returns:
+            Subscription:
+                The new subscription.
+
+        Raises:
+            ValueError:
+                If the policy or size is invalid.
+        """
+        sub = Subscription(maxsize, policy)
+        with self._lock:
+            self.subscriptions = self.subscriptions + (sub,)
+        return sub
+
+    def unsubscribe(self, sub):
+        """
+        Remove and close a subscription.
+
+        Args:
+            sub: Subscription to remove.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.subscriptions = tuple(s for s in self.subscriptions if s is not sub)
+        sub.close()
+
+    def publish(self, item):
+        """
+        Offer an item to every subscription.
+
+        Args:
+            item: (timestamp_ns, sample) tuple.
+
+        Returns:
+            None
+        """
+        # Copy-on-write tuple: iteration needs no lock
+        for sub in self.subscriptions:
+            sub.put(item)
+
+    def close(self):
+        """
+        Close every subscription.
+
+        Called when the stream ends, so blocked
+        consumers wake up and iteration finishes
+        after the queued items. Later subscribe()
+        calls create new, open subscriptions.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            subs, self.subscriptions = self.subscriptions, ()
+        for sub in subs:
+            sub.close()
+
+    def stats(self):
+        """
+        Get counters of every subscription.
+
+        Returns:
+            list:
+                Subscription.stats() dicts.
+        """
+        return [sub.stats() for sub in self.subscriptions]
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: synccapture.py
+#
+# Description:
+#     Synchronized multi-device capture for MCCI Model 2450
+#     BACK (Brightness And Color Kit).
+#
+#     Streams several devices at once and records every
+#     sample against one monotonic host clock. Each
+#     device's delivery latency is estimated from command
+#     round trips and subtracted, and the per-device
+#     streams are merged into one time-aligned dataset.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 19 2026
+#
+# Revision history:
+#     v2.2.0  Mon Oct 19 2026 16:00:00  Vinay N
+#         Module created
+#     v2.2.0  Wed Oct 21 2026 11:30:00  Vinay N
+#         Start every run with an empty sample set
+#     v2.2.0  Thu Oct 22 2026 11:30:00  Vinay N
+#         Unbounded error for devices without calibration replies
+#
+##############################################################################
+# Built-in imports
+import heapq
+import threading
+import time
+
+class SyncCapture:
+    """
+    Synchronized capture across several Model2450 devices.
+
+    Attributes:
+        devices: Connected Model2450 instances.
+        probe_count: Round trips per device used
+            to estimate delivery latency.
+        offsets: Per-port latency estimate, filled
+            by calibrate().
+        samples: Per-port list of
+            (host time ns, port, payload) tuples.
+    """
+    def __init__(self, devices, probe_count=10):
+        """
+        Initialize SyncCapture instance.
+
+        Args:
+            devices: Connected Model2450 instances.
+            probe_count: Round trips per device.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.devices = list(devices)
+        self.probe_count = probe_count
+        self.offsets = {}
+        self.samples = {}
+
+    def calibrate(self):
+        """
+        Estimate each device's delivery latency.
+
+        Times probe_count version round trips per
+        device (all devices in parallel). The
+        one-way delivery offset is taken as half
+        the fastest round trip; the alignment
+        error bound is half the spread between
+        the fastest and the median round trip.
+        A device that answers no probe has no
+        offset (None) and an unbounded (inf)
+        error.
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                Per-port dict with offset_ns,
+                rtt_min_ns, rtt_median_ns and
+                error_ns.
+
+        Raises:
+            None
+        """
+        def probe(dev):
+            rtts = []
+            for _ in range(self.probe_count):
+                t0 = time.monotonic_ns()
+                if dev.get_version() is not None:
+                    rtts.append(time.monotonic_ns() - t0)
+            if not rtts:
+                print(f"No calibration replies from {dev.port}")
+                self.offsets[dev.port] = {
+                    "offset_ns": None,
+                    "rtt_min_ns": None,
+                    "rtt_median_ns": None,
+                    "error_ns": float("inf"),
+                }
+                return
+            rtts.sort()
+            rtt_min = rtts[0]
+            rtt_median = rtts[len(rtts) // 2]
+            self.offsets[dev.port] = {
+                "offset_ns": rtt_min // 2,
+                "rtt_min_ns": rtt_min,
+                "rtt_median_ns": rtt_median,
+                "error_ns": (rtt_median - rtt_min) // 2,
+            }
+
+        _run_all(probe, self.devices)
+        return self.offsets
+
+    def run(self, duration):
+        """
+        Capture all device streams for a duration.
+
+        Calibrates first if calibrate() has not
+        been called. Each sample's frame arrival
+        time (host monotonic clock) is shifted by
+        its device's delivery offset (none for a
+        device that was not calibrated). Samples
+        of a previous run are discarded.
+
+        Args:
+            duration: Capture time (seconds).
+
+        Returns:
+            dict:
+                {
+                    "samples": merged sample list,
+                    "offsets": per-port estimates,
+                    "alignment_error_ns": worst
+                        per-device error bound,
+                        inf if a device gave no
+                        calibration replies
+                }
+
+        Raises:
+            None
+        """
+        if not self.offsets:
+            self.calibrate()
+        self.samples = {}
+
+        def capture(dev):
+            offset = self.offsets.get(dev.port, {}).get("offset_ns") or 0
+            port = dev.port
+            rows = self.samples.setdefault(port, [])
+
+            def on_sample(text, timestamp_ns):
+                rows.append((timestamp_ns - offset, port, text))
+
+            dev.get_stream3(callback=on_sample, verbose=False, timestamps=True)
+
+        timer = threading.Timer(duration, self.stop)
+        timer.daemon = True
+        timer.start()
+        try:
+            _run_all(capture, self.devices)
+        finally:
+            timer.cancel()
+        return self.result()
+
+    def stop(self):
+        """
+        Stop all device streams.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        for dev in self.devices:
+            dev.stop_stream()
+
+    def merged(self):
+        """
+        Merge per-device samples onto one timeline.
+
+        Args:
+            None
+
+        Returns:
+            list:
+                Dicts with t_ns, port and data,
+                ordered by host time.
+
+        Raises:
+            None
+        """
+        rows = heapq.merge(*self.samples.values())
+        return [{"t_ns": t, "port": port, "data": data} for t, port, data in rows]
+
+    def result(self):
+        """
+        Build the capture result.
+
+        Args:
+            None
+
+        Returns:
+            dict:
+                See run().
+
+        Raises:
+            None
+        """
+        errors = [entry["error_ns"] for entry in self.offsets.values()]
+        return {
+            "samples": self.merged(),
+            "offsets": dict(self.offsets),
+            "alignment_error_ns": max(errors) if errors else None,
+        }
+
+def _run_all(func, devices):
+    threads = [threading.Thread(target=func, args=(dev,),
+                                name=f"model2450-sync-{dev.port}", daemon=True)
+               for dev in devices]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
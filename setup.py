@@ -15,6 +15,10 @@
 # Revision history:
 #     v2.1.0  Wed Feb 16 2026 12:05:00  Vinay N
 #         Module created
+#     v2.2.0  Mon Oct 19 2026 15:00:00  Vinay N
+#         Add model2450 console command
+#     v2.2.0  Wed Oct 21 2026 21:00:00  Vinay N
+#         Add test extra
 #
 ##############################################################################
 
@@ -26,5 +30,14 @@ setup(
     packages=find_packages(),  # Automatically includes subpackages like 'model2450lib.serial'
     include_package_data=True,
     install_requires=["pyserial>=3.5"],
+    extras_require={
+        "analysis": ["numpy"],
+        "test": ["pytest"],
+    },
+    entry_points={
+        "console_scripts": [
+            "model2450=model2450lib.cli:main",
+        ],
+    },
 )
 
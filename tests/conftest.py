@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: conftest.py
+#
+# Description:
+#     Shared pytest fixtures for model2450lib.
+#
+#     Device tests run against the pseudo-terminal
+#     emulator, so they need pyserial and a POSIX
+#     host; elsewhere they are skipped.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 21 2026
+#
+# Revision history:
+#     v2.2.0  Wed Oct 21 2026 21:00:00  Vinay N
+#         Module created
+#     v2.2.0  Thu Oct 22 2026 09:00:00  Vinay N
+#         Silent port and farm factory fixtures
+#
+##############################################################################
+# Built-in imports
+import os
+import time
+
+# Lib imports
+import pytest
+
+from model2450lib.emulator import encode_frames
+
+class FakeSerial:
+    """
+    In-memory serial port for FrameReader tests.
+
+    Bytes are released in chunks, one chunk each
+    time the buffer runs empty. A read asking
+    for more than is buffered waits for the
+    timeout, like pyserial does.
+
+    Attributes:
+        chunks: Byte chunks still to arrive.
+        over_reads: Reads that asked for more
+            than the buffered bytes while some
+            were buffered.
+    """
+    baudrate = 115200
+
+    def __init__(self, chunks, timeout=1.0):
+        self.chunks = list(chunks)
+        self.timeout = timeout
+        self.over_reads = 0
+        self._buf = b""
+
+    @property
+    def in_waiting(self):
+        if not self._buf and self.chunks:
+            self._buf = self.chunks.pop(0)
+        return len(self._buf)
+
+    def read(self, size):
+        waiting = self.in_waiting
+        if not waiting:
+            time.sleep(self.timeout)
+        elif size > waiting:
+            # pyserial would block here until the timeout
+            self.over_reads += 1
+            time.sleep(self.timeout)
+        data = self._buf[:size]
+        self._buf = self._buf[size:]
+        return data
+
+@pytest.fixture
+def fake_serial():
+    """The FakeSerial class."""
+    return FakeSerial
+
+@pytest.fixture
+def frames():
+    """Build framed bytes: frames(b"payload", command=1)."""
+    return encode_frames
+
+@pytest.fixture
+def farm():
+    """One emulated device streaming at 500 Hz when asked."""
+    pytest.importorskip("serial")
+    if os.name != "posix":
+        pytest.skip("emulator needs pseudo-terminals")
+    from model2450lib.emulator import EmulatorFarm
+
+    farm = EmulatorFarm(1, rate=500.0)
+    farm.start()
+    yield farm
+    farm.close()
+
+@pytest.fixture
+def farm_of():
+    """Factory for farms of count emulated devices."""
+    pytest.importorskip("serial")
+    if os.name != "posix":
+        pytest.skip("emulator needs pseudo-terminals")
+    from model2450lib.emulator import EmulatorFarm
+
+    farms = []
+
+    def make(count, rate=500.0):
+        farm = EmulatorFarm(count, rate=rate)
+        farm.start()
+        farms.append(farm)
+        return farm
+
+    yield make
+    for farm in farms:
+        farm.close()
+
+@pytest.fixture
+def device(farm):
+    """Connected Model2450 on the emulated port."""
+    from model2450lib.model2450 import Model2450
+
+    dev = Model2450(farm.ports[0])
+    dev.connect()
+    assert dev.ser is not None
+    yield dev
+    dev.stop_stream()
+    dev.disconnect()
+
+@pytest.fixture
+def silent_port():
+    """Pseudo-terminal that accepts commands but never answers."""
+    pytest.importorskip("serial")
+    if os.name != "posix":
+        pytest.skip("needs pseudo-terminals")
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    yield os.ttyname(slave)
+    os.close(master)
+    os.close(slave)
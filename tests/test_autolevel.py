@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_autolevel.py
+#
+# Description:
+#     Tests for the blank-frame level pickers.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 16:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import random
+import time
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib.autolevel import LightHistogram
+from model2450lib.autolevel import MAX_BINS
+from model2450lib.autolevel import log_bins
+from model2450lib.autolevel import log_value
+from model2450lib.autolevel import otsu_threshold
+from model2450lib.autolevel import separation
+from model2450lib.autolevel import valley_threshold
+
+def histogram(*groups, seed=1):
+    rand = random.Random(seed)
+    hist = LightHistogram()
+    for count, draw in groups:
+        for _ in range(count):
+            hist.add(draw(rand))
+    return hist
+
+@pytest.mark.parametrize("picker", [otsu_threshold, valley_threshold])
+def test_narrow_blank_next_to_wide_content(picker):
+    hist = histogram((1000, lambda r: r.gauss(2.0, 0.2)),
+                     (1000, lambda r: r.uniform(200.0, 5000.0)))
+    start = time.monotonic()
+    threshold = picker(hist)
+    assert time.monotonic() - start < 0.5
+    assert threshold is not None and 3.0 < threshold < 200.0
+    split = separation(hist, threshold)
+    assert split["blank_count"] == 1000 and split["content_count"] == 1000
+    assert split["margin"] > 0
+
+@pytest.mark.parametrize("picker", [otsu_threshold, valley_threshold])
+def test_close_clusters(picker):
+    hist = histogram((500, lambda r: r.gauss(20.0, 2.0)),
+                     (500, lambda r: r.gauss(60.0, 4.0)))
+    assert 28.0 < picker(hist) < 50.0
+
+def test_log_bins_are_bounded():
+    hist = histogram((10, lambda r: 0.0), (10, lambda r: 1e6))
+    positions, counts = log_bins(hist)
+    assert len(positions) == len(counts) == MAX_BINS
+    assert counts[0] == 10 and counts[-1] == 10 and sum(counts) == 20
+    assert log_value(positions[0]) < 1.0 < 1e5 < log_value(positions[-1])
+    # A narrow histogram is not split finer than its own bins
+    narrow = histogram((10, lambda r: r.uniform(100.0, 110.0)))
+    assert len(log_bins(narrow)[1]) <= 11
+
+def test_single_population_has_no_split():
+    hist = histogram((100, lambda r: 50.0))
+    assert otsu_threshold(hist) is None
+    assert valley_threshold(hist) is None
+    assert log_bins(LightHistogram()) == ([], [])
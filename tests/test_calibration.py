@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_calibration.py
+#
+# Description:
+#     Tests for calibration step checks and the
+#     rack calibration run.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 14:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Own modules
+from model2450lib.calibration import CalibrationStep
+from model2450lib.calibration import default_steps
+from model2450lib.calibration import dominant_channel
+from model2450lib.calibration import level_equals
+from model2450lib.calibration import run_calibration
+from model2450lib.model2450 import Model2450
+
+def test_checks():
+    assert dominant_channel(2)("OK", "R:10 G:20 B:30")
+    assert not dominant_channel(0)("OK", "R:10 G:20 B:30")
+    assert not dominant_channel(0)("OK", None)
+    assert level_equals(40)("OK", "Level:40")
+    assert not level_equals(40)("OK", "Level:41")
+    assert not level_equals(40)("OK", None)
+
+def test_rack_calibration(farm_of):
+    farm = farm_of(2)
+    devices = [Model2450(port) for port in farm.ports]
+    for dev in devices:
+        dev.connect()
+    shown = []
+    try:
+        records = run_calibration(devices, default_steps(level=40),
+                                  display_hook=shown.append)
+    finally:
+        for dev in devices:
+            dev.disconnect()
+    # The display changes once per step, not once per device
+    assert shown == ["red", "green", "blue", "level"]
+    for dev in devices:
+        record = records[dev.port]
+        results = {step["step"]: step["ok"] for step in record["steps"]}
+        # The emulator always reads back R:10 G:20 B:30
+        assert results == {"red": False, "green": False, "blue": True,
+                           "level": True}
+        assert not record["ok"]
+    assert all(dev.level == 40 for dev in farm.devices)
+
+def test_malformed_readback_fails_step(device):
+    step = CalibrationStep("blue", "set blue\r\n", "level\r\n",
+                           dominant_channel(2))
+    records = run_calibration(device, [step])
+    [result] = records[device.port]["steps"]
+    assert result["readback"] == "Level:100"
+    assert not result["ok"] and not records[device.port]["ok"]
+
+def test_lost_reply_fails_step(silent_port):
+    dev = Model2450(silent_port)
+    dev.connect()
+    step = CalibrationStep("level", "level 5\r\n", "level\r\n", level_equals(5))
+    try:
+        records = run_calibration(dev, [step])
+    finally:
+        dev.disconnect()
+    [result] = records[silent_port]["steps"]
+    assert result["readback"] is None and not result["ok"]
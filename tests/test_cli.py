@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_cli.py
+#
+# Description:
+#     Tests for the model2450 command-line tool.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 11:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import io
+import json
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib import cli
+
+def run(argv):
+    args = cli.build_parser().parse_args(argv)
+    out = io.BytesIO()
+    assert args.func(args, out) == 0
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+@pytest.mark.parametrize("count", ["0", "-3", "many"])
+def test_bench_count_must_be_positive(count):
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["bench", "COM3", "--count", count])
+
+def test_query_writes_one_line_per_reply(farm):
+    records = run(["query", farm.ports[0], "sn", "level", "--repeat", "2"])
+    assert [r["response"] for r in records] == ["EMU0000", "Level:100"] * 2
+    assert {r["port"] for r in records} == {farm.ports[0]}
+
+def test_bench_summary(farm):
+    [record] = run(["bench", farm.ports[0], "--cmd", "sn", "--count", "1"])
+    assert record["count"] == 1
+    assert record["min_ms"] == record["p99_ms"] == record["max_ms"] > 0
+
+def test_stream_binary_records(farm):
+    out = io.BytesIO()
+    args = cli.build_parser().parse_args(
+        ["stream", farm.ports[0], "--format", "binary", "--count", "5"])
+    assert args.func(args, out) == 0
+    data = out.getvalue()
+    payloads = []
+    while data:
+        timestamp_ns, size = cli.RECORD_HEADER.unpack_from(data)
+        start = cli.RECORD_HEADER.size
+        payloads.append(data[start:start + size])
+        data = data[start + size:]
+    assert len(payloads) == 5
+    assert all(p.count(b",") == 3 for p in payloads)
+
+def test_open_device_failure_exits():
+    pytest.importorskip("serial")
+    with pytest.raises(SystemExit):
+        cli.open_device("/dev/model2450-missing")
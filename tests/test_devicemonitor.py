@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_devicemonitor.py
+#
+# Description:
+#     Tests for port diffing, re-binding after a
+#     re-enumeration and reconnect pacing.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 10:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import threading
+import types
+
+# Own modules
+from model2450lib import searchmodel
+from model2450lib.devicemonitor import DeviceMonitor
+from model2450lib.model2450 import Model2450
+
+def listing(monkeypatch, ports):
+    """Make filter_port_info() report ports, a dict of name to serial."""
+    monkeypatch.setattr(searchmodel, "filter_port_info", lambda: [
+        types.SimpleNamespace(device=name, serial_number=sn)
+        for name, sn in ports.items()])
+
+def test_poll_reports_added_and_removed(monkeypatch):
+    ports = {"COM3": "A1"}
+    listing(monkeypatch, ports)
+    added, removed = [], []
+    monitor = DeviceMonitor(on_add=lambda info: added.append(info.device),
+                            on_remove=lambda info: removed.append(info.device))
+    monitor.ports = monitor.snapshot()
+    ports["COM4"] = "B2"
+    del ports["COM3"]
+    monitor.poll()
+    assert added == ["COM4"]
+    assert removed == ["COM3"]
+
+def test_device_rebound_to_new_port(monkeypatch, farm_of):
+    farm = farm_of(2)
+    ports = {farm.ports[0]: "A1"}
+    listing(monkeypatch, ports)
+    reconnected = []
+    monitor = DeviceMonitor(on_reconnect=lambda dev, s: reconnected.append(dev))
+    monitor.ports = monitor.snapshot()
+    dev = Model2450(farm.ports[0])
+    dev.connect()
+    monitor.attach(dev)
+
+    # Unplugged, then back under another name
+    ports.clear()
+    monitor.poll()
+    assert dev.ser is None
+    ports[farm.ports[1]] = "A1"
+    monitor.poll()
+    try:
+        assert reconnected == [dev]
+        assert dev.port == farm.ports[1]
+        assert dev.reconnect_time is not None
+        assert dev.read_sn() == "EMU0001"
+    finally:
+        dev.disconnect()
+
+def test_busy_port_dropped_by_its_owner(monkeypatch, farm):
+    listing(monkeypatch, {farm.ports[0]: "A1"})
+    monitor = DeviceMonitor()
+    monitor.ports = monitor.snapshot()
+    dev = Model2450(farm.ports[0])
+    dev.connect()
+    monitor.attach(dev)
+
+    held = threading.Event()
+    release = threading.Event()
+
+    def owner():
+        with dev.io_lock:
+            held.set()
+            release.wait(2.0)
+
+    thread = threading.Thread(target=owner)
+    thread.start()
+    held.wait(2.0)
+    monitor.mark_lost(dev)
+    # Not closed under the reading thread
+    assert dev.ser is not None and dev.port_lost
+    release.set()
+    thread.join()
+    assert dev.read_frame() is None
+    assert dev.ser is None and not dev.port_lost
+
+def test_failed_reconnects_are_paced(monkeypatch, capsys):
+    listing(monkeypatch, {"COM3": "A1"})
+    monitor = DeviceMonitor(interval=10.0)
+    monitor.ports = monitor.snapshot()
+    dev = Model2450("COM3")
+    monitor.attach(dev)
+    attempts = []
+    monkeypatch.setattr(dev, "connect",
+                        lambda quiet=False: attempts.append(quiet))
+    monitor.mark_lost(dev)
+    for _ in range(5):
+        monitor.poll()
+    # One quiet attempt, then a back-off longer than the polls took
+    assert attempts == [True]
+    assert capsys.readouterr().out.count("failed") == 1
+    monitor.detach(dev)
+    assert not monitor.wait_reconnect(dev, timeout=0.1)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_discoverycache.py
+#
+# Description:
+#     Tests for the persistent discovery cache.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 09:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import types
+
+# Own modules
+from model2450lib import discoverycache
+from model2450lib import searchmodel
+
+def port_info(device, serial_number="A1", location="1-1"):
+    return types.SimpleNamespace(device=device, vid=0x045E, pid=0x0646,
+                                 serial_number=serial_number,
+                                 location=location, manufacturer=None,
+                                 product=None, interface=None)
+
+def test_identity_needs_vid_pid_and_serial_or_location():
+    assert discoverycache.usb_identity(port_info("COM3")) == "045E:0646:A1:1-1"
+    assert discoverycache.usb_identity(port_info("COM3", None, None)) is None
+    info = port_info("COM3")
+    info.vid = None
+    assert discoverycache.usb_identity(info) is None
+
+def test_store_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "sub" / "discovery.json")
+    cache = {}
+    discoverycache.store(cache, "K", {"port": "COM3", "model": "2450",
+                                      "version": "3:1"})
+    discoverycache.save_cache(cache, path)
+    loaded = discoverycache.load_cache(path)
+    assert discoverycache.lookup(loaded, "K", "COM3")["version"] == "3:1"
+    # Same identity on another port must be verified again
+    assert discoverycache.lookup(loaded, "K", "COM4") is None
+    discoverycache.clear_cache(path)
+    assert discoverycache.load_cache(path) == {}
+
+def test_bad_cache_file_is_empty(tmp_path):
+    path = tmp_path / "discovery.json"
+    path.write_text("{not json")
+    assert discoverycache.load_cache(str(path)) == {}
+    path.write_text('{"version": 0, "devices": {"K": {}}}')
+    assert discoverycache.load_cache(str(path)) == {}
+
+def test_search_cached_skips_verified_ports(farm, tmp_path, monkeypatch):
+    path = str(tmp_path / "discovery.json")
+    info = port_info(farm.ports[0])
+    monkeypatch.setattr(searchmodel, "filter_port_info", lambda: [info])
+    first = searchmodel.search_cached(timeout=5, path=path)
+    assert first["models"] == [{"port": farm.ports[0], "model": "2450",
+                                "version": "3:1"}]
+
+    def no_probe(*args, **kwargs):
+        raise AssertionError("cached port was probed")
+
+    monkeypatch.setattr(searchmodel, "probe_port", no_probe)
+    assert searchmodel.search_cached(timeout=5, path=path) == first
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_displaylatency.py
+#
+# Description:
+#     Tests for display latency analysis on
+#     synthetic streams and stimulus logs.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 16:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import json
+
+# Lib imports
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Own modules
+from model2450lib import displaylatency
+from model2450lib.cli import RECORD_HEADER
+
+MS = 1000000
+
+def synthetic(latency_ms=30.0, frames=60, period_ms=100, rate_hz=1000,
+              skip=None):
+    """Light following a toggling stimulus latency_ms later."""
+    present = np.arange(frames, dtype=np.int64) * period_ms * MS + 50 * MS
+    levels = (np.arange(frames) % 2).astype(np.float64)
+    t_ns = np.arange(0, int(present[-1] + period_ms * MS),
+                     int(1e9 / rate_hz), dtype=np.int64)
+    shown = levels.copy()
+    if skip is not None:
+        # The display never showed this frame
+        shown[skip] = shown[skip - 1]
+    index = np.searchsorted(present, t_ns - int(latency_ms * MS),
+                            side="right") - 1
+    values = np.where(index >= 0, 20.0 + 480.0 * shown[np.maximum(index, 0)], 20.0)
+    return t_ns, values, present, levels
+
+def test_measures_constant_latency():
+    result = displaylatency.measure_latency(*synthetic(latency_ms=30.0))
+    summary = result["summary"]
+    assert summary["frames"] == 59 and summary["missed"] == 0
+    # Crossings are interpolated between 1 ms samples
+    assert abs(summary["p50_ms"] - 30.0) <= 1.0
+    assert summary["max_ms"] - summary["min_ms"] <= 1.0
+    assert abs(result["lag_ms"] - 30.0) <= 2.0
+
+def test_unshown_frame_is_missed():
+    result = displaylatency.measure_latency(*synthetic(skip=20))
+    summary = result["summary"]
+    # Frame 20 and the change back at frame 21 have no edge
+    assert summary["missed"] == 2
+    assert np.isnan(result["latency_ns"][19:21]).all()
+
+def test_empty_input_rejected():
+    with pytest.raises(ValueError):
+        displaylatency.measure_latency([], [], [1, 2], [0, 1])
+
+def test_load_recordings_and_stimulus(tmp_path):
+    samples = [(1000, "100.0,1,2,3"), (2000, "Lux:5.5"), (3000, "ERR")]
+    ndjson = tmp_path / "rec.ndjson"
+    ndjson.write_text("".join(json.dumps({"t": t, "data": d}) + "\n"
+                              for t, d in samples))
+    binary = tmp_path / "rec.bin"
+    binary.write_bytes(b"".join(RECORD_HEADER.pack(t, len(d)) + d.encode()
+                                for t, d in samples))
+    for path in (ndjson, binary):
+        t_ns, values = displaylatency.load_recording(str(path))
+        assert t_ns.tolist() == [1000, 2000]
+        assert values.tolist() == [100.0, 5.5]
+    t_ns, values = displaylatency.load_recording(str(binary), channel=2)
+    assert values.tolist() == [2.0]
+
+    log = tmp_path / "stimulus.csv"
+    log.write_text("present_ns,level\n100,0\n200 1\n\n300,1.5\n")
+    present, levels = displaylatency.load_stimulus(str(log))
+    assert present.tolist() == [100, 200, 300]
+    assert levels.tolist() == [0.0, 1.0, 1.5]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_emulator.py
+#
+# Description:
+#     Tests for the emulated devices and the fleet
+#     load-test harness built on them.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 15:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import argparse
+import importlib.util
+import os
+import time
+
+# Own modules
+from model2450lib.emulator import MAX_PAYLOAD
+from model2450lib.emulator import STREAM_COMMAND
+from model2450lib.emulator import encode_frames
+from model2450lib.packetutils import decode_packet
+
+def load_harness():
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                        "bench", "load_test.py")
+    spec = importlib.util.spec_from_file_location("load_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_encode_frames_splits_long_payloads():
+    data = encode_frames(b"z" * 70, STREAM_COMMAND)
+    sizes = []
+    while data:
+        size = data[1] & 0x1F
+        packet = decode_packet(data[:size])
+        assert packet["command"] == STREAM_COMMAND
+        sizes.append(size - 2)
+        data = data[size:]
+    assert sizes == [MAX_PAYLOAD, MAX_PAYLOAD, 70 - 2 * MAX_PAYLOAD]
+
+def test_replies_and_level(farm):
+    dev = farm.devices[0]
+    assert dev.reply("level 7") == encode_frames(b"OK")
+    assert dev.reply("level") == encode_frames(b"Level:7")
+    assert dev.reply("level x") == encode_frames(b"ERR")
+    assert dev.reply("run") == b"ok\r\n"
+    assert dev.reply("nonsense") == encode_frames(b"ERR")
+    assert farm.stats()["commands"] == 5
+
+def test_stream_starts_and_stops(farm, device):
+    device.send_command("stream 3\r\n")
+    time.sleep(0.2)
+    assert farm.devices[0].streaming
+    device.send_command("stream 0\r\n")
+    time.sleep(0.1)
+    assert not farm.devices[0].streaming
+    sent = farm.stats()["sent"]
+    assert sent > 0
+    time.sleep(0.1)
+    assert farm.stats()["sent"] == sent
+
+def test_load_harness_small_fleet(farm_of):
+    # Only for the skip checks; the harness builds its own farm
+    farm_of(1)
+    harness = load_harness()
+    args = argparse.Namespace(rate=200.0, timeout=5.0, commands=20,
+                              duration=0.3)
+    result = harness.run_scale(3, args)
+    assert result["discovery"]["found"] == 3
+    assert result["commands"]["count"] == 60
+    assert result["commands"]["latency"]["count"] == 60
+    stream = result["stream"]
+    assert stream["samples"] > 0 and stream["decode_errors"] == 0
+    harness.report(result)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_events.py
+#
+# Description:
+#     Tests for the light-transition detectors and
+#     the event engine.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 15:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import time
+
+# Own modules
+from model2450lib.events import ColorChangeDetector
+from model2450lib.events import CusumDetector
+from model2450lib.events import EventEngine
+from model2450lib.events import ThresholdDetector
+
+def run(detector, lights):
+    return [(n, kind) for n, light in enumerate(lights)
+            for kind in [detector.update((light,))] if kind]
+
+def test_threshold_hysteresis_fires_once():
+    detector = ThresholdDetector("dark", 50, hysteresis=5, direction="both")
+    # Noise around the level fires nothing until the dead band is crossed
+    lights = [100, 52, 48, 53, 47, 44, 46, 54, 56, 100]
+    assert run(detector, lights) == [(5, "falling"), (8, "rising")]
+
+def test_threshold_direction_filter():
+    detector = ThresholdDetector("lit", 50, direction="rising")
+    assert run(detector, [10, 60, 10, 60]) == [(1, "rising"), (3, "rising")]
+
+def test_cusum_detects_steps_not_noise():
+    detector = CusumDetector("step", drift=2, threshold=20)
+    noise = [100 + (n % 3) - 1 for n in range(50)]
+    assert run(detector, noise) == []
+    steps = run(detector, noise + [160] * 10 + [100] * 10)
+    assert [kind for _, kind in steps] == ["step-up", "step-down"]
+    assert steps[0][0] == 50 and steps[1][0] == 60
+
+def test_color_change_moves_reference():
+    detector = ColorChangeDetector("color", distance=10)
+    colors = [(0, 100, 0, 0), (0, 105, 0, 0), (0, 0, 100, 0), (0, 2, 98, 0)]
+    assert [detector.update(c) for c in colors] == [
+        None, None, "color-change", None]
+
+def test_engine_skips_short_samples():
+    engine = EventEngine()
+    fired = []
+    engine.add(ColorChangeDetector("color", distance=10), fired.append)
+    engine.add(ThresholdDetector("dark", 50), fired.append)
+    now = time.monotonic_ns()
+    # Lux-only samples have no color channels
+    engine.on_sample("Lux:100.0", now)
+    engine.on_sample("Lux:10.0", now)
+    assert [event["name"] for event in fired] == ["dark"]
+    assert fired[0]["t_ns"] == now and fired[0]["latency_ns"] >= 0
+    stats = engine.stats()
+    assert stats["samples"] == 2 and stats["events"] == 1
+
+def test_watch_streams_into_engine(device):
+    engine = EventEngine()
+    fired = []
+    # Emulated light ramps 100..149 and wraps
+    engine.add(ThresholdDetector("wrap", 125, hysteresis=10), fired.append)
+    engine.watch(device)
+    time.sleep(0.5)
+    device.stop_stream()
+    assert engine.stats()["samples"] > 50
+    assert fired and all(event["kind"] == "falling" for event in fired)
+    assert all(event["values"][0] == 100.0 for event in fired)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_model2450.py
+#
+# Description:
+#     Emulator-backed tests for the command, stream
+#     stop and auto-level paths of Model2450.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 21 2026
+#
+# Revision history:
+#     v2.2.0  Wed Oct 21 2026 21:00:00  Vinay N
+#         Module created
+#     v2.2.0  Thu Oct 22 2026 12:30:00  Vinay N
+#         Reset and reboot tests
+#
+##############################################################################
+# Built-in imports
+import os
+import threading
+import time
+import types
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib import commands
+from model2450lib.autolevel import auto_level
+from model2450lib.model2450 import Model2450
+
+def test_generated_query_methods(device):
+    assert device.read_sn() == "EMU0000"
+    assert device.get_version() == "3:1"
+    assert device.get_color() == "R:10 G:20 B:30"
+    assert device.execute("color", parse=True) == (10.0, 20.0, 30.0)
+    assert device.execute("read", parse=True) == 123.4
+
+def test_set_level_reads_back(device):
+    assert device.set_level(42) == "OK"
+    assert device.get_level() == "Level:42"
+
+def test_execute_returns_reply_timestamp(device):
+    # Leave the reader idle so a stale interval would show
+    device.get_level()
+    time.sleep(0.2)
+    sent = time.monotonic_ns()
+    response, timestamp_ns = device.execute("level", timestamps=True)
+    assert response == "Level:100"
+    # Within the reply's line time of the send, not back in the idle gap
+    assert sent - 1000000 <= timestamp_ns <= time.monotonic_ns()
+
+def test_generated_methods_keep_docs():
+    doc = Model2450.set_level.__doc__
+    assert "Args:" in doc and "Raises:" in doc
+    assert "Raises:" in Model2450.get_color.__doc__
+    assert Model2450.set_level.command is commands.BY_METHOD["set_level"]
+
+def test_command_metrics_keyed_per_command(device):
+    device.enable_metrics()
+    device.set_red()
+    device.set_green()
+    device.get_level()
+    device.set_level(7)
+    keys = set(device.stats()["commands"])
+    assert keys == {"set_red", "set_green", "get_level", "set_level"}
+    # Snapshots have no side effects: a second one still sees the frames
+    first = device.stats()
+    again = device.stats()
+    assert again["recent_frame_rate"] > 0
+    assert device.stats(since=first)["frames_read"] == first["frames_read"]
+
+def test_stop_stream_stops_device_output(farm, device):
+    samples = []
+    device.start_stream(callback=samples.append)
+    time.sleep(0.3)
+    device.stop_stream()
+    assert samples
+    assert not farm.devices[0].streaming
+    # Every reply is the command's own, not a leftover stream frame
+    assert [device.get_level() for _ in range(20)] == ["Level:100"] * 20
+
+def test_subscription_ends_with_stream(device):
+    sub = device.subscribe(maxsize=100000, policy="block")
+    device.start_stream()
+    threading.Timer(0.3, device.stop_stream).start()
+    received = list(sub)
+    assert received and sub.closed
+    assert all(len(item) == 2 for item in received)
+    assert not device.subscribe().closed
+
+def test_auto_level_confirms_level(device):
+    result = auto_level(device, duration=0.3)
+    assert result["samples"] > 0
+    assert result["applied"]
+    assert result["readback"] == result["level"]
+    assert device.get_level() == f"Level:{result['level']}"
+
+@pytest.fixture
+def port_list(monkeypatch):
+    """Replace the OS port list with a dict of port name to USB serial."""
+    list_ports = pytest.importorskip("serial.tools.list_ports")
+    ports = {}
+    monkeypatch.setattr(list_ports, "comports", lambda: [
+        types.SimpleNamespace(device=name, serial_number=sn)
+        for name, sn in list(ports.items())])
+    return ports
+
+def unplug_on_reset(monkeypatch, dev, ports, replug=None, delay=0.1):
+    """Drop dev's port from the list once reset is sent; relist as replug."""
+    send = dev.send_command
+
+    def send_command(command):
+        send(command)
+        if "reset" in str(command):
+            usb_serial = ports.pop(dev.port)
+            if replug:
+                threading.Timer(delay, ports.__setitem__,
+                                (replug, usb_serial)).start()
+
+    monkeypatch.setattr(dev, "send_command", send_command)
+
+def test_reset_returns_when_port_leaves(monkeypatch, port_list, device):
+    port_list[device.port] = "A1"
+    unplug_on_reset(monkeypatch, device, port_list)
+    left = device.reset(timeout=2)
+    assert left is not None and left < 1.0
+    assert device.ser is None
+
+def test_reset_sees_disconnected_handle():
+    pytest.importorskip("serial")
+    if os.name != "posix":
+        pytest.skip("needs pseudo-terminals")
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    dev = Model2450(os.ttyname(slave))
+    dev.connect()
+    try:
+        # The far end goes away, as a rebooting device does
+        threading.Timer(0.1, os.close, (master,)).start()
+        left = dev.reset(timeout=2)
+        assert left is not None and left < 1.0
+        assert dev.ser is None
+    finally:
+        os.close(slave)
+
+def test_unacknowledged_reset_raises(silent_port):
+    dev = Model2450(silent_port)
+    dev.connect()
+    try:
+        with pytest.raises(RuntimeError, match="not acknowledged"):
+            dev.reboot_and_reconnect(timeout=0.3)
+    finally:
+        dev.disconnect()
+
+def test_reboot_follows_device_to_new_port(monkeypatch, port_list, farm_of):
+    farm = farm_of(2)
+    dev = Model2450(farm.ports[0])
+    dev.connect()
+    port_list[dev.port] = "A1"
+    unplug_on_reset(monkeypatch, dev, port_list, replug=farm.ports[1])
+    try:
+        elapsed = dev.reboot_and_reconnect(timeout=5)
+        assert dev.port == farm.ports[1]
+        assert dev.reconnect_time == elapsed
+        assert dev.read_sn() == "EMU0001"
+    finally:
+        dev.disconnect()
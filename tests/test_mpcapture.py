@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_mpcapture.py
+#
+# Description:
+#     Tests for the shared memory sample ring and
+#     process-per-device capture.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 12:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import math
+import time
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib.mpcapture import RECORD
+from model2450lib.mpcapture import MultiProcessCapture
+from model2450lib.mpcapture import SampleRing
+
+@pytest.fixture
+def ring():
+    ring = SampleRing.create(capacity=8)
+    yield ring
+    ring.close(unlink=True)
+
+def test_ring_round_trip(ring):
+    ring.write(1, (10.0, 1.0, 2.0, 3.0))
+    ring.write(2, (20.0,))
+    rows = ring.read()
+    assert rows[0] == (1, 10.0, 1.0, 2.0, 3.0)
+    assert rows[1][:2] == (2, 20.0) and all(map(math.isnan, rows[1][2:]))
+    assert ring.read() == []
+
+def test_reader_attaches_by_name(ring):
+    reader = SampleRing.attach(ring.name)
+    try:
+        ring.write(5, (1.0, 2.0, 3.0, 4.0))
+        assert reader.capacity == 8
+        assert [row[0] for row in reader.read()] == [5]
+    finally:
+        reader.close()
+
+def test_full_ring_keeps_writer_slot_out_of_views(ring):
+    for n in range(ring.capacity):
+        ring.write(n, (float(n),))
+    views, end = ring.read_views()
+    # The writer fills the next slot while the views are still held
+    ring.write(99, (99.0,))
+    stamps = [row[0] for view in views for row in RECORD.iter_unpack(view)]
+    for view in views:
+        view.release()
+    assert 99 not in stamps
+    assert stamps == list(range(1, ring.capacity))
+    assert ring.dropped == 1
+
+def test_overrun_keeps_newest_records(ring):
+    for n in range(20):
+        ring.write(n, (float(n),))
+    rows = ring.read()
+    assert [row[0] for row in rows] == list(range(13, 20))
+    assert ring.dropped == 13
+
+def test_workers_stream_and_report_failures(farm):
+    capture = MultiProcessCapture([farm.ports[0], "/dev/model2450-missing"],
+                                  capacity=4096)
+    try:
+        assert capture.start(timeout=10) == ["/dev/model2450-missing"]
+        deadline = time.monotonic() + 5
+        rows = []
+        while not rows and time.monotonic() < deadline:
+            time.sleep(0.1)
+            rows = capture.read()[farm.ports[0]]
+        assert rows and rows[0][1] >= 100.0
+        assert capture.stats()[farm.ports[0]]["dropped"] == 0
+    finally:
+        capture.stop()
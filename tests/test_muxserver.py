@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_muxserver.py
+#
+# Description:
+#     Tests for sharing an emulated device through
+#     the multiplexing server.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 13:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import os
+import tempfile
+import threading
+import time
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib.muxserver import MuxClient
+from model2450lib.muxserver import MuxServer
+
+@pytest.fixture
+def server(device):
+    # Short directory: Unix socket paths are limited to about 100 bytes
+    with tempfile.TemporaryDirectory(prefix="m2450") as tmp:
+        server = MuxServer({device.port: device}, os.path.join(tmp, "mux.sock"))
+        thread = threading.Thread(target=server.serve_forever,
+                                  kwargs={"poll_interval": 0.05}, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+        thread.join(2)
+
+@pytest.fixture
+def client_of(server):
+    clients = []
+
+    def make():
+        client = MuxClient(next(iter(server.channels)), server.path,
+                           request_timeout=5)
+        client.connect()
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.disconnect()
+
+def start_stream(client, samples):
+    thread = threading.Thread(target=client.get_stream3,
+                              kwargs={"callback": samples.append,
+                                      "verbose": False}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not samples and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert samples
+    return thread
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return predicate()
+
+def test_clients_share_commands(client_of):
+    first, second = client_of(), client_of()
+    assert first.request("list") == [first.port]
+    assert first.read_sn() == "EMU0000"
+    assert second.set_level(12) == "OK"
+    assert first.get_level() == "Level:12"
+    with pytest.raises(RuntimeError, match="not allowed"):
+        first.call("reset_mode")
+
+def test_stream_fans_out_and_blocks_commands(server, client_of):
+    first, second = client_of(), client_of()
+    a, b = [], []
+    threads = [start_stream(first, a), start_stream(second, b)]
+    with pytest.raises(RuntimeError, match="is streaming"):
+        first.get_level()
+    first.stop_stream()
+    second.stop_stream()
+    for thread in threads:
+        thread.join(2)
+        assert not thread.is_alive()
+    channel = server.channels[first.port]
+    assert wait_until(lambda: not channel.streaming())
+    assert first.get_level() == "Level:100"
+
+def test_disconnect_drops_subscription(farm, server, client_of):
+    streamer, other = client_of(), client_of()
+    thread = start_stream(streamer, [])
+    streamer.disconnect()
+    # The blocked get_stream3() returns with the connection
+    thread.join(2)
+    assert not thread.is_alive()
+    channel = server.channels[streamer.port]
+    assert wait_until(lambda: not channel.subscribers and not channel.streaming())
+    assert not farm.devices[0].streaming
+    assert other.get_level() == "Level:100"
+    with pytest.raises(ConnectionError):
+        streamer.get_level()
+
+def test_live_socket_is_not_taken_over(server, device):
+    with pytest.raises(OSError):
+        MuxServer({device.port: device}, server.path)
+    assert os.path.exists(server.path)
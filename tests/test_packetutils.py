@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_packetutils.py
+#
+# Description:
+#     Tests for frame reading, resynchronization,
+#     backlog handling and reassembly.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 21 2026
+#
+# Revision history:
+#     v2.2.0  Wed Oct 21 2026 21:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import time
+
+# Own modules
+from model2450lib.packetutils import decode_packet
+from model2450lib.packetutils import FrameReader
+from model2450lib.packetutils import Reassembler
+from model2450lib.packetutils import parse_stream_sample
+
+def read_all(reader, limit=10000):
+    frames = []
+    while len(frames) < limit:
+        frame = reader.read_frame()
+        if frame is None:
+            return frames
+        frames.append(frame)
+    return frames
+
+def test_bulk_read_splits_frames(fake_serial, frames):
+    data = frames(b"Level:5") + frames(b"x" * 40) + frames(b"OK")
+    reader = FrameReader(fake_serial([data], timeout=0.05))
+    got = [frame for frame, _ in read_all(reader)]
+    assert got == [frames(b"Level:5"), frames(b"x" * 40)[:31],
+                   frames(b"x" * 40)[31:], frames(b"OK")]
+    assert reader.discarded == 0
+
+def test_frame_timestamps_are_ordered(fake_serial, frames):
+    data = b"".join(frames(b"%d.0,1,2,3\r\n" % i, 3) for i in range(20))
+    reader = FrameReader(fake_serial([data], timeout=0.05))
+    stamps = [ts for _, ts in read_all(reader)]
+    assert len(stamps) == 20
+    assert stamps == sorted(stamps)
+
+def test_timestamps_not_spread_over_idle_time(fake_serial, frames):
+    reader = FrameReader(fake_serial([frames(b"Level:5")], timeout=0.05))
+    time.sleep(0.2)
+    before = time.monotonic_ns()
+    frame, ts = reader.read_frame()
+    # At 115200 baud the 9 bytes take under a millisecond on the line
+    assert before - ts < 5000000
+
+def test_lone_reply_after_garbage_is_not_held(fake_serial, frames):
+    ser = fake_serial([b"\x07\x99\x13" + frames(b"Level:5")], timeout=1.0)
+    reader = FrameReader(ser, commands={1, 3})
+    start = time.monotonic()
+    frame, _ = reader.read_frame()
+    assert frame == frames(b"Level:5")
+    assert time.monotonic() - start < 0.5
+    assert reader.discarded == 3
+
+def test_frame_before_corruption_is_kept(fake_serial, frames):
+    good = frames(b"A" * 5)
+    ser = fake_serial([good + good + b"\xff\xff\x13" + good + good],
+                      timeout=0.05)
+    reader = FrameReader(ser)
+    got = [frame for frame, _ in read_all(reader)]
+    assert got == [good] * 4
+    assert reader.discarded == 3
+    assert reader.resyncs == 1
+
+def test_command_codes_reject_false_headers(fake_serial, frames):
+    # 0x05 0x04 looks like a 4-byte frame with command 5
+    data = b"\x05\x04" + frames(b"Level:5") + frames(b"OK")
+    reader = FrameReader(fake_serial([data], timeout=0.05), commands={1})
+    got = [frame for frame, _ in read_all(reader)]
+    assert got == [frames(b"Level:5"), frames(b"OK")]
+
+def test_overloaded_reader_never_reads_unbuffered_bytes(fake_serial, frames):
+    sample = frames(b"100.0,1,2,3\r\n", 3)
+    # The second burst is smaller than a full overloaded batch
+    ser = fake_serial([sample * 3000, sample * 2200], timeout=1.0)
+    reader = FrameReader(ser)
+    start = time.monotonic()
+    got = []
+    while len(got) < 5200:
+        frame = reader.read_frame()
+        assert frame is not None
+        got.append(frame)
+    assert time.monotonic() - start < 1.0
+    assert reader.overloads == 1
+    assert ser.over_reads == 0
+
+def test_reset_forgets_partial_frame(fake_serial, frames):
+    reply = frames(b"Level:5")
+    ser = fake_serial([reply[:4]], timeout=0.05)
+    reader = FrameReader(ser)
+    assert reader.read_frame() is None
+    reader.reset()
+    ser.chunks.append(reply)
+    frame, _ = reader.read_frame()
+    assert frame == reply
+
+def test_reassembler_joins_message_frames(frames):
+    asm = Reassembler("message")
+    data = frames(b"y" * 70)
+    packets = [data[0:31], data[31:62], data[62:]]
+    results = [asm.feed(decode_packet(p), n) for n, p in enumerate(packets)]
+    assert results[:2] == [None, None]
+    assert bytes(results[2]) == b"y" * 70
+    assert asm.frames == 3
+    assert (asm.first_ns, asm.last_ns) == (0, 2)
+
+def test_reassembler_splits_lines_across_frames():
+    asm = Reassembler("line")
+    assert asm.feed_lines(b"1.0,2") == []
+    lines = asm.feed_lines(b",3\r")
+    assert lines == []
+    lines = asm.feed_lines(b"\n4.0,5\r\n6")
+    assert [bytes(line) for line in lines] == [b"1.0,2,3", b"4.0,5"]
+    assert bytes(asm.flush()) == b"6"
+
+def test_parse_stream_sample():
+    assert parse_stream_sample("Lux:123.4") == (123.4,)
+    assert parse_stream_sample(b"100.0,-1,2,3\r\n") == (100.0, -1.0, 2.0, 3.0)
+    assert parse_stream_sample("ERR") == ()
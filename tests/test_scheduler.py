@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_scheduler.py
+#
+# Description:
+#     Tests for fixed-rate sampling and pipelined
+#     command batches.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 14:00:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import threading
+import time
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib.model2450 import Model2450
+from model2450lib.scheduler import PIPELINE_COMMANDS
+from model2450lib.scheduler import PeriodicSampler
+
+def test_rate_and_length_are_required(device):
+    with pytest.raises(ValueError):
+        PeriodicSampler(device, rate=0)
+    with pytest.raises(ValueError):
+        PeriodicSampler(device).run()
+
+def test_batch_matches_single_commands(device):
+    cmds = [PIPELINE_COMMANDS[name] for name in ("get_read", "get_color", "read_sn")]
+    assert device.send_cmd_batch(cmds) == [
+        "Lux:123.4", "R:10 G:20 B:30", "EMU0000"]
+
+def test_lost_batch_replies_time_out(silent_port):
+    dev = Model2450(silent_port)
+    dev.connect()
+    try:
+        cmds = [PIPELINE_COMMANDS["get_read"], PIPELINE_COMMANDS["get_color"]]
+        start = time.monotonic()
+        assert dev.send_cmd_batch(cmds, timeout=0.3) == [None, None]
+        # Deadlines count from the write, not from the previous reply
+        assert time.monotonic() - start < 0.5
+    finally:
+        dev.disconnect()
+
+def test_pipelined_ticks(device):
+    sampler = PeriodicSampler(device, commands=("get_read", "get_color"), rate=50)
+    assert sampler.pipeline
+    result = sampler.run(count=10)
+    assert len(result["samples"]) == 10
+    assert [s["tick"] for s in result["samples"]] == list(range(10))
+    assert result["samples"][0]["values"] == {"get_read": "Lux:123.4",
+                                              "get_color": "R:10 G:20 B:30"}
+    stats = result["stats"][device.port]
+    assert stats["count"] == 10
+    assert 25 < stats["achieved_hz"] < 100
+
+def test_stop_ends_run_early(device):
+    sampler = PeriodicSampler(device, rate=20)
+    threading.Timer(0.3, sampler.stop).start()
+    start = time.monotonic()
+    result = sampler.run(duration=30)
+    assert time.monotonic() - start < 2
+    assert 0 < len(result["samples"]) < 20
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_searchmodel.py
+#
+# Description:
+#     Tests for concurrent device discovery.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 09:00:00  Vinay N
+#         Module created
+#     v2.2.0  Thu Oct 22 2026 10:00:00  Vinay N
+#         Descriptor identification tests
+#
+##############################################################################
+# Built-in imports
+import os
+import time
+import types
+
+# Own modules
+from model2450lib import searchmodel
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else 0
+
+def test_search_models_finds_emulated_device(farm):
+    found = []
+    result = searchmodel.search_models(callback=found.append, timeout=5,
+                                       ports=farm.ports)
+    assert result["models"] == [{"port": farm.ports[0], "model": "2450",
+                                 "version": "3:1"}]
+    assert found == result["models"]
+
+def test_probes_run_concurrently(farm_of):
+    farm = farm_of(3)
+    start = time.monotonic()
+    result = searchmodel.search_models(timeout=5, ports=farm.ports)
+    elapsed = time.monotonic() - start
+    assert sorted(entry["port"] for entry in result["models"]) == sorted(farm.ports)
+    # Each probe settles for 1 s; one after the other would take 3 s
+    assert elapsed < 2.0
+
+def test_deadline_closes_abandoned_probes(silent_port):
+    before = open_fds()
+    start = time.monotonic()
+    result = searchmodel.search_models(timeout=0.3, ports=[silent_port])
+    assert result["models"] == []
+    assert time.monotonic() - start < 1.0
+    assert open_fds() == before
+
+def descriptor(**fields):
+    info = {"device": "COM3", "vid": searchmodel.USB_VID,
+            "pid": searchmodel.USB_PID, "manufacturer": "MCCI Corporation",
+            "product": "MCCI Model 2450 BACK", "interface": None}
+    info.update(fields)
+    return types.SimpleNamespace(**info)
+
+def test_identify_descriptor_needs_full_match():
+    assert searchmodel.identify_descriptor(descriptor()) == "2450"
+    assert searchmodel.identify_descriptor(
+        descriptor(product=None, interface="Brightness And Color Kit")) == "2450"
+    # Other products sharing the VID/PID, or a 2450 from another vendor
+    assert searchmodel.identify_descriptor(descriptor(pid=0x0647)) is None
+    assert searchmodel.identify_descriptor(
+        descriptor(manufacturer="Other Inc.")) is None
+    assert searchmodel.identify_descriptor(
+        descriptor(product="MCCI Model 3201")) is None
+    assert searchmodel.identify_descriptor(
+        descriptor(product="Serial 2450-77")) is None
+
+def test_confirmed_descriptor_skips_probe(monkeypatch):
+    def no_probe(*args, **kwargs):
+        raise AssertionError("descriptor-confirmed port was probed")
+
+    monkeypatch.setattr(searchmodel, "probe_port", no_probe)
+    result = searchmodel.search_models(ports=[descriptor()])
+    assert result["models"] == [{"port": "COM3", "model": "2450",
+                                 "version": None}]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Module: test_synccapture.py
+#
+# Description:
+#     Tests for synchronized multi-device capture.
+#
+# Author:
+#     Vinay N, MCCI Corporation Oct 22 2026
+#
+# Revision history:
+#     v2.2.0  Thu Oct 22 2026 11:30:00  Vinay N
+#         Module created
+#
+##############################################################################
+# Built-in imports
+import math
+
+# Lib imports
+import pytest
+
+# Own modules
+from model2450lib.model2450 import Model2450
+from model2450lib.synccapture import SyncCapture
+
+@pytest.fixture
+def pair(farm_of):
+    farm = farm_of(2)
+    devices = [Model2450(port) for port in farm.ports]
+    for dev in devices:
+        dev.connect()
+    yield devices
+    for dev in devices:
+        dev.stop_stream()
+        dev.disconnect()
+
+def test_calibrate_bounds_each_device(pair):
+    offsets = SyncCapture(pair, probe_count=5).calibrate()
+    assert set(offsets) == {dev.port for dev in pair}
+    for entry in offsets.values():
+        assert 0 < entry["rtt_min_ns"] <= entry["rtt_median_ns"]
+        assert entry["offset_ns"] == entry["rtt_min_ns"] // 2
+        assert entry["error_ns"] >= 0
+
+def test_silent_device_has_unbounded_error(pair, monkeypatch):
+    monkeypatch.setattr(pair[1], "get_version", lambda: None)
+    sync = SyncCapture(pair, probe_count=3)
+    offsets = sync.calibrate()
+    assert offsets[pair[1].port]["offset_ns"] is None
+    assert math.isinf(offsets[pair[1].port]["error_ns"])
+    assert math.isinf(sync.result()["alignment_error_ns"])
+
+def test_run_merges_streams_in_time_order(pair):
+    sync = SyncCapture(pair, probe_count=3)
+    first = sync.run(0.3)
+    times = [row["t_ns"] for row in first["samples"]]
+    assert times == sorted(times)
+    assert {row["port"] for row in first["samples"]} == {dev.port for dev in pair}
+    assert math.isfinite(first["alignment_error_ns"])
+
+    # A second run starts empty instead of appending to the first
+    second = sync.run(0.3)
+    assert second["samples"][0]["t_ns"] > times[-1]